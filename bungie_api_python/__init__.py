@@ -1,8 +1,31 @@
-from .client_sync import BungieClientSync
-from .client_async import BungieClientAsync
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .client_sync import BungieClientSync
+    from .client_async import BungieClientAsync
 
 
 __all__ = [
     'BungieClientSync',
     'BungieClientAsync',
 ]
+
+# The clients are imported on first use, so importing the package stays cheap and each client only loads
+# its own HTTP library.
+_LAZY = {
+    'BungieClientSync': '.client_sync',
+    'BungieClientAsync': '.client_async',
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
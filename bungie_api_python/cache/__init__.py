@@ -0,0 +1,13 @@
+from .core import CacheEntry, CacheStats, CacheBackend, ResponseCache
+from .memory import MemoryCacheBackend
+from .sqlite import SQLiteCacheBackend
+
+
+__all__ = [
+    'CacheEntry',
+    'CacheStats',
+    'CacheBackend',
+    'ResponseCache',
+    'MemoryCacheBackend',
+    'SQLiteCacheBackend',
+]
@@ -0,0 +1,239 @@
+import abc
+import hashlib
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional, Type, Mapping, TYPE_CHECKING
+
+from ..entities.decoder import ModelDecoder
+from ..entities.responses.raw import RawResponse
+from ..utils.decoding import JSONDecoder
+
+if TYPE_CHECKING:
+    from ..entities.responses import Response
+
+
+@dataclass(kw_only=True)
+class CacheEntry:
+    """A single cached response.
+
+    Backends may keep the raw response body, the decoded response, or both.
+    """
+    expires_at: float
+    size: int
+    body: Optional[bytes] = field(default=None)
+    value: Any = field(default=None)
+    etag: Optional[str] = field(default=None)
+    last_modified: Optional[str] = field(default=None)
+
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+    @property
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self) -> dict[str, str]:
+        """The headers that ask the server to only send the response again if it changed."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+@dataclass(kw_only=True)
+class CacheStats:
+    hits: int = field(default=0)
+    misses: int = field(default=0)
+    revalidations: int = field(default=0)
+    stores: int = field(default=0)
+    evictions: int = field(default=0)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CacheBackend(abc.ABC):
+    """Storage for cached responses, keyed by an opaque string."""
+    stats: CacheStats
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        pass
+
+    @abc.abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        pass
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        pass
+
+
+def parse_cache_control(value: Optional[str]) -> dict[str, Optional[str]]:
+    """Parses a ``Cache-Control`` header into its directives, e.g. ``{'private': None, 'max-age': '60'}``."""
+    directives = {}
+    for directive in (value or '').split(','):
+        name, _, argument = directive.strip().partition('=')
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+    return directives
+
+
+class ResponseCache:
+    """An opt-in cache for the responses of idempotent GET endpoints.
+
+    Endpoints are selected by their response type, each with its own time to live. Response types without a
+    configured time to live follow the ``Cache-Control`` header sent by Bungie instead. Responses carrying an
+    ``ETag`` or ``Last-Modified`` header are revalidated with a conditional request once they expire.
+
+    Responses to OAuth protected endpoints are keyed by the membership the request was made for,
+    so they are never served to a different user.
+    """
+    def __init__(
+            self,
+            backend: Optional[CacheBackend] = None,
+            ttls: Optional[dict[Type['Response'], float]] = None,
+            default_ttl: Optional[float] = None,
+            respect_cache_control: bool = True,
+            json_decoder: Optional[JSONDecoder | str] = None,
+    ) -> None:
+        """
+        :param backend: Where responses are stored, defaults to an in-memory LRU cache.
+        :param ttls: The time to live (in seconds) of each cached response type.
+        :param default_ttl: The time to live of response types missing from ``ttls``, None to not cache them.
+        :param respect_cache_control: Whether response types without a time to live are cached according
+            to their ``Cache-Control`` header and revalidated using their ``ETag`` and ``Last-Modified`` headers.
+        :param json_decoder: The decoder used to parse stored bodies, or the name of its backend.
+            Defaults to the fastest installed backend.
+        """
+        if backend is None:
+            from .memory import MemoryCacheBackend
+            backend = MemoryCacheBackend()
+
+        self.backend = backend
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self.respect_cache_control = respect_cache_control
+        if not isinstance(json_decoder, JSONDecoder):
+            json_decoder = JSONDecoder(json_decoder or 'auto')
+        self.json_decoder = json_decoder
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.backend.stats
+
+    def ttl(self, response_type: Type['Response']) -> Optional[float]:
+        return self.ttls.get(response_type, self.default_ttl)
+
+    @staticmethod
+    def key(request_key: tuple) -> str:
+        """Hashes a client request key, so that no request details are stored in plain text."""
+        return hashlib.sha256(repr(request_key).encode()).hexdigest()
+
+    def cacheable(self, response_type: Type['Response']) -> bool:
+        """Whether responses of a type may be stored at all."""
+        return self.respect_cache_control or bool(self.ttl(response_type))
+
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        """Looks up a cached entry, including expired entries that can still be revalidated."""
+        entry = self.backend.get(key)
+        if entry is None or entry.expired:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return entry
+
+    def decode(self, entry: CacheEntry, response_type: Type['Response'], raw: Optional[str] = None) -> 'Response':
+        """The decoded response of an entry, decoded from its body if the backend does not keep it decoded.
+
+        :param raw: The raw mode of the request, raw responses are built from the body again on every hit.
+        """
+        if raw:
+            return RawResponse.build(raw, entry.body, self.json_decoder.loads(entry.body))
+        if entry.value is None:
+            entry.value = ModelDecoder.decode(response_type, self.json_decoder.loads(entry.body))
+        return entry.value
+
+    def get(self, key: str, response_type: Type['Response']) -> Optional['Response']:
+        """Looks up a fresh cached response."""
+        entry = self.lookup(key)
+        if entry is None or entry.expired:
+            return None
+        return self.decode(entry, response_type)
+
+    def _ttl_from_headers(self, response_type: Type['Response'], headers: Mapping[str, str]) -> Optional[float]:
+        ttl = self.ttl(response_type)
+        if ttl is not None or not self.respect_cache_control:
+            return ttl
+
+        directives = parse_cache_control(headers.get('Cache-Control'))
+        if 'no-store' in directives:
+            return None
+        if 'no-cache' in directives:
+            return 0
+        try:
+            return max(int(directives['max-age']), 0)
+        except (KeyError, TypeError, ValueError):
+            return 0
+
+    def set(
+            self,
+            key: str,
+            response_type: Type['Response'],
+            body: bytes,
+            value: Optional['Response'],
+            headers: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        headers = headers or {}
+        ttl = self._ttl_from_headers(response_type, headers)
+        entry = CacheEntry(
+            expires_at=time.time() + (ttl or 0),
+            size=len(body),
+            body=body,
+            value=value,
+            etag=headers.get('ETag'),
+            last_modified=headers.get('Last-Modified'),
+        )
+        # Responses that expire immediately are only worth keeping if they can be revalidated.
+        if ttl is None or not (ttl or entry.revalidatable):
+            return
+
+        self.backend.set(key, entry)
+        self.stats.stores += 1
+
+    def revalidated(
+            self,
+            key: str,
+            entry: CacheEntry,
+            response_type: Type['Response'],
+            headers: Optional[Mapping[str, str]] = None,
+            raw: Optional[str] = None,
+    ) -> 'Response':
+        """Refreshes an entry after the server confirmed it has not changed, with a ``304 Not Modified`` response.
+
+        :return: The cached response.
+        """
+        headers = headers or {}
+        value = self.decode(entry, response_type, raw)
+
+        entry.expires_at = time.time() + (self._ttl_from_headers(response_type, headers) or 0)
+        entry.etag = headers.get('ETag') or entry.etag
+        entry.last_modified = headers.get('Last-Modified') or entry.last_modified
+        self.backend.set(key, entry)
+        self.stats.revalidations += 1
+        return value
+
+    def clear(self) -> None:
+        self.backend.clear()
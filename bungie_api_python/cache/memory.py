@@ -0,0 +1,75 @@
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from .core import CacheBackend, CacheEntry
+
+
+class MemoryCacheBackend(CacheBackend):
+    """A thread safe, in-memory LRU cache bounded by entry count and approximate size.
+
+    Only decoded responses are kept, the size of an entry is approximated by the length of its response body.
+    Expired entries are kept until evicted if they can be revalidated with a conditional request.
+    """
+    def __init__(self, max_entries: Optional[int] = 1024, max_bytes: Optional[int] = 64 * 1024 * 1024) -> None:
+        """
+        :param max_entries: The maximum number of cached responses, None for no limit.
+        :param max_bytes: The maximum total size of cached response bodies, None for no limit.
+        """
+        super().__init__()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """The approximate number of bytes held by the cache."""
+        return self._bytes
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expired and not entry.revalidatable:
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        if entry.value is not None:
+            entry.body = None
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+
+            while self._entries and (
+                    (self.max_entries is not None and len(self._entries) > self.max_entries) or
+                    (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                self._remove(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: str) -> None:
+        self._bytes -= self._entries.pop(key).size
@@ -0,0 +1,106 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from .core import CacheBackend, CacheEntry
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """A disk backed cache that can be shared by every process on a host.
+
+    The database runs in WAL mode so that readers never block the writer. Only raw response bodies are stored,
+    they are decoded again when a cached response is read.
+    """
+    def __init__(self, path: str | os.PathLike, timeout: float = 30, max_entries: Optional[int] = None) -> None:
+        """
+        :param path: The path of the SQLite database file, created if it does not exist.
+        :param timeout: How long (in seconds) to wait on a lock held by another process.
+        :param max_entries: The maximum number of stored responses, None for no limit. When exceeded,
+            expired responses that cannot be revalidated are removed first, then the responses closest to expiring.
+        """
+        super().__init__()
+        self.path = os.fspath(path)
+        self.timeout = timeout
+        self.max_entries = max_entries
+
+        # SQLite connections cannot be shared between threads, so each thread opens its own.
+        self._local = threading.local()
+
+        with self._connection() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                '  key TEXT PRIMARY KEY,'
+                '  body BLOB NOT NULL,'
+                '  expires_at REAL NOT NULL,'
+                '  etag TEXT,'
+                '  last_modified TEXT'
+                ')'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at)')
+
+            # Databases created before conditional requests were supported lack the validator columns.
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(responses)')}
+            for column in ('etag', 'last_modified'):
+                if column not in columns:
+                    conn.execute(f'ALTER TABLE responses ADD COLUMN {column} TEXT')
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'connection', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = conn
+        return conn
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        row = self._connection().execute(
+            'SELECT body, expires_at, etag, last_modified FROM responses WHERE key = ?',
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        body, expires_at, etag, last_modified = row
+        return CacheEntry(expires_at=expires_at, size=len(body), body=body, etag=etag, last_modified=last_modified)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._connection() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO responses (key, body, expires_at, etag, last_modified) VALUES (?, ?, ?, ?, ?)',
+                (key, entry.body, entry.expires_at, entry.etag, entry.last_modified),
+            )
+
+        if self.max_entries is not None:
+            self._evict()
+
+    def _evict(self) -> None:
+        with self._connection() as conn:
+            conn.execute(
+                'DELETE FROM responses WHERE expires_at <= ? AND etag IS NULL AND last_modified IS NULL',
+                (time.time(),),
+            )
+            evicted = conn.execute(
+                'DELETE FROM responses WHERE key IN ('
+                '  SELECT key FROM responses ORDER BY expires_at DESC LIMIT -1 OFFSET ?'
+                ')',
+                (self.max_entries,),
+            ).rowcount
+        self.stats.evictions += evicted
+
+    def delete(self, key: str) -> None:
+        with self._connection() as conn:
+            conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+
+    def clear(self) -> None:
+        with self._connection() as conn:
+            conn.execute('DELETE FROM responses')
+
+    def close(self) -> None:
+        """Closes the calling thread's database connection."""
+        conn = getattr(self._local, 'connection', None)
+        if conn is not None:
+            conn.close()
+            self._local.connection = None
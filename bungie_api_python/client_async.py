@@ -1,13 +1,20 @@
 # --- IMPORTS ----------------------------------------------------------------------------------------------------------
-from contextlib import asynccontextmanager
-from typing import TypeVar, Any, Optional, Type, Generator
+import asyncio
+import time
+from typing import TypeVar, Any, Optional, Type, Mapping
 
 import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
 
+from .cache import CacheEntry
 from .client_base import ClientBase
 from .endpoints import AppEndpointsAsync, OAuthAsync, UserEndpointsAsync
 from .entities.core.oauth import AccessToken
-from .entities.responses import Response
+from .entities.decoder import ModelDecoder
+from .entities.exceptions import PlatformErrorCodes
+from .entities.responses import Response, RawResponse
+from .hooks import RequestEvents, RequestTrace
 from .exceptions.oauth import OAuthContextNotFoundException, OAuthContextExpiredException, \
     OAuthContextGenFailedException
 from .utils import OAuthUtils
@@ -29,6 +36,45 @@ class BungieClientAsync(
     oauth: OAuthAsync
     user: UserEndpointsAsync
 
+    _session: Optional[aiohttp.ClientSession]
+    _in_flight: dict[tuple, asyncio.Future]
+    _loop: Optional[asyncio.AbstractEventLoop]
+
+    def __init__(
+            self,
+            *args,
+            limit: int = 100,
+            limit_per_host: int = 0,
+            keepalive_timeout: float = 15,
+            ttl_dns_cache: Optional[int] = 10,
+            coalesce_requests: bool = True,
+            **kwargs,
+    ) -> None:
+        """Instantiates the asynchronous client.
+
+        :param limit: The total number of simultaneous connections, 0 for no limit.
+        :param limit_per_host: The number of simultaneous connections to a single host, 0 for no limit.
+        :param keepalive_timeout: How long (in seconds) idle connections are kept alive.
+        :param ttl_dns_cache: How long (in seconds) resolved DNS entries are cached, None to cache forever.
+        :param coalesce_requests: Whether identical concurrent GET requests share a single in-flight request.
+            When enabled, every caller receives the same decoded response object.
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.coalesce_requests = coalesce_requests
+        self._in_flight = {}
+        self._loop = None
+
+        super().__init__(*args, **kwargs)
+
+    async def __aenter__(self) -> 'BungieClientAsync':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
     async def oauth_context(self) -> str:
         # OAuth access token not set.
         if self._access_token is None:
@@ -50,7 +96,8 @@ class BungieClientAsync(
 
             # Attempt automatic token refresh
             try:
-                self._access_token = await self.oauth.refresh_access_token(self._access_token.refresh_token)
+                with self.options(raw=None):
+                    self._access_token = await self.oauth.refresh_access_token(self._access_token.refresh_token)
             except aiohttp.ClientResponseError:
                 raise OAuthContextExpiredException(
                     "The previous OAuth context has expired and cannot be refreshed. "
@@ -60,22 +107,294 @@ class BungieClientAsync(
 
         return OAuthUtils.access_token_header(self._access_token)
 
-    @asynccontextmanager
-    async def session(self, with_oauth: bool) -> Generator[aiohttp.ClientSession, None, None]:
-        headers = {
-            'X-API-Key': self.api_key,
-            'User-Agent': 'bungie-api-python'
-        }
-        if with_oauth:
-            headers.update({
-                'Authorization': await self.oauth_context()
-            })
-
-        async with aiohttp.ClientSession(
-                headers=headers,
+    def _bind_loop(self) -> None:
+        """Drops the session and in-flight requests of an event loop other than the running one.
+
+        Each ``asyncio.run`` call runs a new event loop, and sessions and futures cannot outlive the loop they were
+        created on.
+        """
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            return
+        if self._session is not None and self._loop.is_closed():
+            # It can no longer be closed gracefully, this only marks its connections as closed.
+            self._session.connector._close()
+        self._session = None
+        self._in_flight = {}
+        self._loop = loop
+
+    def session(self) -> aiohttp.ClientSession:
+        # The session binds to the running event loop, so it is created lazily from within a coroutine.
+        self._bind_loop()
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.ttl_dns_cache,
+                use_dns_cache=True,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={
+                    'X-API-Key': self.api_key,
+                    'User-Agent': 'bungie-api-python'
+                },
                 # raise_for_status=True,
-        ) as session:
-            yield session
+                # Tracing connections costs every request, so it is only set up for clients with hooks.
+                trace_configs=[self._trace_config()] if self._hooks else None,
+            )
+        return self._session
+
+    def open_connections(self) -> int:
+        """The number of connections the client's session holds open, in use or idle."""
+        if self._session is None or self._session.closed:
+            return 0
+        # aiohttp does not count them, its connector keeps the idle connections per host and the ones in use.
+        connector = self._session.connector
+        return sum(len(conns) for conns in list(connector._conns.values())) + len(connector._acquired)
+
+    @staticmethod
+    def _trace_config() -> aiohttp.TraceConfig:
+        """Reports the connections requests acquire, for requests traced by hooks."""
+        async def acquired(reused: bool, context) -> None:
+            trace: Optional[RequestTrace] = context.trace_request_ctx
+            if trace is not None:
+                trace.emit(RequestEvents.CONNECTION_ACQUIRED, connection_reused=reused)
+
+        async def reused(session, context, params) -> None:
+            await acquired(True, context)
+
+        async def created(session, context, params) -> None:
+            await acquired(False, context)
+
+        config = aiohttp.TraceConfig()
+        config.on_connection_reuseconn.append(reused)
+        config.on_connection_create_end.append(created)
+        return config
+
+    async def aclose(self) -> None:
+        """Closes the client's session and every pooled connection it holds.
+
+        The client can still be used afterwards, a new session is created on the next request.
+        """
+        self._bind_loop()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _send(
+            self,
+            method: str,
+            url: str,
+            response_type: type,
+            headers: Optional[dict[str, Any]],
+            params: Optional[dict[str, Any]],
+            auth: aiohttp.BasicAuth,
+            data: Optional[dict[str, Any]],
+            json: Optional[dict[str, any]],
+            trace: Optional[RequestTrace] = None,
+    ) -> tuple[int, Mapping[str, str], bytes]:
+        """Sends a single request, or replays its response from the client's cassette.
+
+        :return: The status, headers and body of the response.
+        """
+        exchange = None
+        if self.cassette is not None:
+            exchange = self._exchange(method, url, response_type, params, data, json)
+            if self.cassette.replaying:
+                exchange = self.cassette.replay(exchange)
+                delay = self.cassette.delay(exchange)
+                if delay:
+                    await asyncio.sleep(delay)
+                if trace is not None:
+                    trace.emit(RequestEvents.FIRST_BYTE, status=exchange.status)
+                    trace.emit(RequestEvents.BODY_READ, status=exchange.status, bytes_in=len(exchange.content))
+                return exchange.status, CIMultiDict(exchange.headers), exchange.content
+
+        start = time.perf_counter()
+        async with self.session().request(
+            method,
+            url,
+            headers=headers,
+            params=params,
+            auth=auth,
+            data=data,
+            json=json,
+            trace_request_ctx=trace,
+        ) as r:
+            if trace is None:
+                content = await r.read()
+            else:
+                first_byte = time.monotonic()
+                trace.emit(RequestEvents.FIRST_BYTE, status=r.status)
+                content = await r.read()
+                trace.emit(
+                    RequestEvents.BODY_READ,
+                    status=r.status,
+                    bytes_in=len(content),
+                    duration=time.monotonic() - first_byte,
+                )
+
+        if exchange is not None:
+            exchange.content = content
+            exchange.elapsed = time.perf_counter() - start
+            exchange.status = r.status
+            exchange.headers = list(r.headers.items())
+            self.cassette.record(exchange)
+        return r.status, r.headers, content
+
+    async def _request(
+            self,
+            method: str,
+            url: str,
+            response_type: Type[R],
+            params: Optional[dict[str, Any]],
+            headers: Optional[dict[str, Any]],
+            data: Optional[dict[str, Any]],
+            json: Optional[dict[str, any]],
+            requires_oauth: bool,
+            auth: aiohttp.BasicAuth,
+            idempotent: bool,
+            cache_key: Optional[str] = None,
+            cache_entry: Optional[CacheEntry] = None,
+    ) -> R:
+        args = (
+            method, url, response_type, params, headers, data, json, requires_oauth, auth, idempotent, cache_key,
+            cache_entry,
+        )
+        trace = self._trace(method, url, response_type, data, json)
+        if trace is None:
+            return await self._attempt(*args)
+
+        trace.emit(RequestEvents.REQUEST_START)
+        try:
+            return await self._attempt(*args, trace)
+        except Exception as e:
+            trace.emit(RequestEvents.ERROR, error=e)
+            raise
+
+    async def _attempt(
+            self,
+            method: str,
+            url: str,
+            response_type: Type[R],
+            params: Optional[dict[str, Any]],
+            headers: Optional[dict[str, Any]],
+            data: Optional[dict[str, Any]],
+            json: Optional[dict[str, any]],
+            requires_oauth: bool,
+            auth: aiohttp.BasicAuth,
+            idempotent: bool,
+            cache_key: Optional[str],
+            cache_entry: Optional[CacheEntry],
+            trace: Optional[RequestTrace] = None,
+    ) -> R:
+        """Sends a request until it succeeds or may no longer be retried, reporting its events to ``trace``."""
+        if cache_entry is not None:
+            headers = {**(headers or {}), **cache_entry.conditional_headers()}
+        if requires_oauth:
+            headers = {**(headers or {}), 'Authorization': await self.oauth_context()}
+
+        endpoint = self.rate_limiter.endpoint_key(url)
+        attempt = 0
+        while True:
+            attempt += 1
+            can_retry = self.retry_policy.can_retry(attempt, idempotent)
+            waited = await self.rate_limiter.acquire_async(endpoint)
+            if trace is not None:
+                trace.attempt = attempt
+                if waited > 0:
+                    trace.emit(RequestEvents.THROTTLE_WAIT, duration=waited)
+
+            try:
+                status, response_headers, content = await self._send(
+                    method, url, response_type, headers, params, auth, data, json, trace,
+                )
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if not can_retry:
+                    raise
+                delay = self.retry_policy.delay(attempt)
+                if trace is not None:
+                    trace.emit(RequestEvents.RETRY, duration=delay, error=e)
+                await asyncio.sleep(delay)
+                continue
+
+            if status == 304 and cache_entry is not None:
+                result = self.cache.revalidated(cache_key, cache_entry, response_type, response_headers, self._raw())
+                if trace is not None:
+                    trace.emit(
+                        RequestEvents.REQUEST_END,
+                        status=status,
+                        error_code=PlatformErrorCodes.Success.value,
+                        duration=time.monotonic() - trace.start,
+                    )
+                return result
+
+            if can_retry and self.retry_policy.should_retry_status(status):
+                try:
+                    self.rate_limiter.observe(endpoint, self.json_decoder.loads(content))
+                except ValueError:
+                    pass
+                delay = self.retry_policy.delay(attempt)
+                if trace is not None:
+                    trace.emit(RequestEvents.RETRY, status=status, duration=delay)
+                await asyncio.sleep(delay)
+                continue
+
+            started = time.monotonic() if trace is not None else 0
+            try:
+                body = self.json_decoder.loads(content)
+            except ValueError as e:
+                # Error pages, such as HTML from a proxy, fail like any other error response from aiohttp would.
+                raise self._not_json(method, url, headers, status, response_headers) from e
+            if trace is not None:
+                trace.emit(RequestEvents.JSON_PARSED, status=status, duration=time.monotonic() - started)
+            self.rate_limiter.observe(endpoint, body)
+            if can_retry and self.retry_policy.should_retry_response(body):
+                delay = self.retry_policy.delay(attempt)
+                if trace is not None:
+                    trace.emit(RequestEvents.RETRY, status=status, error_code=body.get('ErrorCode'), duration=delay)
+                await asyncio.sleep(delay)
+                continue
+
+            started = time.monotonic() if trace is not None else 0
+            raw = self._raw()
+            if raw:
+                # Raw responses are not kept decoded, the cache rebuilds them from the body so hits never share one.
+                result = RawResponse.build(raw, content, body)
+            else:
+                result = ModelDecoder.decode(response_type, body, self._option('lazy', self.lazy))
+            if trace is not None:
+                trace.emit(RequestEvents.MODEL_DECODED, status=status, duration=time.monotonic() - started)
+            if cache_key is not None and body.get('ErrorCode') == PlatformErrorCodes.Success.value:
+                self.cache.set(cache_key, response_type, content, None if raw else result, response_headers)
+            if trace is not None:
+                trace.emit(
+                    RequestEvents.REQUEST_END,
+                    status=status,
+                    error_code=body.get('ErrorCode'),
+                    bytes_in=len(content),
+                    duration=time.monotonic() - trace.start,
+                )
+            return result
+
+    @staticmethod
+    def _not_json(
+            method: str,
+            url: str,
+            headers: Optional[dict[str, Any]],
+            status: int,
+            response_headers: Mapping[str, str],
+    ) -> aiohttp.ContentTypeError:
+        request_info = aiohttp.RequestInfo(URL(url), method, CIMultiDictProxy(CIMultiDict(headers or {})))
+        return aiohttp.ContentTypeError(
+            request_info,
+            (),
+            status=status,
+            message=f"Response body is not JSON, content type: {response_headers.get('Content-Type')}",
+            headers=response_headers,
+        )
 
     async def get(
             self,
@@ -88,16 +407,43 @@ class BungieClientAsync(
             requires_oauth: bool = False,
             auth: aiohttp.BasicAuth = None,
     ) -> R:
-        async with self.session(with_oauth=requires_oauth) as session:
-            async with session.get(
-                url,
-                headers=headers,
-                params=params,
-                auth=auth,
-                data=data,
-                json=json,
-            ) as r:
-                return response_type.from_dict(await r.json())
+        cache_key = self._cache_key(url, response_type, params, headers, data, json, requires_oauth, auth)
+        cache_entry = None
+        if cache_key is not None:
+            cache_entry = self.cache.lookup(cache_key)
+            if cache_entry is not None:
+                if not cache_entry.expired:
+                    result = self.cache.decode(cache_entry, response_type, self._raw())
+                    if self._hooks:
+                        self._trace('GET', url, response_type, data, json).emit(RequestEvents.CACHE_HIT)
+                    return result
+                if not cache_entry.revalidatable:
+                    cache_entry = None
+
+        if not self.coalesce_requests:
+            return await self._request(
+                'GET', url, response_type, params, headers, data, json, requires_oauth, auth, True, cache_key, cache_entry,
+            )
+
+        self._bind_loop()
+        key = self._request_key('GET', url, response_type, params, headers, data, json, requires_oauth, auth)
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._request(
+                'GET', url, response_type, params, headers, data, json, requires_oauth, auth, True, cache_key, cache_entry,
+            ))
+            self._in_flight[key] = future
+            future.add_done_callback(lambda f: self._request_done(key, f))
+
+        # Shielded so that one cancelled caller does not cancel the request for everyone else.
+        return await asyncio.shield(future)
+
+    def _request_done(self, key: tuple, future: asyncio.Future) -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        # Mark the exception as retrieved, in case every caller was cancelled before it was raised.
+        if not future.cancelled():
+            future.exception()
 
     async def post(
             self,
@@ -109,24 +455,20 @@ class BungieClientAsync(
             json: Optional[dict[str, any]] = None,
             requires_oauth: bool = False,
             auth: aiohttp.BasicAuth = None,
+            idempotent: bool = False,
     ) -> R:
-        async with self.session(with_oauth=requires_oauth) as session:
-            async with session.post(
-                url,
-                headers=headers,
-                params=params,
-                auth=auth,
-                data=data,
-                json=json,
-            ) as r:
-                return response_type.from_dict(await r.json())
+        return await self._request(
+            'POST', url, response_type, params, headers, data, json, requires_oauth, auth, idempotent,
+        )
 
     async def gen_oauth_context(
             self,
             code: str
     ) -> None:
         try:
-            self._access_token = await self.oauth.get_access_token(code)
+            # The client relies on token models, whatever the raw setting is.
+            with self.options(raw=None):
+                self._access_token = await self.oauth.get_access_token(code)
         except aiohttp.ClientResponseError:
             raise OAuthContextGenFailedException(f"Failed to create OAuth context with code: {code}.")
 
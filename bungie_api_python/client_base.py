@@ -1,21 +1,33 @@
 # --- IMPORTS ----------------------------------------------------------------------------------------------------------
 import abc
-from contextlib import contextmanager, asynccontextmanager
-from typing import Generator, overload, TypeVar, Type, Optional, Any
+import json as json_module
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import overload, TypeVar, Type, Optional, Any, Generator, TYPE_CHECKING
+from urllib.parse import urlencode
 
-import requests
-from requests.auth import HTTPBasicAuth
-import aiohttp
-
-from .endpoint_base import EndpointBase
+from .cache import ResponseCache
+from .endpoint_base import EndpointBase, BUNGIE_URL
 from .entities.core import AccessToken
 from .entities.core.enums import OAuthClientType
-from .entities.responses import Response
+from .entities.responses import Response, RawResponse
+from .hooks import RequestEvents, RequestTrace, Hook
+from .transport import Cassette, Exchange
+from .utils import JSONDecoder, RateLimiter, RetryPolicy
+
+if TYPE_CHECKING:
+    # Each client imports only its own HTTP library, so the sync client never loads aiohttp and vice versa.
+    import aiohttp
+    import requests
+    from requests.auth import HTTPBasicAuth
 
 # --- TYPING -----------------------------------------------------------------------------------------------------------
 R = TypeVar('R', bound=Response | AccessToken)
 EndpointType = TypeVar('EndpointType', bound=EndpointBase)
 
+# Per call option overrides, keyed by the id of the client they apply to.
+_call_options: ContextVar[dict[int, dict[str, Any]]] = ContextVar('call_options', default={})
+
 
 # --- ABSTRACT BASE CLASSES --------------------------------------------------------------------------------------------
 class ClientBase(abc.ABC):
@@ -23,6 +35,8 @@ class ClientBase(abc.ABC):
     client implementations both inherit from.
 
     This class manages connection sessions across the multitude of endpoints in use.
+    A single session (and its connection pool) is created per client and shared by
+    every endpoint group, so connections are kept alive between calls.
     """
     _endpoints: list[EndpointType]
 
@@ -30,6 +44,22 @@ class ClientBase(abc.ABC):
     client_id: int
     client_type: OAuthClientType
 
+    rate_limiter: RateLimiter
+    retry_policy: RetryPolicy
+    cache: Optional[ResponseCache]
+    json_decoder: JSONDecoder
+    lazy: bool
+    raw: Optional[str]
+    base_url: str
+    cassette: Optional[Cassette]
+
+    # The options that can be overridden for the calls made within a ``client.options(...)`` block.
+    CALL_OPTIONS = frozenset({
+        'cache',
+        'lazy',
+        'raw',
+    })
+
     _access_token: Optional[AccessToken]
 
     def __init__(
@@ -38,18 +68,53 @@ class ClientBase(abc.ABC):
             client_type: OAuthClientType = OAuthClientType.Public,
             client_id: int = None,
             client_secret: str = None,
+            rate_limiter: Optional[RateLimiter] = None,
+            retry_policy: Optional[RetryPolicy] = None,
+            cache: Optional[ResponseCache] = None,
+            json_decoder: Optional[JSONDecoder | str] = None,
+            lazy: bool = False,
+            raw: Optional[str] = None,
+            base_url: Optional[str] = None,
+            cassette: Optional[Cassette] = None,
     ) -> None:
         """Instantiates the client class and all endpoint classes.
 
         :param api_key: The Bungie API key that will be used when making requests.
+        :param rate_limiter: The rate limiter shared by every endpoint group. Defaults to a limiter that
+            only pauses requests when Bungie responds with a throttle.
+        :param retry_policy: The policy used to retry transient failures. Defaults to up to 3 attempts for
+            idempotent requests, use ``RetryPolicy.disabled()`` to turn retries off.
+        :param cache: An optional cache for the responses of GET endpoints.
+        :param json_decoder: The decoder used to parse response bodies, or the name of its backend.
+            Defaults to the fastest installed backend.
+        :param lazy: Whether the ``Response`` payload of responses is only decoded into models when first read.
+            Responses that are mostly checked for their ``ErrorCode`` or passed through then cost far less.
+        :param raw: Skips model construction entirely: ``'dict'`` returns the parsed response body, and ``'bytes'``
+            returns a :class:`RawResponse` holding the body bytes and its decoded envelope. None returns models.
+        :param base_url: The root url requests are sent to instead of ``https://www.bungie.net``,
+            such as a local stand-in server.
+        :param cassette: Records every exchange with the API to a :class:`Cassette`, or replays recorded exchanges
+            from it instead of sending requests, depending on its mode.
         """
         self.api_key = api_key
         self.client_id = client_id
         self.client_secret = client_secret
         self.client_type = client_type
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.cache = cache
+        if not isinstance(json_decoder, JSONDecoder):
+            json_decoder = JSONDecoder(json_decoder or 'auto')
+        self.json_decoder = json_decoder
+        self.lazy = lazy
+        self.raw = self._check_raw(raw)
+        self.base_url = (base_url or BUNGIE_URL).rstrip('/')
+        self.cassette = cassette
 
         self._session = None
         self._access_token = None
+        # Hook lists are replaced rather than modified, so requests in flight can iterate them safely.
+        self._hooks: dict[str, list[Hook]] = {}
 
         for endpoint in self._endpoints:
             setattr(self, endpoint.name, endpoint(self))
@@ -65,15 +130,164 @@ class ClientBase(abc.ABC):
             )
         cls._endpoints = endpoints
 
-    @abc.abstractmethod
-    @overload
-    @asynccontextmanager
-    async def session(self, with_oauth: bool) -> Generator[aiohttp.ClientSession, None, None]:
-        ...
+    @contextmanager
+    def options(self, **options: Any) -> Generator['ClientBase', None, None]:
+        """Overrides client options for the calls made within the ``with`` block.
+
+        Overrides only apply to the current thread or task (and the calls it runs through the client's ``map`` and ``submit``),
+        so they can be used on a client that is shared.
+
+        :param cache: Set to False to neither read from nor write to the response cache.
+        :param lazy: Whether response payloads are only decoded when first read, see the ``lazy`` client setting.
+        :param raw: How responses are returned without building models, see the ``raw`` client setting.
+        """
+        unknown = options.keys() - self.CALL_OPTIONS
+        if unknown:
+            raise TypeError(f"Unknown call options: {', '.join(sorted(unknown))}.")
+        if 'raw' in options:
+            self._check_raw(options['raw'])
+
+        current = _call_options.get()
+        token = _call_options.set({**current, id(self): {**current.get(id(self), {}), **options}})
+        try:
+            yield self
+        finally:
+            _call_options.reset(token)
+
+    def add_hook(self, event: str, hook: Hook) -> None:
+        """Calls ``hook`` with a :class:`RequestEvent` every time the event happens during a request.
+
+        ``client.add_hook(RequestEvents.MODEL_DECODED, lambda e: print(e.endpoint, e.duration))``
+
+        :param event: One of the ``RequestEvents``, or ``*`` for every event.
+        :param hook: The function called, on the thread or task that made the request. Exceptions it raises are
+            raised to the caller of the request.
+        """
+        if event != '*' and event not in RequestEvents.ALL:
+            raise ValueError(f'Unknown request event "{event}".')
+        self._hooks = {**self._hooks, event: [*self._hooks.get(event, ()), hook]}
+
+    def remove_hook(self, event: str, hook: Hook) -> None:
+        hooks = [registered for registered in self._hooks.get(event, ()) if registered != hook]
+        self._hooks = {key: value for key, value in {**self._hooks, event: hooks}.items() if value}
+
+    def _trace(
+            self,
+            method: str,
+            url: str,
+            response_type: type,
+            data: Optional[dict[str, Any] | str],
+            json: Optional[dict[str, any]],
+    ) -> Optional[RequestTrace]:
+        """A trace reporting the request's events to the registered hooks, or None when there are none."""
+        if not self._hooks:
+            return None
+
+        bytes_out = 0
+        if json is not None:
+            bytes_out = len(json_module.dumps(json).encode())
+        elif isinstance(data, (str, bytes)):
+            bytes_out = len(data)
+        elif data:
+            bytes_out = len(urlencode(data))
+        return RequestTrace(self._hooks, method, url, response_type, bytes_out)
+
+    def _option(self, name: str, default: Any) -> Any:
+        return _call_options.get().get(id(self), {}).get(name, default)
+
+    @staticmethod
+    def _check_raw(raw: Optional[str]) -> Optional[str]:
+        if raw and raw not in RawResponse.MODES:
+            raise ValueError(f"Unknown raw mode \"{raw}\", expected one of: {', '.join(RawResponse.MODES)}.")
+        return raw or None
+
+    def _raw(self) -> Optional[str]:
+        """The raw mode of the current call, None if models are returned."""
+        return self._option('raw', self.raw) or None
+
+    @staticmethod
+    def _freeze(value: Any) -> Any:
+        """Converts request arguments into a hashable value that can be used as a key."""
+        if isinstance(value, dict):
+            return tuple(sorted((key, ClientBase._freeze(item)) for key, item in value.items()))
+        if isinstance(value, (list, tuple, set)):
+            return tuple(ClientBase._freeze(item) for item in value)
+        return value
+
+    def _identity(self, requires_oauth: bool) -> Optional[int]:
+        """The Bungie.net membership a request is made on behalf of, if any."""
+        if requires_oauth and self._access_token is not None:
+            return self._access_token.membership_id
+        return None
+
+    def _request_key(
+            self,
+            method: str,
+            url: str,
+            response_type: Type[R],
+            params: Optional[dict[str, Any]],
+            headers: Optional[dict[str, Any]],
+            data: Optional[dict[str, Any]],
+            json: Optional[dict[str, any]],
+            requires_oauth: bool,
+            auth: Any,
+    ) -> tuple:
+        """Builds a key identifying requests that would receive the same response."""
+        return (
+            method,
+            url,
+            response_type,
+            self._freeze(params),
+            self._freeze(headers),
+            self._freeze(data),
+            self._freeze(json),
+            requires_oauth,
+            self._identity(requires_oauth),
+            self._freeze(auth),
+            self._raw(),
+        )
+
+    def _cache_key(
+            self,
+            url: str,
+            response_type: Type[R],
+            params: Optional[dict[str, Any]],
+            headers: Optional[dict[str, Any]],
+            data: Optional[dict[str, Any]],
+            json: Optional[dict[str, any]],
+            requires_oauth: bool,
+            auth: Any,
+    ) -> Optional[str]:
+        """The key a GET response is cached under, or None if it should not be cached."""
+        if self.cache is None or not self._option('cache', True) or not self.cache.cacheable(response_type):
+            return None
+        # Without an identity, OAuth protected responses could be shared between users.
+        if requires_oauth and self._identity(requires_oauth) is None:
+            return None
+
+        return self.cache.key(
+            self._request_key('GET', url, response_type, params, headers, data, json, requires_oauth, auth)
+        )
+
+    def _exchange(
+            self,
+            method: str,
+            url: str,
+            response_type: type,
+            params: Optional[dict[str, Any]],
+            data: Optional[dict[str, Any]],
+            json: Optional[dict[str, any]],
+    ) -> Exchange:
+        """The cassette exchange for a request, with its url relative to ``base_url`` so recordings are portable."""
+        if url.startswith(self.base_url):
+            url = url[len(self.base_url):]
+        exchange = Cassette.request(method, url, params, data, json)
+        exchange.response_type = f'{response_type.__module__}.{response_type.__qualname__}'
+        return exchange
 
     @abc.abstractmethod
-    @contextmanager
-    def session(self, with_oauth: bool) -> Generator[requests.Session, None, None]:
+    def session(self) -> 'requests.Session | aiohttp.ClientSession':
+        """Returns the long-lived HTTP session owned by this client, creating it on first use."""
         pass
 
     @abc.abstractmethod
@@ -87,7 +301,7 @@ class ClientBase(abc.ABC):
             data: Optional[dict[str, Any]] = None,
             json: Optional[dict[str, any]] = None,
             requires_oauth: bool = False,
-            auth: aiohttp.BasicAuth = None,
+            auth: 'aiohttp.BasicAuth' = None,
     ) -> R:
         ...
 
@@ -101,7 +315,7 @@ class ClientBase(abc.ABC):
             data: Optional[dict[str, Any]] = None,
             json: Optional[dict[str, any]] = None,
             requires_oauth: bool = False,
-            auth: HTTPBasicAuth = None,
+            auth: 'HTTPBasicAuth' = None,
     ) -> R:
         pass
 
@@ -116,7 +330,8 @@ class ClientBase(abc.ABC):
             data: Optional[dict[str, Any]] = None,
             json: Optional[dict[str, any]] = None,
             requires_oauth: bool = False,
-            auth: aiohttp.BasicAuth = None,
+            auth: 'aiohttp.BasicAuth' = None,
+            idempotent: bool = False,
     ) -> R:
         ...
 
@@ -130,7 +345,8 @@ class ClientBase(abc.ABC):
             data: Optional[dict[str, Any]] = None,
             json: Optional[dict[str, any]] = None,
             requires_oauth: bool = False,
-            auth: HTTPBasicAuth = None,
+            auth: 'HTTPBasicAuth' = None,
+            idempotent: bool = False,
     ) -> R:
         pass
 
@@ -1,24 +1,56 @@
 # --- IMPORTS ----------------------------------------------------------------------------------------------------------
 import abc
-from contextlib import contextmanager
-from typing import TypeVar, Any, Optional, Type, Generator, overload
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from http import HTTPStatus
+from typing import TypeVar, Any, Optional, Type, Callable, Iterable, overload
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from requests.structures import CaseInsensitiveDict
 
+from .cache import CacheEntry
 from .client_base import ClientBase
 from .endpoints import AppEndpoints, OAuth, UserEndpoints
 from .entities.core.oauth import AccessToken
-from .entities.responses import Response
+from .entities.decoder import ModelDecoder
+from .entities.exceptions import PlatformErrorCodes
+from .entities.responses import Response, RawResponse
+from .hooks import RequestEvents, RequestTrace
 from .utils import OAuthUtils
 from .exceptions.oauth import OAuthContextNotFoundException, OAuthContextExpiredException, \
     OAuthContextGenFailedException
 
 # --- TYPING -----------------------------------------------------------------------------------------------------------
 R = TypeVar('R', bound=Response | AccessToken)
+T = TypeVar('T')
+V = TypeVar('V')
+
+# The reason phrases of the standard statuses, replayed responses with any other status have no reason.
+_REASONS = {status.value: status.phrase for status in HTTPStatus}
 
 
 # --- CLASSES ----------------------------------------------------------------------------------------------------------
+class _InlineFuture(Future):
+    """A call scheduled from one of the client's own worker threads, run by the thread that waits on its result."""
+
+    def __init__(self, fn: Callable, args: tuple) -> None:
+        super().__init__()
+        self._call = fn, args
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        if not self.done() and self.set_running_or_notify_cancel():
+            fn, args = self._call
+            try:
+                self.set_result(fn(*args))
+            except Exception as e:
+                self.set_exception(e)
+        return super().result(timeout)
+
+
 class BungieClientSync(
     ClientBase,
     endpoints=[
@@ -39,6 +71,49 @@ class BungieClientSync(
     oauth: OAuth
     user: UserEndpoints
 
+    _session: Optional[requests.Session]
+    _executor: Optional[ThreadPoolExecutor]
+
+    def __init__(
+            self,
+            *args,
+            pool_connections: int = 10,
+            pool_maxsize: int = 10,
+            pool_block: bool = False,
+            keep_alive: bool = True,
+            max_workers: int = 8,
+            **kwargs,
+    ) -> None:
+        """Instantiates the synchronous client.
+
+        The client is thread safe, and can be shared by every thread of an application.
+
+        :param pool_connections: The number of host connection pools to cache.
+        :param pool_maxsize: The maximum number of connections kept open per host,
+            raised to ``max_workers`` if lower so that every worker thread can hold a connection.
+        :param pool_block: Whether to block when the pool has no free connections rather than opening a new one.
+        :param keep_alive: Whether connections should be kept alive between requests.
+        :param max_workers: The number of threads in the pool used by :meth:`map` and batch lookups.
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = max(pool_maxsize, max_workers)
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.max_workers = max_workers
+
+        self._executor = None
+        self._workers = threading.local()
+        self._lock = threading.Lock()
+        self._oauth_lock = threading.Lock()
+
+        super().__init__(*args, **kwargs)
+
+    def __enter__(self) -> 'BungieClientSync':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     def oauth_context(self) -> str:
         # OAuth access token not set.
         if self._access_token is None:
@@ -50,39 +125,351 @@ class BungieClientSync(
 
         # OAuth access token is expired.
         if OAuthUtils.is_token_expired(self._access_token):
-            # OAuth refresh token is expired
-            if OAuthUtils.is_refresh_token_expired(self._access_token):
-                raise OAuthContextExpiredException(
-                    "The previous OAuth context has expired and cannot be refreshed. "
-                    "Please reset the oauth context using the client's 'create_oauth_context' or 'set_oauth_context' "
-                    "method, then try using this method again."
-                )
+            # Only one thread refreshes the token, the others wait for it and then reuse the new token.
+            with self._oauth_lock:
+                if OAuthUtils.is_token_expired(self._access_token):
+                    self._refresh_oauth_context()
 
-            # Attempt automatic token refresh
-            try:
+        return OAuthUtils.access_token_header(self._access_token)
+
+    def _refresh_oauth_context(self) -> None:
+        # OAuth refresh token is expired
+        if OAuthUtils.is_refresh_token_expired(self._access_token):
+            raise OAuthContextExpiredException(
+                "The previous OAuth context has expired and cannot be refreshed. "
+                "Please reset the oauth context using the client's 'create_oauth_context' or 'set_oauth_context' "
+                "method, then try using this method again."
+            )
+
+        # Attempt automatic token refresh
+        try:
+            with self.options(raw=None):
                 self._access_token = self.oauth.refresh_access_token(self._access_token.refresh_token)
-            except requests.HTTPError:
-                raise OAuthContextExpiredException(
-                    "The previous OAuth context has expired and cannot be refreshed. "
-                    "Please reset the oauth context using the client's 'create_oauth_context' or 'set_oauth_context' "
-                    "method, then try using this method again."
-                )
+        except requests.HTTPError:
+            raise OAuthContextExpiredException(
+                "The previous OAuth context has expired and cannot be refreshed. "
+                "Please reset the oauth context using the client's 'create_oauth_context' or 'set_oauth_context' "
+                "method, then try using this method again."
+            )
 
-        return OAuthUtils.access_token_header(self._access_token)
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
 
-    @contextmanager
-    def session(self, with_oauth: bool) -> Generator[requests.Session, None, None]:
-        with requests.Session() as session:
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({
+            'X-API-Key': self.api_key,
+            'User-Agent': 'bungie-api-python'
+        })
+        if not self.keep_alive:
             session.headers.update({
-                'X-API-Key': self.api_key,
-                'User-Agent': 'bungie-api-python'
+                'Connection': 'close'
             })
-            if with_oauth:
-                session.headers.update({
-                    'Authorization': self.oauth_context()
-                })
+        return session
+
+    def open_connections(self) -> int:
+        """The number of connections the client's pools hold open, in use or idle."""
+        session = self._session
+        if session is None:
+            return 0
+
+        count = 0
+        # The same adapter is mounted for http and https.
+        for adapter in {id(adapter): adapter for adapter in session.adapters.values()}.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                # Pools start out full of placeholders, a connection in use leaves an empty slot behind.
+                idle = list(pool.pool.queue)
+                count += max(pool.pool.maxsize - len(idle), 0)
+                count += sum(1 for conn in idle if conn is not None and conn.is_connected)
+        return count
+
+    def executor(self) -> ThreadPoolExecutor:
+        """Returns the thread pool owned by this client, creating it on first use."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix='bungie-api-python',
+                        initializer=self._init_worker,
+                    )
+        return self._executor
+
+    def _init_worker(self) -> None:
+        self._workers.active = True
+
+    def _in_worker(self) -> bool:
+        """Whether the current thread is one of the client's pool threads.
+
+        Calls fanned out from a pool thread run inline, a worker waiting on calls queued behind it (and behind
+        every other waiting worker) would deadlock the pool.
+        """
+        return getattr(self._workers, 'active', False)
+
+    def submit(self, fn: Callable[..., V], *args: Any) -> 'Future[V]':
+        """Schedules ``fn(*args)`` on the client's thread pool, with the caller's ``client.options(...)`` overrides.
+
+        From the client's own pool threads, the call is instead run by the first thread to ask for its result.
+        """
+        if self._in_worker():
+            return _InlineFuture(contextvars.copy_context().run, (fn, *args))
+        return self.executor().submit(contextvars.copy_context().run, fn, *args)
+
+    def map(self, fn: Callable[[T], V], iterable: Iterable[T], workers: Optional[int] = None) -> list[V]:
+        """Calls ``fn`` on every item from the client's thread pool.
 
-            yield session
+        ``client.map(client.user.get_bungie_net_user_by_id, ids)``
+
+        :param fn: The function to call, usually an endpoint method.
+        :param iterable: The items to call the function with.
+        :param workers: The maximum number of calls in flight at once, defaults to (and is capped at) ``max_workers``.
+        :return: The results, in the order of their items. The first exception raised by a call is re-raised.
+
+        Calls run with the caller's ``client.options(...)`` overrides. Called from one of the client's own pool
+        threads, such as by a batch lookup mapped over the pool, the calls run one after another on that thread.
+        """
+        items = list(iterable)
+        workers = min(workers or self.max_workers, self.max_workers)
+        if workers <= 1 or len(items) <= 1 or self._in_worker():
+            return [fn(item) for item in items]
+
+        executor = self.executor()
+        results: list[Any] = [None] * len(items)
+        pending: dict[Future, int] = {}
+        for index, item in enumerate(items):
+            # Keep at most `workers` calls in flight, so one call to map cannot monopolize the pool.
+            if len(pending) >= workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[pending.pop(future)] = future.result()
+            pending[executor.submit(contextvars.copy_context().run, fn, item)] = index
+
+        for future in pending:
+            results[pending[future]] = future.result()
+        return results
+
+    def close(self) -> None:
+        """Closes the client's session and every pooled connection it holds, and stops its thread pool.
+
+        The client can still be used afterwards, a new session is created on the next request.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+            session, self._session = self._session, None
+
+        # Shut down outside the lock, running calls may still need the session.
+        if executor is not None:
+            executor.shutdown(wait=True)
+        if session is not None:
+            session.close()
+
+    def _send(
+            self,
+            method: str,
+            url: str,
+            response_type: type,
+            headers: Optional[dict[str, Any]],
+            params: Optional[dict[str, Any]],
+            auth: HTTPBasicAuth,
+            data: Optional[dict[str, Any]],
+            json: Optional[dict[str, any]],
+            trace: Optional[RequestTrace] = None,
+    ) -> requests.Response:
+        """Sends a single request, or replays its response from the client's cassette."""
+        exchange = None
+        if self.cassette is not None:
+            exchange = self._exchange(method, url, response_type, params, data, json)
+            if self.cassette.replaying:
+                exchange = self.cassette.replay(exchange)
+                delay = self.cassette.delay(exchange)
+                if delay:
+                    time.sleep(delay)
+                r = requests.Response()
+                r.status_code = exchange.status
+                r.reason = _REASONS.get(exchange.status, '')
+                r.headers = CaseInsensitiveDict(exchange.headers)
+                r.url = url
+                r._content = exchange.content
+                if trace is not None:
+                    trace.emit(RequestEvents.FIRST_BYTE, status=r.status_code)
+                    trace.emit(RequestEvents.BODY_READ, status=r.status_code, bytes_in=len(r.content))
+                return r
+
+        start = time.perf_counter()
+        if trace is None:
+            r = self.session().request(method, url, headers=headers, params=params, auth=auth, data=data, json=json)
+        else:
+            # Streamed, so the arrival of the headers and of the body can be told apart.
+            r = self.session().request(
+                method, url, headers=headers, params=params, auth=auth, data=data, json=json, stream=True,
+            )
+            first_byte = time.monotonic()
+            trace.emit(RequestEvents.FIRST_BYTE, status=r.status_code)
+            content = r.content
+            trace.emit(
+                RequestEvents.BODY_READ,
+                status=r.status_code,
+                bytes_in=len(content),
+                duration=time.monotonic() - first_byte,
+            )
+
+        if exchange is not None:
+            exchange.content = r.content
+            exchange.elapsed = time.perf_counter() - start
+            exchange.status = r.status_code
+            exchange.headers = list(r.headers.items())
+            self.cassette.record(exchange)
+        return r
+
+    def _request(
+            self,
+            method: str,
+            url: str,
+            response_type: Type[R],
+            params: Optional[dict[str, Any]],
+            headers: Optional[dict[str, Any]],
+            data: Optional[dict[str, Any]],
+            json: Optional[dict[str, any]],
+            requires_oauth: bool,
+            auth: HTTPBasicAuth,
+            idempotent: bool,
+            cache_key: Optional[str] = None,
+            cache_entry: Optional[CacheEntry] = None,
+    ) -> R:
+        args = (
+            method, url, response_type, params, headers, data, json, requires_oauth, auth, idempotent, cache_key,
+            cache_entry,
+        )
+        trace = self._trace(method, url, response_type, data, json)
+        if trace is None:
+            return self._attempt(*args)
+
+        trace.emit(RequestEvents.REQUEST_START)
+        try:
+            return self._attempt(*args, trace)
+        except Exception as e:
+            trace.emit(RequestEvents.ERROR, error=e)
+            raise
+
+    def _attempt(
+            self,
+            method: str,
+            url: str,
+            response_type: Type[R],
+            params: Optional[dict[str, Any]],
+            headers: Optional[dict[str, Any]],
+            data: Optional[dict[str, Any]],
+            json: Optional[dict[str, any]],
+            requires_oauth: bool,
+            auth: HTTPBasicAuth,
+            idempotent: bool,
+            cache_key: Optional[str],
+            cache_entry: Optional[CacheEntry],
+            trace: Optional[RequestTrace] = None,
+    ) -> R:
+        """Sends a request until it succeeds or may no longer be retried, reporting its events to ``trace``."""
+        if cache_entry is not None:
+            headers = {**(headers or {}), **cache_entry.conditional_headers()}
+        if requires_oauth:
+            headers = {**(headers or {}), 'Authorization': self.oauth_context()}
+
+        endpoint = self.rate_limiter.endpoint_key(url)
+        attempt = 0
+        while True:
+            attempt += 1
+            can_retry = self.retry_policy.can_retry(attempt, idempotent)
+            waited = self.rate_limiter.acquire(endpoint)
+            if trace is not None:
+                trace.attempt = attempt
+                if waited > 0:
+                    trace.emit(RequestEvents.THROTTLE_WAIT, duration=waited)
+
+            try:
+                r = self._send(method, url, response_type, headers, params, auth, data, json, trace)
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                if not can_retry:
+                    raise
+                delay = self.retry_policy.delay(attempt)
+                if trace is not None:
+                    trace.emit(RequestEvents.RETRY, duration=delay, error=e)
+                time.sleep(delay)
+                continue
+
+            if r.status_code == 304 and cache_entry is not None:
+                result = self.cache.revalidated(cache_key, cache_entry, response_type, r.headers, self._raw())
+                if trace is not None:
+                    trace.emit(
+                        RequestEvents.REQUEST_END,
+                        status=r.status_code,
+                        error_code=PlatformErrorCodes.Success.value,
+                        duration=time.monotonic() - trace.start,
+                    )
+                return result
+
+            if not r.ok:
+                # Error responses may still carry a throttle that should be respected.
+                try:
+                    self.rate_limiter.observe(endpoint, self.json_decoder.loads(r.content))
+                except ValueError:
+                    pass
+                if can_retry and self.retry_policy.should_retry_status(r.status_code):
+                    delay = self.retry_policy.delay(attempt)
+                    if trace is not None:
+                        trace.emit(RequestEvents.RETRY, status=r.status_code, duration=delay)
+                    time.sleep(delay)
+                    continue
+                r.raise_for_status()
+
+            content = r.content
+            started = time.monotonic() if trace is not None else 0
+            body = self.json_decoder.loads(content)
+            if trace is not None:
+                trace.emit(RequestEvents.JSON_PARSED, status=r.status_code, duration=time.monotonic() - started)
+            self.rate_limiter.observe(endpoint, body)
+            if can_retry and self.retry_policy.should_retry_response(body):
+                delay = self.retry_policy.delay(attempt)
+                if trace is not None:
+                    trace.emit(
+                        RequestEvents.RETRY, status=r.status_code, error_code=body.get('ErrorCode'), duration=delay,
+                    )
+                time.sleep(delay)
+                continue
+
+            started = time.monotonic() if trace is not None else 0
+            raw = self._raw()
+            if raw:
+                # Raw responses are not kept decoded, the cache rebuilds them from the body so hits never share one.
+                result = RawResponse.build(raw, content, body)
+            else:
+                result = ModelDecoder.decode(response_type, body, self._option('lazy', self.lazy))
+            if trace is not None:
+                trace.emit(RequestEvents.MODEL_DECODED, status=r.status_code, duration=time.monotonic() - started)
+            if cache_key is not None and body.get('ErrorCode') == PlatformErrorCodes.Success.value:
+                self.cache.set(cache_key, response_type, content, None if raw else result, r.headers)
+            if trace is not None:
+                trace.emit(
+                    RequestEvents.REQUEST_END,
+                    status=r.status_code,
+                    error_code=body.get('ErrorCode'),
+                    bytes_in=len(content),
+                    duration=time.monotonic() - trace.start,
+                )
+            return result
 
     def get(
             self,
@@ -95,17 +482,22 @@ class BungieClientSync(
             requires_oauth: bool = False,
             auth: HTTPBasicAuth = None,
     ) -> R:
-        with self.session(with_oauth=requires_oauth) as session:
-            r: requests.Response = session.get(
-                url,
-                headers=headers,
-                params=params,
-                auth=auth,
-                data=data,
-                json=json,
-            )
-            r.raise_for_status()
-            return response_type.from_dict(r.json())
+        cache_key = self._cache_key(url, response_type, params, headers, data, json, requires_oauth, auth)
+        cache_entry = None
+        if cache_key is not None:
+            cache_entry = self.cache.lookup(cache_key)
+            if cache_entry is not None:
+                if not cache_entry.expired:
+                    result = self.cache.decode(cache_entry, response_type, self._raw())
+                    if self._hooks:
+                        self._trace('GET', url, response_type, data, json).emit(RequestEvents.CACHE_HIT)
+                    return result
+                if not cache_entry.revalidatable:
+                    cache_entry = None
+
+        return self._request(
+            'GET', url, response_type, params, headers, data, json, requires_oauth, auth, True, cache_key, cache_entry,
+        )
 
     def post(
             self,
@@ -117,25 +509,18 @@ class BungieClientSync(
             json: Optional[dict[str, any]] = None,
             requires_oauth: bool = False,
             auth: HTTPBasicAuth = None,
+            idempotent: bool = False,
     ) -> R:
-        with self.session(with_oauth=requires_oauth) as session:
-            r: requests.Response = session.post(
-                url,
-                headers=headers,
-                params=params,
-                auth=auth,
-                data=data,
-                json=json,
-            )
-            r.raise_for_status()
-            return response_type.from_dict(r.json())
+        return self._request('POST', url, response_type, params, headers, data, json, requires_oauth, auth, idempotent)
 
     def gen_oauth_context(
             self,
             code: str
     ) -> None:
         try:
-            self._access_token = self.oauth.get_access_token(code)
+            # The client relies on token models, whatever the raw setting is.
+            with self.options(raw=None):
+                self._access_token = self.oauth.get_access_token(code)
         except requests.HTTPError:
             raise OAuthContextGenFailedException(f"Failed to create OAuth context with code: {code}.")
 
@@ -1,5 +1,9 @@
 import abc
-from typing import TypeVar, TYPE_CHECKING
+import functools
+import inspect
+from typing import Any, Awaitable, Callable, TypeVar, TYPE_CHECKING
+
+from .hooks import current_endpoint
 
 if TYPE_CHECKING:
     from .client_sync import BungieClientSync
@@ -7,10 +11,16 @@ if TYPE_CHECKING:
 
     ClientType = TypeVar('ClientType', BungieClientSync, BungieClientAsync)
 
+# The root url that the ``api_base`` of every endpoint group starts with.
+BUNGIE_URL = 'https://www.bungie.net'
+
 
 class EndpointBase(abc.ABC):
     def __init__(self, parent: 'ClientType'):
         self.parent = parent
+        # Clients pointed at another root url, such as a local stand-in server, re-root every endpoint group.
+        if parent.base_url != BUNGIE_URL and self.api_base.startswith(BUNGIE_URL):
+            self.api_base = parent.base_url + self.api_base[len(BUNGIE_URL):]
 
     def __init_subclass__(
             cls,
@@ -27,3 +37,44 @@ class EndpointBase(abc.ABC):
             name = cls.__name__
         cls.name = name
         cls.api_base = api_base
+
+        # Every public method records its name for the requests it makes, for request hooks. Generators are left
+        # alone, the methods they call record their own names.
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith('_') or not inspect.isfunction(value):
+                continue
+            if inspect.isgeneratorfunction(value) or inspect.isasyncgenfunction(value):
+                continue
+            setattr(cls, attr, cls._named(value, f'{name}.{attr}'))
+
+    @staticmethod
+    def _named(fn: Callable, endpoint: str) -> Callable:
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def named(*args, **kwargs):
+                token = current_endpoint.set(endpoint)
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    current_endpoint.reset(token)
+        else:
+            @functools.wraps(fn)
+            def named(*args, **kwargs):
+                token = current_endpoint.set(endpoint)
+                try:
+                    result = fn(*args, **kwargs)
+                finally:
+                    current_endpoint.reset(token)
+                # A plain function returning a coroutine makes its request once awaited, after it returned.
+                if inspect.iscoroutine(result):
+                    return EndpointBase._awaited(result, endpoint)
+                return result
+        return named
+
+    @staticmethod
+    async def _awaited(coroutine: Awaitable, endpoint: str) -> Any:
+        token = current_endpoint.set(endpoint)
+        try:
+            return await coroutine
+        finally:
+            current_endpoint.reset(token)
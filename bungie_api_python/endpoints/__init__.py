@@ -1,6 +1,10 @@
-from .app import AppEndpoints, AppEndpointsAsync
-from .oauth import OAuth, OAuthAsync
-from .user import UserEndpoints, UserEndpointsAsync
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .app import AppEndpoints, AppEndpointsAsync
+    from .oauth import OAuth, OAuthAsync
+    from .user import UserEndpoints, UserEndpointsAsync
 
 
 __all__ = [
@@ -11,3 +15,25 @@ __all__ = [
     'UserEndpoints',
     'UserEndpointsAsync',
 ]
+
+# Endpoint groups are imported on first use, along with the response models they need.
+_LAZY = {
+    'AppEndpoints': '.app',
+    'AppEndpointsAsync': '.app',
+    'OAuth': '.oauth',
+    'OAuthAsync': '.oauth',
+    'UserEndpoints': '.user',
+    'UserEndpointsAsync': '.user',
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -1,11 +1,10 @@
-import aiohttp
-from requests.auth import HTTPBasicAuth
-
 from ..endpoint_base import EndpointBase
 from ..entities.core.enums import OAuthClientType
 from ..entities.core.oauth import AccessToken
 from ..exceptions.oauth import NonOAuthClientTypeException
 
+# The HTTP libraries are imported where they are used, so each client only loads its own.
+
 
 class OAuth(EndpointBase, api_base='https://www.bungie.net/Platform/App/OAuth/Token', name='oauth'):
     def get_access_token(self, code: str) -> AccessToken:
@@ -26,6 +25,7 @@ class OAuth(EndpointBase, api_base='https://www.bungie.net/Platform/App/OAuth/To
         if self.parent.client_type == OAuthClientType.Public:
             body.update({'client_id': self.parent.client_id})
         elif self.parent.client_type == OAuthClientType.Confidential:
+            from requests.auth import HTTPBasicAuth
             auth = HTTPBasicAuth(str(self.parent.client_id), self.parent.client_secret)
 
         return self.parent.post(
@@ -45,6 +45,7 @@ class OAuth(EndpointBase, api_base='https://www.bungie.net/Platform/App/OAuth/To
                 'grant_type': 'refresh_token',
                 'refresh_token': refresh_token,
             }
+            from requests.auth import HTTPBasicAuth
             auth = HTTPBasicAuth(str(self.parent.client_id), self.parent.client_secret)
 
             return self.parent.post(
@@ -80,6 +81,7 @@ class OAuthAsync(EndpointBase, api_base='https://www.bungie.net/Platform/App/OAu
         if self.parent.client_type == OAuthClientType.Public:
             body.update({'client_id': self.parent.client_id})
         elif self.parent.client_type == OAuthClientType.Confidential:
+            import aiohttp
             auth = aiohttp.BasicAuth(str(self.parent.client_id), self.parent.client_secret)
 
         return await self.parent.post(
@@ -99,6 +101,7 @@ class OAuthAsync(EndpointBase, api_base='https://www.bungie.net/Platform/App/OAu
                 'grant_type': 'refresh_token',
                 'refresh_token': refresh_token,
             }
+            import aiohttp
             auth = aiohttp.BasicAuth(str(self.parent.client_id), self.parent.client_secret)
 
             return await self.parent.post(
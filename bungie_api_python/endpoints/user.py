@@ -1,11 +1,16 @@
+from typing import AsyncIterator, Iterable, Iterator
+
 from ..endpoint_base import EndpointBase
 from ..entities.core import BungieMembershipType, BungieCredentialType
+from ..entities.model_utils import EnumTable
 from ..entities.responses import GetBungieNetUserById, GetSanitizedPlatformDisplayNames, \
     GetCredentialTypesForTargetAccount, GetAvailableThemes, GetMembershipDataById, GetMembershipDataForCurrentUser, \
     GetMembershipFromHardLinkedCredential
 from ..entities.responses.user import SearchByGlobalNamePost
-from ..entities.user import UserSearchPrefixRequest
+from ..entities.user import UserSearchPrefixRequest, UserSearchResponseDetail
 from ..exceptions.core import ObsoleteEndpoint
+from ..utils.batch import BatchItem, BatchUtils
+from ..utils.pagination import PaginationUtils
 
 
 class UserEndpoints(EndpointBase, api_base='https://www.bungie.net/Platform/User', name='user'):
@@ -15,12 +20,28 @@ class UserEndpoints(EndpointBase, api_base='https://www.bungie.net/Platform/User
             response_type=GetBungieNetUserById,
         )
 
+    def get_bungie_net_users_by_id(
+            self,
+            ids: Iterable[int],
+            concurrency: int = 8,
+    ) -> list[BatchItem[GetBungieNetUserById]]:
+        return BatchUtils.run(self.get_bungie_net_user_by_id, ids, concurrency, self.parent.map)
+
     def get_sanitized_platform_display_names(self, membership_id: int) -> GetSanitizedPlatformDisplayNames:
         return self.parent.get(
             f'{self.api_base}/GetSanitizedPlatformDisplayNames/{membership_id}/',
             response_type=GetSanitizedPlatformDisplayNames,
         )
 
+    def get_sanitized_platform_display_names_by_ids(
+            self,
+            membership_ids: Iterable[int],
+            concurrency: int = 8,
+    ) -> list[BatchItem[GetSanitizedPlatformDisplayNames]]:
+        return BatchUtils.run(
+            self.get_sanitized_platform_display_names, membership_ids, concurrency, self.parent.map,
+        )
+
     def get_credential_types_for_target_account(self, membership_id: int) -> GetCredentialTypesForTargetAccount:
         return self.parent.get(
             f'{self.api_base}/GetCredentialTypesForTargetAccount/{membership_id}',
@@ -39,14 +60,26 @@ class UserEndpoints(EndpointBase, api_base='https://www.bungie.net/Platform/User
             membership_id: int,
             membership_type: BungieMembershipType | int
     ) -> GetMembershipDataById:
-        if not isinstance(membership_type, BungieMembershipType):
-            membership_type = BungieMembershipType(membership_type)
+        membership_type = EnumTable.of(BungieMembershipType).coerce(membership_type)
 
         return self.parent.get(
             f'{self.api_base}/GetMembershipsById/{membership_id}/{membership_type.value}/',
             response_type=GetMembershipDataById,
         )
 
+    def get_membership_data_by_ids(
+            self,
+            memberships: Iterable[tuple[int, BungieMembershipType | int]],
+            concurrency: int = 8,
+    ) -> list[BatchItem[GetMembershipDataById]]:
+        keys = [
+            (membership_id, EnumTable.of(BungieMembershipType).coerce(membership_type))
+            for membership_id, membership_type in memberships
+        ]
+        return BatchUtils.run(
+            lambda key: self.get_membership_data_by_id(*key), keys, concurrency, self.parent.map,
+        )
+
     def get_membership_data_for_current_user(self) -> GetMembershipDataForCurrentUser:
         return self.parent.get(
             f'{self.api_base}/GetMembershipsForCurrentUser/',
@@ -59,15 +92,10 @@ class UserEndpoints(EndpointBase, api_base='https://www.bungie.net/Platform/User
             credential_type: BungieCredentialType | int | str,
             credential: int | str,
     ) -> GetMembershipFromHardLinkedCredential:
-        if isinstance(credential_type, int):
-            credential_type = BungieCredentialType(credential_type)
-        elif isinstance(credential_type, str):
-            for cr_type in BungieCredentialType:
-                if cr_type.name == credential_type:
-                    credential_type = cr_type
-
-        if not isinstance(credential_type, BungieCredentialType):
-            raise ValueError(f'The credential type "{credential_type}" is not a valid BungieCredentialType.')
+        try:
+            credential_type = EnumTable.of(BungieCredentialType).coerce(credential_type)
+        except ValueError:
+            raise ValueError(f'The credential type "{credential_type}" is not a valid BungieCredentialType.') from None
 
         return self.parent.get(
             f'{self.api_base}/GetMembershipFromHardLinkedCredential/{credential_type.name}/{credential}/',
@@ -96,8 +124,33 @@ class UserEndpoints(EndpointBase, api_base='https://www.bungie.net/Platform/User
             headers={'Content-Type': 'application/json'},
             json=UserSearchPrefixRequest(
                 displayNamePrefix=display_name_prefix
-            ).to_dict()
+            ).to_dict(),
+            idempotent=True,
+        )
+
+    def iterate_search_by_global_name_post(
+            self,
+            display_name_prefix: str,
+            start_page: int = 0,
+            prefetch: int = 2,
+    ) -> Iterator[UserSearchResponseDetail]:
+        def fetch(page: int) -> SearchByGlobalNamePost:
+            # Pages are read as models, whatever the client's raw setting is.
+            with self.parent.options(raw=None):
+                return self.search_by_global_name_post(display_name_prefix, page)
+
+        pages = PaginationUtils.iterate(
+            fetch,
+            lambda response: response.Response.hasMore,
+            self.parent.submit,
+            start=start_page,
+            prefetch=prefetch,
         )
+        try:
+            for response in pages:
+                yield from response.Response.searchResults
+        finally:
+            pages.close()
 
 
 class UserEndpointsAsync(EndpointBase, api_base='https://www.bungie.net/Platform/User', name='user'):
@@ -107,12 +160,26 @@ class UserEndpointsAsync(EndpointBase, api_base='https://www.bungie.net/Platform
             response_type=GetBungieNetUserById,
         )
 
+    async def get_bungie_net_users_by_id(
+            self,
+            ids: Iterable[int],
+            concurrency: int = 8,
+    ) -> list[BatchItem[GetBungieNetUserById]]:
+        return await BatchUtils.run_async(self.get_bungie_net_user_by_id, ids, concurrency)
+
     async def get_sanitized_platform_display_names(self, membership_id: int) -> GetSanitizedPlatformDisplayNames:
         return await self.parent.get(
             f'{self.api_base}/GetSanitizedPlatformDisplayNames/{membership_id}/',
             response_type=GetSanitizedPlatformDisplayNames,
         )
 
+    async def get_sanitized_platform_display_names_by_ids(
+            self,
+            membership_ids: Iterable[int],
+            concurrency: int = 8,
+    ) -> list[BatchItem[GetSanitizedPlatformDisplayNames]]:
+        return await BatchUtils.run_async(self.get_sanitized_platform_display_names, membership_ids, concurrency)
+
     async def get_credential_types_for_target_account(self, membership_id: int) -> GetCredentialTypesForTargetAccount:
         return await self.parent.get(
             f'{self.api_base}/GetCredentialTypesForTargetAccount/{membership_id}',
@@ -131,14 +198,24 @@ class UserEndpointsAsync(EndpointBase, api_base='https://www.bungie.net/Platform
             membership_id: int,
             membership_type: BungieMembershipType | int
     ) -> GetMembershipDataById:
-        if not isinstance(membership_type, BungieMembershipType):
-            membership_type = BungieMembershipType(membership_type)
+        membership_type = EnumTable.of(BungieMembershipType).coerce(membership_type)
 
         return await self.parent.get(
             f'{self.api_base}/GetMembershipsById/{membership_id}/{membership_type.value}/',
             response_type=GetMembershipDataById,
         )
 
+    async def get_membership_data_by_ids(
+            self,
+            memberships: Iterable[tuple[int, BungieMembershipType | int]],
+            concurrency: int = 8,
+    ) -> list[BatchItem[GetMembershipDataById]]:
+        keys = [
+            (membership_id, EnumTable.of(BungieMembershipType).coerce(membership_type))
+            for membership_id, membership_type in memberships
+        ]
+        return await BatchUtils.run_async(lambda key: self.get_membership_data_by_id(*key), keys, concurrency)
+
     async def get_membership_data_for_current_user(self) -> GetMembershipDataForCurrentUser:
         return await self.parent.get(
             f'{self.api_base}/GetMembershipsForCurrentUser/',
@@ -151,15 +228,10 @@ class UserEndpointsAsync(EndpointBase, api_base='https://www.bungie.net/Platform
             credential_type: BungieCredentialType | int | str,
             credential: int | str,
     ) -> GetMembershipFromHardLinkedCredential:
-        if isinstance(credential_type, int):
-            credential_type = BungieCredentialType(credential_type)
-        elif isinstance(credential_type, str):
-            for cr_type in BungieCredentialType:
-                if cr_type.name == credential_type:
-                    credential_type = cr_type
-
-        if not isinstance(credential_type, BungieCredentialType):
-            raise ValueError(f'The credential type "{credential_type}" is not a valid BungieCredentialType.')
+        try:
+            credential_type = EnumTable.of(BungieCredentialType).coerce(credential_type)
+        except ValueError:
+            raise ValueError(f'The credential type "{credential_type}" is not a valid BungieCredentialType.') from None
 
         return await self.parent.get(
             f'{self.api_base}/GetMembershipFromHardLinkedCredential/{credential_type.name}/{credential}/',
@@ -177,16 +249,41 @@ class UserEndpointsAsync(EndpointBase, api_base='https://www.bungie.net/Platform
             "#operation_get_User-SearchByGlobalNamePrefix)"
         )
 
-    def search_by_global_name_post(
+    async def search_by_global_name_post(
             self,
             display_name_prefix: str,
             page: int,
     ) -> SearchByGlobalNamePost:
-        return self.parent.post(
+        return await self.parent.post(
             f'{self.api_base}/Search/GlobalName/{page}/',
             response_type=SearchByGlobalNamePost,
             headers={'Content-Type': 'application/json'},
             data=UserSearchPrefixRequest(
                 displayNamePrefix=display_name_prefix
-            ).to_json()
+            ).to_json(),
+            idempotent=True,
+        )
+
+    async def iterate_search_by_global_name_post(
+            self,
+            display_name_prefix: str,
+            start_page: int = 0,
+            prefetch: int = 2,
+    ) -> AsyncIterator[UserSearchResponseDetail]:
+        async def fetch(page: int) -> SearchByGlobalNamePost:
+            # Pages are read as models, whatever the client's raw setting is.
+            with self.parent.options(raw=None):
+                return await self.search_by_global_name_post(display_name_prefix, page)
+
+        pages = PaginationUtils.iterate_async(
+            fetch,
+            lambda response: response.Response.hasMore,
+            start=start_page,
+            prefetch=prefetch,
         )
+        try:
+            async for response in pages:
+                for detail in response.Response.searchResults:
+                    yield detail
+        finally:
+            await pages.aclose()
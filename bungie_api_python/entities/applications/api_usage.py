@@ -6,7 +6,7 @@ from .series import Series
 
 
 @dataclass_json
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class ApiUsage:
     apiCalls: list[Series]
     throttledRequests: list[Series]
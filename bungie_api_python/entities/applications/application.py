@@ -9,7 +9,7 @@ from ..model_utils import datetime_metadata, int64_enum_metadata
 
 
 @dataclass_json
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class Application:
     applicationId: int
     name: str
@@ -7,7 +7,7 @@ from ..user import UserInfoCard
 
 
 @dataclass_json
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class ApplicationDeveloper:
     role: DeveloperRole
     apiEulaVersion: int
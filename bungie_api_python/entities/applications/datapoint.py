@@ -5,16 +5,16 @@ from typing import Optional
 from dataclasses_json import dataclass_json, config
 from marshmallow import fields
 
-from ..model_utils import datetime_field_encoder, datetime_field_decoder
+from ..model_utils import datetime_field_encoder, cached_datetime_field_decoder
 
 
 @dataclass_json
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class Datapoint:
     time: datetime = field(
         metadata=config(
             encoder=datetime_field_encoder,
-            decoder=datetime_field_decoder,
+            decoder=cached_datetime_field_decoder,
             mm_field=fields.DateTime(format='iso')
         )
     )
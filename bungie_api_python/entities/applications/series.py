@@ -6,7 +6,7 @@ from .datapoint import Datapoint
 
 
 @dataclass_json
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class Series:
     datapoints: list[Datapoint]
     target: str
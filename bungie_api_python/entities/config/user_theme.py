@@ -4,7 +4,7 @@ from dataclasses_json import dataclass_json
 
 
 @dataclass_json
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class UserTheme:
     userThemeId: int
     userThemeName: str
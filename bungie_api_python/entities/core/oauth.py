@@ -8,7 +8,7 @@ from ...utils import OAuthUtils
 
 
 @dataclass_json
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class AccessToken:
     # Standard Bungie fields.
     access_token: str
@@ -0,0 +1,335 @@
+import dataclasses
+import threading
+import warnings
+from datetime import datetime, timezone
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Optional, Type, TypeVar, Union, get_args, get_origin, get_type_hints
+from types import NoneType, UnionType
+from uuid import UUID
+
+from dataclasses_json import cfg
+
+from .model_utils import EnumTable
+
+
+T = TypeVar('T')
+Converter = Callable[[Any], Any]
+
+PRIMITIVES = (int, float, str, bool)
+# Types dataclasses_json converts by calling the type with the value.
+EXTENDED = (*PRIMITIVES, Decimal, UUID)
+
+
+class UnsupportedType(TypeError):
+    """Raised while compiling a model with a field type the compiler has no specialised decoding for."""
+
+
+class ModelDecoder:
+    """Builds a specialised decode function per model class, replacing ``dataclasses_json``'s ``from_dict``.
+
+    ``from_dict`` inspects the type hints and field metadata of a class every time an object of that class
+    is decoded. The compiler does that work once per class, on first use, and generates a function that only
+    converts the values which need converting. Decoded models are identical to those returned by ``from_dict``,
+    including the ``None`` handling and warnings for fields that are not ``Optional``.
+
+    Classes using features the compiler does not specialise (letter case or undefined parameter handling,
+    tuples, unions of several types, ...) keep using their ``from_dict`` method. Decoders registered in the
+    ``dataclasses_json`` global config are honoured, but only if they are registered before first use.
+
+    Models listing fields in a ``LAZY_FIELDS`` class variable can also be decoded lazily, in which case the raw
+    values of those fields are kept on the instance (under :attr:`LAZY_PREFIX` + the field name) and are only
+    decoded by :meth:`decode_field` when the model looks them up, see ``Response.__getattr__``.
+    """
+    LAZY_PREFIX = '_lazy_'
+
+    _decoders: dict[type, Callable[[Any], Any]] = {}
+    _lazy_decoders: dict[type, Callable[[Any], Any]] = {}
+    _field_decoders: dict[tuple[type, str], Callable[[Any], Any]] = {}
+    _compiling: set[type] = set()
+    _lock = threading.RLock()
+
+    @classmethod
+    def decode(cls, model: Type[T], data: Any, lazy: bool = False) -> T:
+        """Decodes a JSON object (usually a response body) into a model.
+
+        :param lazy: Whether the model's ``LAZY_FIELDS`` are only decoded when they are first read.
+        """
+        decoder = (cls._lazy_decoders if lazy else cls._decoders).get(model)
+        if decoder is None:
+            decoder = cls.lazy_decoder(model) if lazy else cls.decoder(model)
+        return decoder(data)
+
+    @classmethod
+    def decode_field(cls, model: type, name: str, value: Any) -> Any:
+        """Decodes the raw value of a single field of a model."""
+        decoder = cls._field_decoders.get((model, name))
+        if decoder is None:
+            with cls._lock:
+                decoder = cls._field_decoders.get((model, name))
+                if decoder is None:
+                    decoder = cls._field_decoders[(model, name)] = cls._compile(model, only=name)
+        return decoder({name: value})
+
+    @classmethod
+    def decoder(cls, model: Type[T]) -> Callable[[Any], T]:
+        """The decode function of a model class, compiled on first use."""
+        decoder = cls._decoders.get(model)
+        if decoder is not None:
+            return decoder
+
+        with cls._lock:
+            decoder = cls._decoders.get(model)
+            if decoder is None:
+                try:
+                    decoder = cls._compile(model)
+                except UnsupportedType:
+                    if not hasattr(model, 'from_dict'):
+                        raise
+                    decoder = model.from_dict
+                cls._decoders[model] = decoder
+        return decoder
+
+    @classmethod
+    def lazy_decoder(cls, model: Type[T]) -> Callable[[Any], T]:
+        """The decode function of a model class that leaves its ``LAZY_FIELDS`` undecoded, compiled on first use."""
+        decoder = cls._lazy_decoders.get(model)
+        if decoder is not None:
+            return decoder
+
+        with cls._lock:
+            decoder = cls._lazy_decoders.get(model)
+            if decoder is None:
+                decoder = cls.decoder(model)
+                lazy = frozenset(getattr(model, 'LAZY_FIELDS', ()))
+                # Raw values are kept in the instance dict, which slotted models do not have.
+                if lazy and '__slots__' not in vars(model) and decoder is not getattr(model, 'from_dict', None):
+                    decoder = cls._compile(model, lazy=lazy)
+                cls._lazy_decoders[model] = decoder
+        return decoder
+
+    @classmethod
+    def clear(cls) -> None:
+        """Forgets every compiled decoder, for instance after registering a global ``dataclasses_json`` decoder."""
+        with cls._lock:
+            cls._decoders.clear()
+            cls._lazy_decoders.clear()
+            cls._field_decoders.clear()
+
+    # --- COMPILATION --------------------------------------------------------------------------------------------------
+    @classmethod
+    def _compile(
+            cls,
+            model: type,
+            lazy: frozenset[str] = frozenset(),
+            only: Optional[str] = None,
+    ) -> Callable[[Any], Any]:
+        """Generates the decode function of a model, converting the raw values read from a JSON object.
+
+        :param lazy: The fields whose raw values are kept for later decoding. When set, the model is created
+            without calling its ``__init__``, which lazily decoded models must not rely on.
+        :param only: The single field to decode, the function then returns its decoded value.
+        """
+        if getattr(model, 'dataclass_json_config', None):
+            raise UnsupportedType(f'{model.__name__} has a class level dataclasses_json config.')
+
+        cls._compiling.add(model)
+        try:
+            hints = get_type_hints(model)
+            namespace: dict[str, Any] = {
+                'model': model,
+                'is_dataclass': dataclasses.is_dataclass,
+                'none': cls._warn_none,
+                'new': object.__new__,
+            }
+            lines = [
+                'def decode(d):',
+                '    if d.__class__ is not dict and isinstance(d, model):',
+                '        return d',
+            ]
+            arguments = {}
+
+            for index, field in enumerate(dataclasses.fields(model)):
+                if not field.init or (only is not None and field.name != only):
+                    continue
+                lines.append(cls._read_line(field, index, namespace))
+                if field.name in lazy:
+                    arguments[cls.LAZY_PREFIX + field.name] = f'v{index}'
+                else:
+                    lines.extend(cls._field_lines(model, field, hints[field.name], index, namespace))
+                    arguments[field.name] = f'v{index}'
+
+            if only is not None:
+                lines.append(f'    return {arguments[only]}')
+            elif lazy:
+                values = ', '.join(f'{name!r}: {var}' for name, var in arguments.items())
+                lines.append('    instance = new(model)')
+                lines.append(f'    instance.__dict__.update({{{values}}})')
+                lines.append('    return instance')
+            else:
+                lines.append(f'    return model({", ".join(f"{k}={v}" for k, v in arguments.items())})')
+            exec('\n'.join(lines), namespace)
+        finally:
+            cls._compiling.discard(model)
+
+        decode = namespace['decode']
+        decode.__qualname__ = decode.__name__ = f'decode_{model.__name__}'
+        return decode
+
+    @staticmethod
+    def _read_line(field: dataclasses.Field, index: int, namespace: dict[str, Any]) -> str:
+        """Reads a field's raw value. Missing fields take their default, or raise a KeyError."""
+        name = field.name
+        if field.default is not dataclasses.MISSING:
+            namespace[f'default{index}'] = field.default
+            return f'    v{index} = d.get({name!r}, default{index})'
+        if field.default_factory is not dataclasses.MISSING:
+            namespace[f'factory{index}'] = field.default_factory
+            return f'    v{index} = d[{name!r}] if {name!r} in d else factory{index}()'
+        return f'    v{index} = d[{name!r}]'
+
+    @classmethod
+    def _field_lines(
+            cls,
+            model: type,
+            field: dataclasses.Field,
+            field_type: Any,
+            index: int,
+            namespace: dict[str, Any],
+    ) -> list[str]:
+        name = field.name
+        var = f'v{index}'
+        override = field.metadata.get('dataclasses_json', {})
+        if override.get('letter_case') or override.get('field_name'):
+            raise UnsupportedType(f'{model.__name__}.{name} is renamed.')
+
+        lines = []
+        if cls._is_optional(field_type):
+            lines.append(f'    if {var} is not None:')
+        else:
+            lines.append(f'    if {var} is None:')
+            lines.append(f'        none({name!r}, model)')
+            lines.append('    else:')
+
+        while hasattr(field_type, '__supertype__'):
+            field_type = field_type.__supertype__
+
+        decoder = override.get('decoder') or cfg.global_config.decoders.get(field.type)
+        if decoder is not None:
+            namespace[f'decoder{index}'] = decoder
+            namespace[f'type{index}'] = field_type
+            lines.append(
+                f'        {var} = {var} if type({var}) is type{index} else decoder{index}({var})'
+            )
+        elif dataclasses.is_dataclass(field_type):
+            namespace[f'convert{index}'] = cls._model_converter(field_type)
+            lines.append(f'        if {var}.__class__ is dict or not is_dataclass({var}):')
+            lines.append(f'            {var} = convert{index}({var})')
+        elif isinstance(field_type, type) and issubclass(field_type, Enum):
+            namespace[f'type{index}'] = field_type
+            namespace[f'members{index}'] = EnumTable.of(field_type).by_value
+            lines.append('        try:')
+            lines.append(f'            {var} = members{index}[{var}]')
+            lines.append('        except (KeyError, TypeError):')
+            lines.append(f'            {var} = type{index}({var})')
+        elif field_type in PRIMITIVES:
+            namespace[f'type{index}'] = field_type
+            lines.append(f'        if not isinstance({var}, type{index}):')
+            lines.append(f'            {var} = type{index}({var})')
+        else:
+            converter = cls._converter(field_type)
+            if converter is None:
+                lines.append('        pass')
+            else:
+                namespace[f'convert{index}'] = converter
+                lines.append(f'        {var} = convert{index}({var})')
+        return lines
+
+    @classmethod
+    def _converter(cls, tp: Any) -> Optional[Converter]:
+        """Builds the function converting a value of a type, None if values are kept as they are.
+
+        This follows ``dataclasses_json``'s ``_decode_type``, which decodes the items of collections
+        and the values of ``Optional`` types. As there, ``None`` is kept for generic and enum types.
+        """
+        global_decoder = cfg.global_config.decoders.get(tp)
+        if global_decoder is not None:
+            return global_decoder
+
+        if tp is Any:
+            return None
+
+        origin = get_origin(tp)
+        if origin in (Union, UnionType):
+            args = [arg for arg in get_args(tp) if arg is not NoneType]
+            if len(args) != 1:
+                raise UnsupportedType(f'{tp} is a union of several types.')
+            inner = cls._converter(args[0])
+            if inner is None:
+                return None
+            return lambda value: None if value is None else inner(value)
+
+        if origin is list:
+            (item_type,) = get_args(tp) or (Any,)
+            item = cls._converter(item_type)
+            if item is None:
+                return lambda value: None if value is None else list(value)
+            return lambda value: None if value is None else [item(x) for x in value]
+
+        if origin is dict:
+            key_type, value_type = get_args(tp) or (Any, Any)
+            key = cls._dict_key_converter(key_type)
+            item = cls._converter(value_type)
+            if key is None and item is None:
+                return lambda value: None if value is None else dict(value)
+            key = key or (lambda x: x)
+            item = item or (lambda x: x)
+            return lambda value: None if value is None else {key(k): item(v) for k, v in value.items()}
+
+        if origin is not None or not isinstance(tp, type):
+            raise UnsupportedType(f'{tp} is not a supported type.')
+
+        if issubclass(tp, Enum):
+            from_value = EnumTable.of(tp).from_value
+            return lambda value: None if value is None else from_value(value)
+        if dataclasses.is_dataclass(tp):
+            return cls._model_converter(tp)
+        if issubclass(tp, datetime):
+            return cls._extended_datetime
+        if issubclass(tp, EXTENDED):
+            return lambda value: value if isinstance(value, tp) else tp(value)
+        if issubclass(tp, (list, dict, set, frozenset, tuple)):
+            raise UnsupportedType(f'{tp} is not a supported type.')
+        return None
+
+    @classmethod
+    def _dict_key_converter(cls, tp: Any) -> Optional[Converter]:
+        if tp is Any or tp is str:
+            return None
+        if tp in PRIMITIVES:
+            return lambda value: tp(value if isinstance(value, tp) else tp(value))
+        raise UnsupportedType(f'{tp} is not a supported dict key type.')
+
+    @classmethod
+    def _model_converter(cls, model: type) -> Converter:
+        # Self-referencing models are looked up once their own decoder has been compiled.
+        if model in cls._compiling:
+            return lambda value: cls._decoders[model](value)
+        return cls.decoder(model)
+
+    @staticmethod
+    def _extended_datetime(value: Any) -> datetime:
+        if isinstance(value, datetime):
+            return value
+        return datetime.fromtimestamp(value, tz=datetime.now(timezone.utc).astimezone().tzinfo)
+
+    @staticmethod
+    def _is_optional(tp: Any) -> bool:
+        return tp is Any or (get_origin(tp) in (Union, UnionType) and NoneType in get_args(tp))
+
+    @staticmethod
+    def _warn_none(name: str, model: type) -> None:
+        warnings.warn(
+            f"'NoneType' object value of non-optional type {name} detected when decoding {model.__name__}.",
+            RuntimeWarning,
+        )
@@ -7,7 +7,7 @@ from ..core import BungieMembershipType
 
 
 @dataclass_json
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class GroupUserInfoCard:
     LastSeenDisplayName: str
     LastSeenDisplayNameType: BungieMembershipType
@@ -6,7 +6,7 @@ from .enums import IgnoreStatus
 
 
 @dataclass_json
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class IgnoreResponse:
     isIgnored: bool
     ignoreFlags: IgnoreStatus
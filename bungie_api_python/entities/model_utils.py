@@ -1,5 +1,7 @@
-from datetime import datetime
-from typing import TypeVar, Type
+import sys
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import ClassVar, Generic, TypeVar, Type
 from enum import Enum, Flag
 
 from dataclasses_json import config
@@ -9,14 +11,113 @@ from marshmallow import fields
 EnumType = TypeVar('EnumType', bound=Enum | Flag)
 
 
+def _fromisoformat_bungie(value: str) -> datetime:
+    """Rewrites a Bungie timestamp into a form ``datetime.fromisoformat`` accepts before Python 3.11.
+
+    Bungie timestamps end with ``Z`` and carry anywhere from 0 to 7 fractional digits, where older versions of
+    ``fromisoformat`` only accept an explicit offset and exactly 3 or 6 digits.
+    """
+    offset = ''
+    if value[-1:] in ('Z', 'z'):
+        value, offset = value[:-1], '+00:00'
+    elif len(value) > 19 and value[-6] in ('+', '-'):
+        value, offset = value[:-6], value[-6:]
+    if len(value) > 20 and value[19] == '.':
+        value = value[:20] + value[20:26].ljust(6, '0')
+    return datetime.fromisoformat(value + offset)
+
+
+# As of Python 3.11, ``fromisoformat`` parses every timestamp the API returns by itself.
+_fromisoformat = datetime.fromisoformat if sys.version_info >= (3, 11) else _fromisoformat_bungie
+
+
+def parse_datetime(value: str) -> datetime:
+    """Parses a Bungie timestamp, such as ``2023-01-02T18:20:11.89Z``.
+
+    :return: A timezone aware datetime, which keeps fractional seconds up to microseconds.
+        Timestamps without an offset are in UTC.
+    """
+    parsed = _fromisoformat(value)
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+# Datetimes are immutable, so parsed timestamps can be shared. Series such as ``Datapoint.time`` repeat the same
+# few hundred timestamps for every metric, so most of them are parsed once.
+parse_datetime_cached = lru_cache(maxsize=4096)(parse_datetime)
+
+
+def format_datetime(dt: datetime) -> str:
+    """Formats a datetime as a Bungie timestamp in UTC, with millisecond precision. Naive datetimes are taken as UTC."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt.isoformat(timespec='milliseconds') + 'Z'
+
+
 def datetime_field_decoder(st_str: str) -> datetime:
     if st_str:
-        return datetime.fromisoformat(st_str.strip('Z').split('.')[0])
+        return parse_datetime(st_str)
+
+
+def cached_datetime_field_decoder(st_str: str) -> datetime:
+    if st_str:
+        return parse_datetime_cached(st_str)
 
 
 def datetime_field_encoder(dt: datetime) -> str:
     if dt:
-        return dt.isoformat() + '.00Z'
+        return format_datetime(dt)
+
+
+class EnumTable(Generic[EnumType]):
+    """Precomputed value to member and name to member lookups of an enum.
+
+    Looking a member up through the enum itself goes through ``EnumMeta.__call__`` or a scan of its members,
+    which cost far more than a dict lookup. Tables are built once per enum, by :meth:`of`.
+    """
+    __slots__ = ('enum', 'by_value', 'by_name')
+
+    _tables: ClassVar[dict[type, 'EnumTable']] = {}
+
+    def __init__(self, enum: Type[EnumType]) -> None:
+        self.enum = enum
+        self.by_name: dict[str, EnumType] = dict(enum.__members__)
+        self.by_value: dict[object, EnumType] = {}
+        for member in self.by_name.values():
+            # Aliases share the value of the member they alias, which is the one the enum returns.
+            self.by_value.setdefault(member.value, member)
+
+    @classmethod
+    def of(cls, enum: Type[EnumType]) -> 'EnumTable[EnumType]':
+        """The table of an enum, built on first use."""
+        table = cls._tables.get(enum)
+        if table is None:
+            table = cls._tables[enum] = cls(enum)
+        return table
+
+    def from_value(self, value: object) -> EnumType:
+        """The member with a value, like ``enum(value)``."""
+        try:
+            return self.by_value[value]
+        except (KeyError, TypeError):
+            # Flag combinations are not in the table, and the enum raises its usual error for invalid values.
+            return self.enum(value)
+
+    def from_name(self, name: str) -> EnumType:
+        """The member with a name, like ``enum[name]`` but raising a ``ValueError`` for unknown names."""
+        try:
+            return self.by_name[name]
+        except KeyError:
+            raise ValueError(f'"{name}" is not a valid {self.enum.__name__} name.') from None
+
+    def coerce(self, value: EnumType | int | str) -> EnumType:
+        """The member given either itself, its name, or its value."""
+        if isinstance(value, self.enum):
+            return value
+        if isinstance(value, str):
+            return self.from_name(value)
+        return self.from_value(value)
 
 
 def int64_enum_encoder(value: EnumType):
@@ -24,8 +125,10 @@ def int64_enum_encoder(value: EnumType):
 
 
 def int64_enum_decoder(enum: Type[EnumType]):
+    table = EnumTable.of(enum)
+
     def predicate(value: str) -> EnumType:
-        return enum(int(value))
+        return table.from_value(int(value))
 
     return predicate
 
@@ -1,4 +1,5 @@
 from .response import Response
+from .raw import RawResponse
 from .app import GetApplicationApiUsage, GetBungieApplications
 from .user import GetBungieNetUserById, GetSanitizedPlatformDisplayNames, GetCredentialTypesForTargetAccount, \
     GetAvailableThemes, GetMembershipDataById, GetMembershipDataForCurrentUser, GetMembershipFromHardLinkedCredential, \
@@ -7,6 +8,7 @@ from .user import GetBungieNetUserById, GetSanitizedPlatformDisplayNames, GetCre
 __all__ = [
     # Generic
     'Response',
+    'RawResponse',
 
     # App
     'GetApplicationApiUsage',
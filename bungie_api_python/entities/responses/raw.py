@@ -0,0 +1,48 @@
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from ..exceptions import PlatformErrorCodes
+from ..model_utils import EnumTable
+
+
+@dataclass(kw_only=True, slots=True)
+class RawResponse:
+    """A response whose body is passed through untouched, with only its envelope decoded.
+
+    Returned instead of a model when a client's ``raw`` setting is ``'bytes'``. The envelope fields are None for
+    responses that do not have one, such as those of the OAuth token endpoints.
+    """
+    body: bytes
+    ErrorCode: Optional[PlatformErrorCodes] = field(default=None)
+    ThrottleSeconds: Optional[int] = field(default=None)
+    ErrorStatus: Optional[str] = field(default=None)
+    Message: Optional[str] = field(default=None)
+    MessageData: Optional[dict[str, str]] = field(default=None)
+    DetailedErrorTrace: Optional[str] = field(default=None)
+
+    # The supported values of the ``raw`` client setting.
+    MODES = ('dict', 'bytes')
+
+    @classmethod
+    def build(cls, mode: str, body: bytes, data: Any) -> 'dict | RawResponse':
+        """The raw form of a response.
+
+        :param mode: ``'dict'`` for the parsed body, or ``'bytes'`` for the body bytes along with their envelope.
+        :param body: The response body.
+        :param data: The parsed response body.
+        """
+        if mode == 'dict':
+            return data
+
+        if not isinstance(data, dict):
+            return cls(body=body)
+        error_code = data.get('ErrorCode')
+        return cls(
+            body=body,
+            ErrorCode=None if error_code is None else EnumTable.of(PlatformErrorCodes).from_value(error_code),
+            ThrottleSeconds=data.get('ThrottleSeconds'),
+            ErrorStatus=data.get('ErrorStatus'),
+            Message=data.get('Message'),
+            MessageData=data.get('MessageData'),
+            DetailedErrorTrace=data.get('DetailedErrorTrace'),
+        )
@@ -1,9 +1,10 @@
 import abc
-from dataclasses import dataclass, field
-from typing import Any, Optional
+from dataclasses import dataclass, field, MISSING
+from typing import Any, ClassVar, Optional
 
 from dataclasses_json import dataclass_json
 
+from ..decoder import ModelDecoder
 from ..exceptions import PlatformErrorCodes
 
 
@@ -17,3 +18,18 @@ class Response(abc.ABC):
     Message: str
     MessageData: dict[str, str]
     DetailedErrorTrace: Optional[str] = field(default=None)
+
+    # The fields that are only decoded when first read, when a response is decoded lazily.
+    LAZY_FIELDS: ClassVar[tuple[str, ...]] = ('Response',)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes missing from the instance, such as the fields of a lazily decoded response
+        # that have not been read yet. Their raw value is decoded and then stored like any other field.
+        raw = self.__dict__.get(ModelDecoder.LAZY_PREFIX + name, MISSING)
+        if raw is MISSING:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        value = ModelDecoder.decode_field(type(self), name, raw)
+        self.__dict__[name] = value
+        self.__dict__.pop(ModelDecoder.LAZY_PREFIX + name, None)
+        return value
@@ -9,7 +9,7 @@ from ..model_utils import datetime_metadata
 
 
 @dataclass_json
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class GeneralUser:
     membershipId: int
     uniqueName: str
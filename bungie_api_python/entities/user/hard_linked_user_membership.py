@@ -7,7 +7,7 @@ from bungie_api_python.entities.core import BungieMembershipType
 
 
 @dataclass_json
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class HardLinkedUserMembership:
     membershipType: BungieMembershipType
     membershipId: int
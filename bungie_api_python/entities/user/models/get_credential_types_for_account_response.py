@@ -7,7 +7,7 @@ from ...core import BungieCredentialType
 
 
 @dataclass_json
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class GetCredentialTypesForAccountResponse:
     credentialType: BungieCredentialType
     credentialDisplayName: str
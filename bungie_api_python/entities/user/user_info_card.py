@@ -7,7 +7,7 @@ from ..core import BungieMembershipType
 
 
 @dataclass_json
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class UserInfoCard:
     supplementalDisplayName: Optional[str] = field(default=None)
     iconPath: Optional[str] = field(default=None)
@@ -8,7 +8,7 @@ from .general_user import GeneralUser
 
 
 @dataclass_json
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class UserMembershipData:
     destinyMemberships: list[GroupUserInfoCard]
     primaryMembershipId: Optional[int] = field(default=None)
@@ -4,6 +4,6 @@ from dataclasses_json import dataclass_json
 
 
 @dataclass_json
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class UserSearchPrefixRequest:
     displayNamePrefix: str
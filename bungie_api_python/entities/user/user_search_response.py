@@ -6,7 +6,7 @@ from .user_search_response_detail import UserSearchResponseDetail
 
 
 @dataclass_json
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class UserSearchResponse:
     searchResults: list[UserSearchResponseDetail]
     page: int
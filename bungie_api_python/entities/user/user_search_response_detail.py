@@ -7,7 +7,7 @@ from .user_info_card import UserInfoCard
 
 
 @dataclass_json
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class UserSearchResponseDetail:
     bungieGlobalDisplayName: Optional[str] = field(default=None)
     bungieGlobalDisplayNameCode: Optional[int] = field(default=None)
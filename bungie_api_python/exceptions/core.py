@@ -1,2 +1,16 @@
 class ObsoleteEndpoint(Exception):
     pass
+
+
+class PageFetchFailedException(Exception):
+    def __init__(self, page: int, response) -> None:
+        super().__init__(f'Page {page} was returned with the error code {response.ErrorCode}: {response.Message}')
+        self.page = page
+        self.response = response
+
+
+class ExchangeNotRecordedException(Exception):
+    def __init__(self, method: str, url: str) -> None:
+        super().__init__(f'No response to {method} {url} was recorded, or every recorded response was replayed.')
+        self.method = method
+        self.url = url
@@ -0,0 +1,119 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+
+# The endpoint method being called, such as ``user.get_bungie_net_user_by_id``, set by every endpoint group method.
+current_endpoint: ContextVar[Optional[str]] = ContextVar('current_endpoint', default=None)
+
+
+class RequestEvents:
+    """The events of a request's lifecycle, in the order they happen."""
+    # A call to ``get`` or ``post`` started a request.
+    REQUEST_START = 'request_start'
+    # A GET was answered from the response cache, without a request.
+    CACHE_HIT = 'cache_hit'
+    # The request waited on the rate limiter, for ``duration`` seconds.
+    THROTTLE_WAIT = 'throttle_wait'
+    # A pooled connection was reused, or a new one opened. Only reported by the async client, when a hook was
+    # registered before its session was created.
+    CONNECTION_ACQUIRED = 'connection_acquired'
+    # The response status and headers arrived.
+    FIRST_BYTE = 'first_byte'
+    # The whole response body arrived, ``bytes_in`` long, ``duration`` seconds after its first byte.
+    BODY_READ = 'body_read'
+    # The body was parsed as JSON, in ``duration`` seconds.
+    JSON_PARSED = 'json_parsed'
+    # The body was decoded into its response model (or raw response), in ``duration`` seconds.
+    MODEL_DECODED = 'model_decoded'
+    # The attempt failed and is retried after ``duration`` seconds, ``error`` holds the failure if one was raised.
+    RETRY = 'retry'
+    # The request failed with ``error``, which is raised to the caller.
+    ERROR = 'error'
+    # The request returned a response, with its ``error_code``, ``duration`` seconds after it started.
+    REQUEST_END = 'request_end'
+
+    ALL = frozenset({
+        REQUEST_START, CACHE_HIT, THROTTLE_WAIT, CONNECTION_ACQUIRED, FIRST_BYTE, BODY_READ, JSON_PARSED,
+        MODEL_DECODED, RETRY, ERROR, REQUEST_END,
+    })
+
+
+@dataclass(kw_only=True, slots=True)
+class RequestEvent:
+    """A single event of a request's lifecycle, passed to the hooks registered for it.
+
+    Times are ``time.monotonic()`` values, and durations are in seconds.
+    """
+    event: str
+    time: float
+    # When the call to ``get`` or ``post`` started.
+    start: float
+    endpoint: Optional[str]
+    method: str
+    url: str
+    response_type: type
+    attempt: int = field(default=0)
+    status: Optional[int] = field(default=None)
+    error_code: Optional[int] = field(default=None)
+    bytes_in: int = field(default=0)
+    bytes_out: int = field(default=0)
+    duration: float = field(default=0.0)
+    connection_reused: Optional[bool] = field(default=None)
+    error: Optional[BaseException] = field(default=None)
+
+    @property
+    def elapsed(self) -> float:
+        """The seconds between the start of the request and this event."""
+        return self.time - self.start
+
+
+Hook = Callable[[RequestEvent], Any]
+
+
+class RequestTrace:
+    """Reports the events of a single request to the hooks registered on its client.
+
+    Traces are only created while at least one hook is registered, so requests made without hooks pay for no more
+    than a truthiness check.
+    """
+    __slots__ = ('hooks', 'endpoint', 'method', 'url', 'response_type', 'start', 'attempt', 'bytes_out')
+
+    def __init__(
+            self,
+            hooks: dict[str, list[Hook]],
+            method: str,
+            url: str,
+            response_type: type,
+            bytes_out: int = 0,
+    ) -> None:
+        self.hooks = hooks
+        self.endpoint = current_endpoint.get()
+        self.method = method
+        self.url = url
+        self.response_type = response_type
+        self.start = time.monotonic()
+        self.attempt = 0
+        self.bytes_out = bytes_out
+
+    def emit(self, event: str, **fields: Any) -> None:
+        hooks = self.hooks.get(event)
+        wildcard = self.hooks.get('*')
+        if not hooks and not wildcard:
+            return
+
+        request_event = RequestEvent(
+            event=event,
+            time=time.monotonic(),
+            start=self.start,
+            endpoint=self.endpoint,
+            method=self.method,
+            url=self.url,
+            response_type=self.response_type,
+            attempt=self.attempt,
+            bytes_out=self.bytes_out,
+            **fields,
+        )
+        for hook in (*(hooks or ()), *(wildcard or ())):
+            hook(request_event)
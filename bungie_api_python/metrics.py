@@ -0,0 +1,212 @@
+import bisect
+import threading
+import weakref
+from typing import Sequence, TYPE_CHECKING
+
+from .entities.exceptions import PlatformErrorCodes
+from .entities.model_utils import EnumTable
+from .hooks import RequestEvent, RequestEvents
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+    from .client_base import ClientBase
+
+
+# The upper bounds (in seconds) of the histogram buckets.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DECODE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class _Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+class ClientMetrics:
+    """Prometheus metrics of the traffic of one or more clients, per endpoint method, gathered through request hooks.
+
+    ::
+
+        metrics = ClientMetrics()
+        metrics.attach(client)
+        metrics.serve(port=9464)  # Or return metrics.render() from an existing web application.
+
+    Every series is labelled with the endpoint method that made the request, such as
+    ``user.get_bungie_net_user_by_id``, or ``other`` for requests made directly through ``get`` and ``post``.
+    """
+    # The name, type, help text and labels of every metric, in the order they are rendered.
+    METRICS = {
+        'requests_total': (
+            'counter', 'Requests that returned a response, by PlatformErrorCodes outcome.',
+            ('endpoint', 'error_status'),
+        ),
+        'request_exceptions_total': ('counter', 'Requests that raised an exception.', ('endpoint', 'exception')),
+        'request_duration_seconds': ('histogram', 'Request latency, including retries and waits.', ('endpoint',)),
+        'request_bytes_total': ('counter', 'Request body bytes sent.', ('endpoint',)),
+        'response_bytes_total': ('counter', 'Response body bytes received.', ('endpoint',)),
+        'json_parse_duration_seconds': ('histogram', 'Time spent parsing response bodies.', ('endpoint',)),
+        'decode_duration_seconds': ('histogram', 'Time spent decoding responses into models.', ('endpoint',)),
+        'throttle_waits_total': ('counter', 'Requests paused by the rate limiter.', ('endpoint',)),
+        'throttle_wait_seconds_total': ('counter', 'Time requests spent paused by the rate limiter.', ('endpoint',)),
+        'cache_hits_total': ('counter', 'Responses served from the response cache.', ('endpoint',)),
+        'retries_total': ('counter', 'Attempts that failed and were retried.', ('endpoint',)),
+        'connections_opened_total': ('counter', 'Connections opened (async clients only).', ('endpoint',)),
+        'open_connections': ('gauge', 'Connections held open by the attached clients.', ()),
+    }
+
+    def __init__(
+            self,
+            prefix: str = 'bungie_api',
+            latency_buckets: Sequence[float] = LATENCY_BUCKETS,
+            decode_buckets: Sequence[float] = DECODE_BUCKETS,
+    ) -> None:
+        """
+        :param prefix: The prefix of every metric name.
+        :param latency_buckets: The bucket upper bounds (in seconds) of the request latency histogram.
+        :param decode_buckets: The bucket upper bounds (in seconds) of the parse and decode histograms.
+        """
+        self.prefix = prefix
+        self.latency_buckets = tuple(sorted(latency_buckets))
+        self.decode_buckets = tuple(sorted(decode_buckets))
+
+        self._lock = threading.Lock()
+        self._values: dict[str, dict[tuple, float | _Histogram]] = {name: {} for name in self.METRICS}
+        self._clients: weakref.WeakSet['ClientBase'] = weakref.WeakSet()
+        self._error_statuses = EnumTable.of(PlatformErrorCodes).by_value
+
+    def attach(self, client: 'ClientBase') -> 'ClientMetrics':
+        """Gathers the metrics of a client's requests.
+
+        Attach before the client's first request, async clients only report the connections they open to hooks
+        registered before their session is created.
+        """
+        client.add_hook('*', self.observe)
+        self._clients.add(client)
+        return self
+
+    def detach(self, client: 'ClientBase') -> None:
+        client.remove_hook('*', self.observe)
+        self._clients.discard(client)
+
+    def observe(self, event: RequestEvent) -> None:
+        """Records a request event, this is the hook registered on attached clients."""
+        endpoint = (event.endpoint or 'other',)
+        kind = event.event
+        with self._lock:
+            if kind == RequestEvents.REQUEST_START:
+                self._add('request_bytes_total', endpoint, event.bytes_out)
+            elif kind == RequestEvents.REQUEST_END:
+                member = self._error_statuses.get(event.error_code)
+                status = member.name if member is not None else str(event.error_code)
+                self._add('requests_total', (*endpoint, status), 1)
+                self._add('response_bytes_total', endpoint, event.bytes_in)
+                self._observe('request_duration_seconds', endpoint, event.duration, self.latency_buckets)
+            elif kind == RequestEvents.ERROR:
+                self._add('request_exceptions_total', (*endpoint, type(event.error).__name__), 1)
+                self._observe('request_duration_seconds', endpoint, event.elapsed, self.latency_buckets)
+            elif kind == RequestEvents.JSON_PARSED:
+                self._observe('json_parse_duration_seconds', endpoint, event.duration, self.decode_buckets)
+            elif kind == RequestEvents.MODEL_DECODED:
+                self._observe('decode_duration_seconds', endpoint, event.duration, self.decode_buckets)
+            elif kind == RequestEvents.THROTTLE_WAIT:
+                self._add('throttle_waits_total', endpoint, 1)
+                self._add('throttle_wait_seconds_total', endpoint, event.duration)
+            elif kind == RequestEvents.CACHE_HIT:
+                self._add('cache_hits_total', endpoint, 1)
+            elif kind == RequestEvents.RETRY:
+                self._add('retries_total', endpoint, 1)
+            elif kind == RequestEvents.CONNECTION_ACQUIRED and not event.connection_reused:
+                self._add('connections_opened_total', endpoint, 1)
+
+    def _add(self, name: str, labels: tuple, value: float) -> None:
+        series = self._values[name]
+        series[labels] = series.get(labels, 0) + value
+
+    def _observe(self, name: str, labels: tuple, value: float, buckets: Sequence[float]) -> None:
+        histogram = self._values[name].get(labels)
+        if histogram is None:
+            histogram = self._values[name][labels] = _Histogram(buckets)
+        histogram.observe(value)
+
+    def render(self) -> str:
+        """The metrics in the Prometheus text exposition format, served with the ``CONTENT_TYPE`` header."""
+        open_connections = sum(client.open_connections() for client in list(self._clients))
+        lines = []
+        with self._lock:
+            self._values['open_connections'] = {(): open_connections}
+            for name, (kind, help_text, label_names) in self.METRICS.items():
+                metric = f'{self.prefix}_{name}'
+                lines.append(f'# HELP {metric} {help_text}')
+                lines.append(f'# TYPE {metric} {kind}')
+                for labels, value in sorted(self._values[name].items()):
+                    pairs = list(zip(label_names, labels))
+                    if kind != 'histogram':
+                        lines.append(f'{metric}{self._labels(pairs)} {self._number(value)}')
+                        continue
+
+                    cumulative = 0
+                    for bound, count in zip(value.buckets, value.counts):
+                        cumulative += count
+                        lines.append(f'{metric}_bucket{self._labels([*pairs, ("le", repr(bound))])} {cumulative}')
+                    lines.append(f'{metric}_bucket{self._labels([*pairs, ("le", "+Inf")])} {value.count}')
+                    lines.append(f'{metric}_sum{self._labels(pairs)} {self._number(value.sum)}')
+                    lines.append(f'{metric}_count{self._labels(pairs)} {value.count}')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _labels(pairs: list[tuple[str, str]]) -> str:
+        if not pairs:
+            return ''
+        escaped = (
+            f'{key}="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+            for key, value in pairs
+        )
+        return '{' + ','.join(escaped) + '}'
+
+    @staticmethod
+    def _number(value: float) -> str:
+        return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+    def serve(self, host: str = '127.0.0.1', port: int = 9464) -> 'ThreadingHTTPServer':
+        """Serves the metrics at ``/metrics`` from a background thread, until the returned server's ``shutdown``.
+
+        :param port: The port to listen on, 9464 by default, 0 picks a free port.
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name='bungie-api-metrics', daemon=True).start()
+        return server
@@ -0,0 +1,7 @@
+from .cassette import Exchange, Cassette
+
+
+__all__ = [
+    'Exchange',
+    'Cassette',
+]
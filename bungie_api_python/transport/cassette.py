@@ -0,0 +1,194 @@
+import gzip
+import json
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Optional, BinaryIO
+from urllib.parse import urlencode
+
+from ..exceptions.core import ExchangeNotRecordedException
+
+
+@dataclass(kw_only=True, slots=True)
+class Exchange:
+    """A single recorded request and the response it got."""
+    method: str
+    # The url, relative to the client's ``base_url``.
+    url: str
+    # The query string and request body, as matched on replay.
+    params: Optional[str] = field(default=None)
+    body: Optional[str] = field(default=None)
+    status: int
+    headers: list[tuple[str, str]] = field(default_factory=list)
+    content: bytes = field(default=b'')
+    # How long (in seconds) the request took, from sending it to reading the whole response body.
+    elapsed: float = field(default=0.0)
+    # The import path of the model the response was decoded into, so recorded traffic can be sent again.
+    response_type: Optional[str] = field(default=None)
+
+    @property
+    def key(self) -> tuple:
+        return self.method, self.url, self.params, self.body
+
+
+class Cassette:
+    """Records the exchanges a client has with the API to a file, and replays them without the network.
+
+    Cassettes are gzipped, each exchange is stored as a line of JSON followed by the raw response body. A client
+    given a cassette in ``record`` mode sends its requests as usual and records every response it receives. In
+    ``replay`` mode, requests are matched on their method, url, query string and body, and answered with the
+    responses recorded for them, in the order they were recorded. Headers, including ``Authorization``, are
+    not matched, so tokens that changed since the recording do not matter.
+
+    ::
+
+        with Cassette('traffic.cassette', mode='record') as cassette:
+            client = BungieClientSync(api_key='your_key', cassette=cassette)
+            ...
+
+        client = BungieClientSync(api_key='your_key', cassette=Cassette('traffic.cassette', replay_latency=True))
+    """
+    MODES = ('record', 'replay')
+
+    def __init__(
+            self,
+            path: str | os.PathLike,
+            mode: str = 'replay',
+            replay_latency: bool = False,
+            latency_scale: float = 1.0,
+            allow_repeats: bool = False,
+    ) -> None:
+        """
+        :param path: The cassette file, created (or appended to) when recording.
+        :param mode: ``record`` or ``replay``.
+        :param replay_latency: Whether replayed responses take as long as their recorded originals did.
+        :param latency_scale: A multiplier applied to replayed latencies.
+        :param allow_repeats: Whether a request replayed more often than it was recorded gets its last recorded
+            response again, instead of raising :class:`ExchangeNotRecordedException`.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f'Unknown cassette mode "{mode}", expected one of {", ".join(self.MODES)}.')
+
+        self.path = os.fspath(path)
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self.latency_scale = latency_scale
+        self.allow_repeats = allow_repeats
+        self.exchanges: list[Exchange] = []
+
+        self._lock = threading.Lock()
+        self._file: Optional[BinaryIO] = None
+        self._queues: dict[tuple, deque[Exchange]] = {}
+        self._last: dict[tuple, Exchange] = {}
+        if self.replaying:
+            self.exchanges = self.load(self.path)
+            self.rewind()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    def __enter__(self) -> 'Cassette':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Writes every exchange recorded so far to the cassette file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def rewind(self) -> None:
+        """Replays every exchange again from the start, to run the same traffic through another client."""
+        with self._lock:
+            self._queues = {}
+            for exchange in self.exchanges:
+                self._queues.setdefault(exchange.key, deque()).append(exchange)
+            self._last = {}
+
+    @staticmethod
+    def request(
+            method: str,
+            url: str,
+            params: Optional[dict[str, Any]],
+            data: Optional[dict[str, Any] | str | bytes],
+            json_body: Optional[dict[str, Any]],
+    ) -> Exchange:
+        """An exchange holding only the request, normalised so the same request always matches."""
+        body = None
+        if isinstance(data, (str, bytes)):
+            # Bodies serialised ahead of time are usually JSON, they match the same body sent as ``json``.
+            try:
+                json_body, data = json.loads(data), None
+            except ValueError:
+                body = data.decode(errors='replace') if isinstance(data, bytes) else data
+
+        if json_body is not None:
+            body = json.dumps(json_body, sort_keys=True, separators=(',', ':'))
+        elif data is not None:
+            body = urlencode(sorted(data.items()))
+        return Exchange(
+            method=method,
+            url=url,
+            params=urlencode(sorted(params.items()), doseq=True) if params else None,
+            body=body,
+            status=0,
+        )
+
+    def record(self, exchange: Exchange) -> None:
+        header = json.dumps({
+            'method': exchange.method,
+            'url': exchange.url,
+            'params': exchange.params,
+            'body': exchange.body,
+            'status': exchange.status,
+            'headers': exchange.headers,
+            'elapsed': round(exchange.elapsed, 6),
+            'response_type': exchange.response_type,
+            'size': len(exchange.content),
+        }, separators=(',', ':')).encode()
+
+        with self._lock:
+            if self._file is None:
+                # Appending adds a gzip member, which reads back as one stream.
+                self._file = gzip.open(self.path, 'ab')
+            self._file.write(header + b'\n' + exchange.content + b'\n')
+            self.exchanges.append(exchange)
+
+    def replay(self, request: Exchange) -> Exchange:
+        """The recorded exchange that answers a request.
+
+        :raises ExchangeNotRecordedException: No (further) response was recorded for the request.
+        """
+        key = request.key
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                exchange = self._last[key] = queue.popleft()
+                return exchange
+            if self.allow_repeats and key in self._last:
+                return self._last[key]
+        raise ExchangeNotRecordedException(request.method, request.url)
+
+    def delay(self, exchange: Exchange) -> float:
+        """How long (in seconds) a replayed exchange should take."""
+        return exchange.elapsed * self.latency_scale if self.replay_latency else 0.0
+
+    @staticmethod
+    def load(path: str | os.PathLike) -> list[Exchange]:
+        exchanges = []
+        with gzip.open(path, 'rb') as f:
+            while header := f.readline():
+                meta = json.loads(header)
+                content = f.read(meta.pop('size'))
+                f.read(1)
+                exchanges.append(Exchange(
+                    content=content,
+                    headers=[tuple(pair) for pair in meta.pop('headers')],
+                    **meta,
+                ))
+        return exchanges
@@ -1,6 +1,47 @@
-from .oauth import OAuthUtils
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .batch import BatchItem, BatchUtils
+    from .decoding import JSONDecoder
+    from .oauth import OAuthUtils
+    from .pagination import PaginationUtils
+    from .rate_limiter import RateLimiter, TokenBucket
+    from .retry import RetryPolicy
 
 
 __all__ = [
+    'BatchItem',
+    'BatchUtils',
+    'JSONDecoder',
     'OAuthUtils',
+    'PaginationUtils',
+    'RateLimiter',
+    'RetryPolicy',
+    'TokenBucket',
 ]
+
+# Utilities are imported on first use, so importing one does not load the others. Their async methods import
+# asyncio when they are first called, which keeps it out of the sync client's start up.
+_LAZY = {
+    'BatchItem': '.batch',
+    'BatchUtils': '.batch',
+    'JSONDecoder': '.decoding',
+    'OAuthUtils': '.oauth',
+    'PaginationUtils': '.pagination',
+    'RateLimiter': '.rate_limiter',
+    'RetryPolicy': '.retry',
+    'TokenBucket': '.rate_limiter',
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,82 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Generic, Hashable, Iterable, Optional, TypeVar
+
+from ..entities.exceptions import PlatformErrorCodes
+
+
+K = TypeVar('K', bound=Hashable)
+T = TypeVar('T')
+
+
+@dataclass(kw_only=True)
+class BatchItem(Generic[T]):
+    """The outcome of a single lookup within a batch."""
+    key: Any
+    response: Optional[T] = field(default=None)
+    error: Optional[Exception] = field(default=None)
+
+    @property
+    def ok(self) -> bool:
+        """Whether the lookup succeeded, both at the HTTP level and according to its ``ErrorCode``."""
+        if self.error is not None or self.response is None:
+            return False
+        if isinstance(self.response, dict):
+            # A response returned by a client whose raw setting is 'dict'.
+            return self.response.get('ErrorCode', PlatformErrorCodes.Success.value) == PlatformErrorCodes.Success.value
+        return getattr(self.response, 'ErrorCode', PlatformErrorCodes.Success) == PlatformErrorCodes.Success
+
+
+class BatchUtils:
+    @staticmethod
+    def dedupe(keys: Iterable[K]) -> list[K]:
+        """Removes duplicate keys, keeping the order in which they first appear."""
+        return list(dict.fromkeys(keys))
+
+    @staticmethod
+    def run(
+            fn: Callable[[K], T],
+            keys: Iterable[K],
+            concurrency: int,
+            map_fn: Optional[Callable[[Callable, list, int], list]] = None,
+    ) -> list[BatchItem[T]]:
+        """Calls ``fn`` once per unique key, from up to ``concurrency`` threads.
+
+        :param map_fn: Maps a function over the keys with the given concurrency, such as a sync client's
+            ``map`` method. Defaults to a thread pool created for this batch.
+        :return: One item per unique key, in input order. Exceptions are captured on their item.
+        """
+        keys = BatchUtils.dedupe(keys)
+
+        def call(key: K) -> BatchItem[T]:
+            try:
+                return BatchItem(key=key, response=fn(key))
+            except Exception as e:
+                return BatchItem(key=key, error=e)
+
+        if concurrency <= 1 or len(keys) <= 1:
+            return [call(key) for key in keys]
+        if map_fn is not None:
+            return map_fn(call, keys, concurrency)
+
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(keys))) as executor:
+            return list(executor.map(call, keys))
+
+    @staticmethod
+    async def run_async(fn: Callable[[K], Awaitable[T]], keys: Iterable[K], concurrency: int) -> list[BatchItem[T]]:
+        """Awaits ``fn`` once per unique key, with at most ``concurrency`` calls in flight.
+
+        :return: One item per unique key, in input order. Exceptions are captured on their item.
+        """
+        import asyncio
+
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+        async def call(key: K) -> BatchItem[T]:
+            async with semaphore:
+                try:
+                    return BatchItem(key=key, response=await fn(key))
+                except Exception as e:
+                    return BatchItem(key=key, error=e)
+
+        return list(await asyncio.gather(*[call(key) for key in BatchUtils.dedupe(keys)]))
@@ -1,7 +1,9 @@
 from datetime import datetime
 
+from ..entities.model_utils import format_datetime
+
 
 class DateTimeUtils:
     @staticmethod
     def encode_datetime(dt: datetime) -> str:
-        return dt.isoformat() + '.00Z'
+        return format_datetime(dt)
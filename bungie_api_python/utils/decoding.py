@@ -0,0 +1,68 @@
+import importlib
+import json
+from typing import Any, Callable, Optional
+
+
+class JSONDecoder:
+    """Parses JSON response bodies straight from their raw bytes.
+
+    The fast backends are optional dependencies. With the default ``'auto'`` backend the first one that is
+    installed is used, in the order of :attr:`PREFERENCE`, falling back to the standard library ``json`` module.
+    Every backend raises a ``ValueError`` on malformed input.
+    """
+    BACKENDS = frozenset({'orjson', 'msgspec', 'ujson', 'json'})
+    PREFERENCE = ('orjson', 'msgspec', 'ujson', 'json')
+
+    backend: str
+    loads: Callable[[bytes | str], Any]
+
+    def __init__(self, backend: str = 'auto') -> None:
+        """
+        :param backend: One of ``'orjson'``, ``'msgspec'``, ``'ujson'``, ``'json'``, or ``'auto'``.
+        :raises ImportError: When the requested backend is not installed.
+        """
+        if backend != 'auto' and backend not in self.BACKENDS:
+            raise ValueError(f"Unknown JSON backend \"{backend}\", expected one of: auto, {', '.join(self.PREFERENCE)}.")
+
+        if backend == 'auto':
+            backend = next(name for name in self.PREFERENCE if self._load(name) is not None)
+
+        loads = self._load(backend)
+        if loads is None:
+            raise ImportError(f"The \"{backend}\" JSON backend is not installed.")
+
+        self.backend = backend
+        self.loads = loads
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(backend={self.backend!r})'
+
+    @classmethod
+    def available(cls) -> list[str]:
+        """The installed backends, fastest first."""
+        return [name for name in cls.PREFERENCE if cls._load(name) is not None]
+
+    @staticmethod
+    def _load(backend: str) -> Optional[Callable[[bytes | str], Any]]:
+        """Imports a backend, returning its decoding function or None if it is not installed."""
+        if backend == 'json':
+            return json.loads
+
+        try:
+            module = importlib.import_module(backend)
+        except ImportError:
+            return None
+
+        if backend == 'msgspec':
+            decode = module.json.Decoder().decode
+            error = module.DecodeError
+
+            # msgspec errors are not ValueErrors, unlike those of every other backend.
+            def loads(data: bytes | str) -> Any:
+                try:
+                    return decode(data)
+                except error as e:
+                    raise ValueError(str(e)) from e
+
+            return loads
+        return module.loads
@@ -0,0 +1,98 @@
+from collections import deque
+from concurrent.futures import Future
+from typing import AsyncIterator, Awaitable, Callable, Iterator, TypeVar
+
+from ..entities.exceptions import PlatformErrorCodes
+from ..exceptions.core import PageFetchFailedException
+
+
+T = TypeVar('T')
+
+
+class PaginationUtils:
+    """Walks through paged endpoints while prefetching the pages ahead of the one being consumed.
+
+    Whether a page is the last one is only known once it arrives, so the pages that are prefetched
+    past the end of the results are discarded. At most ``prefetch + 1`` pages are ever in flight or
+    waiting to be consumed, and new pages are only requested as the consumer moves on to the next page.
+    """
+    @staticmethod
+    def _check(page: int, response: T) -> T:
+        error_code = getattr(response, 'ErrorCode', PlatformErrorCodes.Success)
+        if error_code != PlatformErrorCodes.Success:
+            raise PageFetchFailedException(page, response)
+        return response
+
+    @staticmethod
+    def iterate(
+            fetch: Callable[[int], T],
+            has_more: Callable[[T], bool],
+            submit: Callable[..., Future],
+            start: int = 0,
+            prefetch: int = 2,
+    ) -> Iterator[T]:
+        """Yields every page from ``start`` until one reports that no more pages follow it.
+
+        :param fetch: Requests a single page by its number.
+        :param has_more: Whether another page follows the given page.
+        :param submit: Schedules a call in the background, such as a sync client's ``submit``.
+        :param start: The first page to request.
+        :param prefetch: The number of pages requested ahead of the page being consumed.
+        :raises PageFetchFailedException: When a page is returned with an unsuccessful ``ErrorCode``.
+        """
+        pending: deque[tuple[int, Future]] = deque()
+        next_page = start
+
+        try:
+            while True:
+                while len(pending) <= max(prefetch, 0):
+                    pending.append((next_page, submit(fetch, next_page)))
+                    next_page += 1
+
+                page, future = pending.popleft()
+                response = PaginationUtils._check(page, future.result())
+                yield response
+
+                if not has_more(response):
+                    return
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    @staticmethod
+    async def iterate_async(
+            fetch: Callable[[int], Awaitable[T]],
+            has_more: Callable[[T], bool],
+            start: int = 0,
+            prefetch: int = 2,
+    ) -> AsyncIterator[T]:
+        """Yields every page from ``start`` until one reports that no more pages follow it.
+
+        :param fetch: Requests a single page by its number.
+        :param has_more: Whether another page follows the given page.
+        :param start: The first page to request.
+        :param prefetch: The number of pages requested ahead of the page being consumed.
+        :raises PageFetchFailedException: When a page is returned with an unsuccessful ``ErrorCode``.
+        """
+        import asyncio
+
+        pending: deque[tuple[int, asyncio.Future]] = deque()
+        next_page = start
+
+        try:
+            while True:
+                while len(pending) <= max(prefetch, 0):
+                    pending.append((next_page, asyncio.ensure_future(fetch(next_page))))
+                    next_page += 1
+
+                page, task = pending.popleft()
+                response = PaginationUtils._check(page, await task)
+                yield response
+
+                if not has_more(response):
+                    return
+        finally:
+            for _, task in pending:
+                # Pages that already failed are discarded without asyncio reporting an unretrieved exception.
+                if not task.cancel() and not task.cancelled():
+                    task.exception()
@@ -0,0 +1,194 @@
+import re
+import threading
+import time
+from typing import Optional, Any
+from urllib.parse import urlsplit
+
+from ..entities.exceptions import PlatformErrorCodes
+
+
+class TokenBucket:
+    """A thread safe token bucket.
+
+    Tokens are reserved rather than waited for, so the bucket may go into debt.
+    Each caller is told how long to wait for its own token, which keeps callers in
+    first come, first served order without having to poll the bucket.
+    """
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        """
+        :param rate: The number of tokens added to the bucket per second.
+        :param capacity: The maximum number of tokens the bucket can hold, defaults to one second worth of tokens.
+        """
+        if rate <= 0:
+            raise ValueError("The token bucket rate must be greater than zero.")
+
+        self.rate = rate
+        self.capacity = max(capacity or rate, 1)
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes a token from the bucket.
+
+        :return: The number of seconds the caller must wait before its token is available.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
+
+
+class RateLimiter:
+    """A client side rate limiter shared by every endpoint group of a client.
+
+    Requests draw from a global bucket and a bucket for their endpoint, and are paused
+    whenever Bungie asks for a backoff through ``ThrottleSeconds`` or one of the throttle
+    related ``PlatformErrorCodes``.
+    """
+    # Error codes that throttle the entire application, rather than a single endpoint.
+    GLOBAL_THROTTLE_CODES = frozenset({
+        PlatformErrorCodes.ThrottleLimitExceeded.value,
+        PlatformErrorCodes.ThrottleLimitExceededMinutes.value,
+        PlatformErrorCodes.ThrottleLimitExceededMomentarily.value,
+        PlatformErrorCodes.ThrottleLimitExceededSeconds.value,
+        PlatformErrorCodes.PerApplicationThrottleExceeded.value,
+        PlatformErrorCodes.PerApplicationAnonymousThrottleExceeded.value,
+        PlatformErrorCodes.PerApplicationAuthenticatedThrottleExceeded.value,
+        PlatformErrorCodes.PerUserThrottleExceeded.value,
+    })
+    ENDPOINT_THROTTLE_CODES = frozenset({
+        PlatformErrorCodes.PerEndpointRequestThrottleExceeded.value,
+    })
+    # Backoff used when a throttle error code is returned without any ThrottleSeconds.
+    MINIMUM_BACKOFF = {
+        PlatformErrorCodes.ThrottleLimitExceededMinutes.value: 60,
+    }
+    DEFAULT_BACKOFF = 1
+
+    def __init__(
+            self,
+            rate: Optional[float] = None,
+            burst: Optional[int] = None,
+            per_endpoint_rate: Optional[float] = None,
+            per_endpoint_burst: Optional[int] = None,
+            respect_throttle: bool = True,
+    ) -> None:
+        """
+        :param rate: The maximum number of requests per second across all endpoints, None for no limit.
+        :param burst: The number of requests that may be sent at once before the global rate applies.
+        :param per_endpoint_rate: The maximum number of requests per second to a single endpoint, None for no limit.
+        :param per_endpoint_burst: The number of requests that may be sent at once to a single endpoint.
+        :param respect_throttle: Whether to pause requests when Bungie responds with a throttle.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.per_endpoint_rate = per_endpoint_rate
+        self.per_endpoint_burst = per_endpoint_burst
+        self.respect_throttle = respect_throttle
+
+        self._global_bucket = TokenBucket(rate, burst) if rate else None
+        self._endpoint_buckets: dict[str, TokenBucket] = {}
+        self._paused_until = 0.0
+        self._endpoint_paused_until: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def endpoint_key(url: str) -> str:
+        """Reduces a request url to the endpoint it targets, dropping ids from the path.
+
+        ``https://www.bungie.net/Platform/User/GetBungieNetUserById/123/`` becomes
+        ``/Platform/User/GetBungieNetUserById/{}/``.
+        """
+        return re.sub(r'/-?\d+(?=/|$)', '/{}', urlsplit(url).path)
+
+    def _endpoint_bucket(self, endpoint: str) -> Optional[TokenBucket]:
+        if not self.per_endpoint_rate:
+            return None
+
+        bucket = self._endpoint_buckets.get(endpoint)
+        if bucket is None:
+            with self._lock:
+                bucket = self._endpoint_buckets.setdefault(
+                    endpoint,
+                    TokenBucket(self.per_endpoint_rate, self.per_endpoint_burst),
+                )
+        return bucket
+
+    def reserve(self, endpoint: str) -> float:
+        """Reserves a request slot for an endpoint.
+
+        :param endpoint: The endpoint key, as returned by :meth:`endpoint_key`.
+        :return: The number of seconds to wait before sending the request.
+        """
+        now = time.monotonic()
+        delay = max(
+            self._paused_until - now,
+            self._endpoint_paused_until.get(endpoint, 0) - now,
+            0,
+        )
+
+        if self._global_bucket is not None:
+            delay = max(delay, self._global_bucket.reserve())
+
+        bucket = self._endpoint_bucket(endpoint)
+        if bucket is not None:
+            delay = max(delay, bucket.reserve())
+
+        return delay
+
+    def acquire(self, endpoint: str) -> float:
+        """Blocks the calling thread until a request to the endpoint may be sent.
+
+        :return: The number of seconds spent waiting.
+        """
+        delay = self.reserve(endpoint)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, endpoint: str) -> float:
+        """Suspends the calling task until a request to the endpoint may be sent.
+
+        :return: The number of seconds spent waiting.
+        """
+        import asyncio
+
+        delay = self.reserve(endpoint)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def backoff(self, seconds: float, endpoint: Optional[str] = None) -> None:
+        """Pauses every request, or only requests to one endpoint, for a number of seconds."""
+        until = time.monotonic() + seconds
+        with self._lock:
+            if endpoint is None:
+                self._paused_until = max(self._paused_until, until)
+            else:
+                self._endpoint_paused_until[endpoint] = max(self._endpoint_paused_until.get(endpoint, 0), until)
+
+    def observe(self, endpoint: str, data: Any) -> None:
+        """Applies any backoff requested by a decoded response body.
+
+        :param endpoint: The endpoint key the response came from.
+        :param data: The decoded JSON response body.
+        """
+        if not self.respect_throttle or not isinstance(data, dict):
+            return
+
+        error_code = data.get('ErrorCode')
+        throttle_seconds = data.get('ThrottleSeconds') or 0
+
+        if error_code in self.GLOBAL_THROTTLE_CODES:
+            self.backoff(max(throttle_seconds, self.MINIMUM_BACKOFF.get(error_code, self.DEFAULT_BACKOFF)))
+        elif error_code in self.ENDPOINT_THROTTLE_CODES:
+            self.backoff(max(throttle_seconds, self.DEFAULT_BACKOFF), endpoint)
+        elif throttle_seconds > 0:
+            self.backoff(throttle_seconds, endpoint)
@@ -0,0 +1,91 @@
+import random
+from typing import Any, Iterable, Optional
+
+from ..entities.exceptions import PlatformErrorCodes
+
+
+class RetryPolicy:
+    """Decides whether, and after how long, a failed request should be sent again.
+
+    Delays grow exponentially from ``backoff_base`` by ``backoff_factor`` per attempt, up to ``backoff_max``,
+    and are randomized by ``jitter`` so that many clients failing at once do not retry in lockstep.
+    Requests that are not idempotent (most POST requests) are never retried unless explicitly allowed.
+    """
+    DEFAULT_RETRYABLE_ERROR_CODES = frozenset({
+        PlatformErrorCodes.TransportException,
+        PlatformErrorCodes.UnhandledException,
+        PlatformErrorCodes.ExternalServiceTimeout,
+        PlatformErrorCodes.ThrottleLimitExceeded,
+        PlatformErrorCodes.ThrottleLimitExceededMinutes,
+        PlatformErrorCodes.ThrottleLimitExceededMomentarily,
+        PlatformErrorCodes.ThrottleLimitExceededSeconds,
+        PlatformErrorCodes.PerEndpointRequestThrottleExceeded,
+        PlatformErrorCodes.PerApplicationThrottleExceeded,
+        PlatformErrorCodes.PerApplicationAnonymousThrottleExceeded,
+        PlatformErrorCodes.PerApplicationAuthenticatedThrottleExceeded,
+        PlatformErrorCodes.PerUserThrottleExceeded,
+    })
+    DEFAULT_RETRYABLE_STATUSES = frozenset({500, 502, 503, 504})
+
+    def __init__(
+            self,
+            max_attempts: int = 3,
+            backoff_base: float = 0.5,
+            backoff_factor: float = 2,
+            backoff_max: float = 30,
+            jitter: float = 1,
+            retryable_error_codes: Optional[Iterable[PlatformErrorCodes | int]] = None,
+            retryable_statuses: Optional[Iterable[int]] = None,
+            retry_non_idempotent: bool = False,
+    ) -> None:
+        """
+        :param max_attempts: The maximum number of times a request is sent, 1 disables retries.
+        :param backoff_base: The delay (in seconds) before the first retry.
+        :param backoff_factor: The multiplier applied to the delay after every retry.
+        :param backoff_max: The maximum delay (in seconds) between two attempts.
+        :param jitter: The fraction of each delay that is randomized, from 0 (none) to 1 (full jitter).
+        :param retryable_error_codes: The ``PlatformErrorCodes`` that are retried.
+        :param retryable_statuses: The HTTP status codes that are retried.
+        :param retry_non_idempotent: Whether requests that are not idempotent may also be retried.
+        """
+        if max_attempts < 1:
+            raise ValueError("A retry policy must allow at least one attempt.")
+        if not 0 <= jitter <= 1:
+            raise ValueError("Retry jitter must be between 0 and 1.")
+
+        if retryable_error_codes is None:
+            retryable_error_codes = self.DEFAULT_RETRYABLE_ERROR_CODES
+        if retryable_statuses is None:
+            retryable_statuses = self.DEFAULT_RETRYABLE_STATUSES
+
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retryable_error_codes = frozenset(
+            code.value if isinstance(code, PlatformErrorCodes) else code for code in retryable_error_codes
+        )
+        self.retryable_statuses = frozenset(retryable_statuses)
+        self.retry_non_idempotent = retry_non_idempotent
+
+    @classmethod
+    def disabled(cls) -> 'RetryPolicy':
+        """A policy that never retries."""
+        return cls(max_attempts=1)
+
+    def can_retry(self, attempt: int, idempotent: bool) -> bool:
+        """Whether a request that has been sent ``attempt`` times may be sent again."""
+        return attempt < self.max_attempts and (idempotent or self.retry_non_idempotent)
+
+    def should_retry_status(self, status: int) -> bool:
+        return status in self.retryable_statuses
+
+    def should_retry_response(self, data: Any) -> bool:
+        """Whether a decoded response body carries a retryable ``PlatformErrorCodes`` value."""
+        return isinstance(data, dict) and data.get('ErrorCode') in self.retryable_error_codes
+
+    def delay(self, attempt: int) -> float:
+        """The number of seconds to wait after the request has been sent ``attempt`` times."""
+        delay = min(self.backoff_max, self.backoff_base * self.backoff_factor ** (attempt - 1))
+        return delay * (1 - self.jitter * random.random())
@@ -135,6 +135,7 @@ setup(
     extras_require={  # Optional
         "dev": ["python-dotenv"],
         "test": ["python-dotenv"],
+        "fast": ["orjson"],
     },
     # If there are data files included in your packages that need to be
     # installed, specify them here.
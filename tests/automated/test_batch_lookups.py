@@ -0,0 +1,132 @@
+import json
+import threading
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import bungie_api_python
+from bungie_api_python.utils import RetryPolicy
+
+
+def general_user(membership_id: int) -> dict:
+    return {
+        'membershipId': str(membership_id),
+        'uniqueName': f'User#{membership_id}',
+        'displayName': f'User {membership_id}',
+        'profilePicture': 0,
+        'profileTheme': 0,
+        'userTitle': 0,
+        'successMessageFlags': '0',
+        'isDeleted': False,
+        'about': '',
+        'locale': 'en',
+        'localeInheritDefault': True,
+        'showGroupMessaging': True,
+        'profilePicturePath': '/img/profile/avatars/default_avatar.gif',
+        'profileThemeName': 'default',
+        'userTitleDisplay': 'Newbie',
+        'statusText': '',
+        'statusDate': '0001-01-01T00:00:00Z',
+    }
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    requested = []
+
+    def do_GET(self):
+        membership_id = int(self.path.rstrip('/').rsplit('/', 1)[-1])
+        Handler.requested.append(membership_id)
+
+        if membership_id == 0:
+            body = b'Not Found'
+            self.send_response(404)
+        else:
+            body = json.dumps({
+                'Response': general_user(membership_id),
+                'ErrorCode': 1,
+                'ThrottleSeconds': 0,
+                'ErrorStatus': 'Success',
+                'Message': 'Ok',
+                'MessageData': {},
+            }).encode()
+            self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class BatchTestCase:
+    server: ThreadingHTTPServer
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        Handler.requested = []
+
+    @property
+    def api_base(self) -> str:
+        return f'http://127.0.0.1:{self.server.server_port}/Platform/User'
+
+
+class TestBatchLookupsSync(BatchTestCase, unittest.TestCase):
+    def test_get_bungie_net_users_by_id_sync(self):
+        with bungie_api_python.BungieClientSync(api_key='test', retry_policy=RetryPolicy.disabled()) as client:
+            client.user.api_base = self.api_base
+            items = client.user.get_bungie_net_users_by_id([3, 1, 3, 0, 2], concurrency=4)
+
+        self.assertEqual([item.key for item in items], [3, 1, 0, 2])
+        self.assertEqual(sorted(Handler.requested), [0, 1, 2, 3])
+        self.assertEqual([item.ok for item in items], [True, True, False, True])
+        self.assertEqual(items[0].response.Response.membershipId, 3)
+        self.assertIsNotNone(items[2].error)
+
+    def test_batch_inside_map_sync(self):
+        client = bungie_api_python.BungieClientSync(
+            api_key='test', retry_policy=RetryPolicy.disabled(), max_workers=2,
+        )
+        client.user.api_base = self.api_base
+        results = []
+
+        def lookup():
+            # Every pool thread runs a batch, which must not wait on calls queued behind it.
+            results.extend(client.map(
+                lambda ids: [item.key for item in client.user.get_bungie_net_users_by_id(ids, concurrency=2)],
+                [[1, 2], [3, 4]],
+            ))
+
+        thread = threading.Thread(target=lookup, daemon=True)
+        thread.start()
+        thread.join(10)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(results, [[1, 2], [3, 4]])
+        client.close()
+
+
+class TestBatchLookupsAsync(BatchTestCase, unittest.IsolatedAsyncioTestCase):
+    async def test_get_bungie_net_users_by_id_async(self):
+        async with bungie_api_python.BungieClientAsync(api_key='test', retry_policy=RetryPolicy.disabled()) as client:
+            client.user.api_base = self.api_base
+            items = await client.user.get_bungie_net_users_by_id([3, 1, 3, 0, 2], concurrency=2)
+
+        self.assertEqual([item.key for item in items], [3, 1, 0, 2])
+        self.assertEqual(sorted(Handler.requested), [0, 1, 2, 3])
+        self.assertEqual([item.ok for item in items], [True, True, False, True])
+        self.assertEqual(items[1].response.Response.membershipId, 1)
+        self.assertIsNotNone(items[2].error)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import os
+import tempfile
+import time
+import unittest
+
+import requests
+
+import bungie_api_python
+from bungie_api_python.entities.core.enums import BungieMembershipType
+from bungie_api_python.entities.exceptions import PlatformErrorCodes
+from bungie_api_python.exceptions.core import ExchangeNotRecordedException
+from bungie_api_python.transport import Cassette, Exchange
+from bungie_api_python.utils import RetryPolicy
+from tests.standin import StandInServer, Latency, Faults
+
+
+class TestCassette(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'traffic.cassette')
+
+        with StandInServer(latency=Latency(mean=0.05)) as server, Cassette(self.path, mode='record') as cassette:
+            client = bungie_api_python.BungieClientSync(api_key='test', base_url=server.base_url, cassette=cassette)
+            self.user = client.user.get_bungie_net_user_by_id(1)
+            self.search = client.user.search_by_global_name_post('Guardian', 0)
+            client.user.get_membership_data_by_id(1, BungieMembershipType.All)
+            client.user.get_membership_data_by_id(2, BungieMembershipType.All)
+            client.close()
+
+    def test_replay_sync(self):
+        cassette = Cassette(self.path)
+        client = bungie_api_python.BungieClientSync(api_key='test', cassette=cassette)
+
+        self.assertEqual(len(cassette.exchanges), 4)
+        self.assertEqual(
+            cassette.exchanges[0].response_type, 'bungie_api_python.entities.responses.user.GetBungieNetUserById',
+        )
+        self.assertEqual(client.user.get_bungie_net_user_by_id(1), self.user)
+        self.assertEqual(client.user.search_by_global_name_post('Guardian', 0), self.search)
+        self.assertEqual(
+            client.user.get_membership_data_by_id(2, BungieMembershipType.All).Response.bungieNetUser.membershipId, 2,
+        )
+        self.assertIsNone(client._session)
+
+    def test_unrecorded_sync(self):
+        client = bungie_api_python.BungieClientSync(api_key='test', cassette=Cassette(self.path))
+
+        with self.assertRaises(ExchangeNotRecordedException):
+            client.user.search_by_global_name_post('Guardian', 1)
+
+        client.user.get_bungie_net_user_by_id(1)
+        with self.assertRaises(ExchangeNotRecordedException):
+            client.user.get_bungie_net_user_by_id(1)
+
+    def test_repeats_and_rewind(self):
+        cassette = Cassette(self.path, allow_repeats=True)
+        client = bungie_api_python.BungieClientSync(api_key='test', cassette=cassette)
+
+        self.assertEqual(client.user.get_bungie_net_user_by_id(1), client.user.get_bungie_net_user_by_id(1))
+
+        cassette = Cassette(self.path)
+        client = bungie_api_python.BungieClientSync(api_key='test', cassette=cassette)
+        client.user.get_bungie_net_user_by_id(1)
+        cassette.rewind()
+        client.user.get_bungie_net_user_by_id(1)
+
+    def test_replay_latency(self):
+        client = bungie_api_python.BungieClientSync(api_key='test', cassette=Cassette(self.path))
+        start = time.monotonic()
+        client.user.get_bungie_net_user_by_id(1)
+        self.assertLess(time.monotonic() - start, 0.04)
+
+        client = bungie_api_python.BungieClientSync(
+            api_key='test', cassette=Cassette(self.path, replay_latency=True, latency_scale=2),
+        )
+        start = time.monotonic()
+        client.user.get_bungie_net_user_by_id(1)
+        self.assertGreater(time.monotonic() - start, 0.1)
+
+    def test_errors(self):
+        path = f'{self.path}.errors'
+        with StandInServer(faults=Faults(maintenance=1.0)) as server, Cassette(path, mode='record') as cassette:
+            client = bungie_api_python.BungieClientSync(
+                api_key='test', base_url=server.base_url, cassette=cassette, retry_policy=RetryPolicy.disabled(),
+            )
+            with self.assertRaises(requests.HTTPError):
+                client.user.get_available_themes()
+
+        client = bungie_api_python.BungieClientSync(
+            api_key='test', cassette=Cassette(path), retry_policy=RetryPolicy.disabled(),
+        )
+        with self.assertRaises(requests.HTTPError) as e:
+            client.user.get_available_themes()
+        self.assertEqual(e.exception.response.status_code, 503)
+        self.assertEqual(e.exception.response.json()['ErrorCode'], PlatformErrorCodes.SystemDisabled.value)
+
+    def test_non_standard_status(self):
+        path = f'{self.path}.cdn'
+        with Cassette(path, mode='record') as cassette:
+            cassette.record(Exchange(
+                method='GET',
+                url='/Platform/User/GetAvailableThemes/',
+                status=522,
+                headers=[('Content-Type', 'text/html')],
+                content=b'<html>Connection timed out</html>',
+                response_type='bungie_api_python.entities.responses.user.GetAvailableThemes',
+            ))
+
+        client = bungie_api_python.BungieClientSync(
+            api_key='test', cassette=Cassette(path), retry_policy=RetryPolicy.disabled(),
+        )
+        with self.assertRaises(requests.HTTPError) as e:
+            client.user.get_available_themes()
+        self.assertEqual(e.exception.response.status_code, 522)
+        self.assertEqual(e.exception.response.reason, '')
+
+    def test_mode(self):
+        with self.assertRaises(ValueError):
+            Cassette(self.path, mode='play')
+
+
+class TestCassetteAsync(unittest.IsolatedAsyncioTestCase):
+    async def test_replay_async(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'traffic.cassette')
+            with StandInServer() as server, Cassette(path, mode='record') as cassette:
+                async with bungie_api_python.BungieClientAsync(
+                    api_key='test', base_url=server.base_url, cassette=cassette,
+                ) as client:
+                    recorded = await client.user.search_by_global_name_post('Guardian', 0)
+
+            # Cassettes recorded by one client replay through the other.
+            sync_client = bungie_api_python.BungieClientSync(api_key='test', cassette=Cassette(path))
+            self.assertEqual(sync_client.user.search_by_global_name_post('Guardian', 0), recorded)
+
+            async with bungie_api_python.BungieClientAsync(api_key='test', cassette=Cassette(path)) as client:
+                self.assertEqual(await client.user.search_by_global_name_post('Guardian', 0), recorded)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+
+import requests
+
+import bungie_api_python
+from bungie_api_python.cache import ResponseCache
+from bungie_api_python.entities.responses import GetAvailableThemes
+from bungie_api_python.metrics import ClientMetrics, CONTENT_TYPE
+from bungie_api_python.utils import RetryPolicy
+from tests.standin import StandInServer, Faults
+
+
+class TestClientMetricsSync(unittest.TestCase):
+    def setUp(self):
+        self.server = StandInServer().start()
+        self.addCleanup(self.server.stop)
+        self.client = bungie_api_python.BungieClientSync(
+            api_key='test',
+            base_url=self.server.base_url,
+            cache=ResponseCache(ttls={GetAvailableThemes: 60}),
+            retry_policy=RetryPolicy(max_attempts=2, backoff_base=0),
+        )
+        self.addCleanup(self.client.close)
+        self.metrics = ClientMetrics().attach(self.client)
+
+    def samples(self) -> dict[str, float]:
+        return {
+            line.rsplit(' ', 1)[0]: float(line.rsplit(' ', 1)[1])
+            for line in self.metrics.render().splitlines() if not line.startswith('#')
+        }
+
+    def test_requests_sync(self):
+        self.client.user.get_bungie_net_user_by_id(1)
+        self.client.user.get_bungie_net_user_by_id(2)
+        self.client.user.search_by_global_name_post('Guardian', 0)
+        self.client.user.get_available_themes()
+        self.client.user.get_available_themes()
+
+        samples = self.samples()
+        user = 'endpoint="user.get_bungie_net_user_by_id"'
+        self.assertEqual(samples[f'bungie_api_requests_total{{{user},error_status="Success"}}'], 2)
+        self.assertEqual(samples[f'bungie_api_request_duration_seconds_count{{{user}}}'], 2)
+        self.assertEqual(samples[f'bungie_api_request_duration_seconds_bucket{{{user},le="+Inf"}}'], 2)
+        self.assertEqual(samples[f'bungie_api_decode_duration_seconds_count{{{user}}}'], 2)
+        self.assertGreater(samples[f'bungie_api_response_bytes_total{{{user}}}'], 0)
+        self.assertGreater(samples['bungie_api_request_bytes_total{endpoint="user.search_by_global_name_post"}'], 0)
+        self.assertEqual(samples['bungie_api_cache_hits_total{endpoint="user.get_available_themes"}'], 1)
+        self.assertEqual(samples['bungie_api_open_connections'], 1)
+
+        # Buckets are cumulative.
+        histogram = f'bungie_api_request_duration_seconds_bucket{{{user}'
+        buckets = [value for key, value in samples.items() if key.startswith(histogram)]
+        self.assertEqual(buckets, sorted(buckets))
+
+    def test_failures_sync(self):
+        self.server.faults = Faults(maintenance=1.0)
+        with self.assertRaises(requests.HTTPError):
+            self.client.user.get_bungie_net_user_by_id(1)
+
+        self.server.faults = Faults(throttle=1.0)
+        self.client.user.get_bungie_net_user_by_id(1)
+
+        samples = self.samples()
+        user = 'endpoint="user.get_bungie_net_user_by_id"'
+        self.assertEqual(samples[f'bungie_api_request_exceptions_total{{{user},exception="HTTPError"}}'], 1)
+        self.assertEqual(
+            samples[f'bungie_api_requests_total{{{user},error_status="PerEndpointRequestThrottleExceeded"}}'], 1,
+        )
+        self.assertEqual(samples[f'bungie_api_retries_total{{{user}}}'], 2)
+        self.assertEqual(samples[f'bungie_api_throttle_waits_total{{{user}}}'], 1)
+        self.assertGreater(samples[f'bungie_api_throttle_wait_seconds_total{{{user}}}'], 0.5)
+
+    def test_serve_sync(self):
+        self.client.user.get_available_themes()
+        server = self.metrics.serve(port=0)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        r = requests.get(f'http://127.0.0.1:{server.server_address[1]}/metrics')
+        self.assertEqual(r.headers['Content-Type'], CONTENT_TYPE)
+        self.assertIn('# TYPE bungie_api_request_duration_seconds histogram', r.text)
+        self.assertEqual(requests.get(f'http://127.0.0.1:{server.server_address[1]}/').status_code, 404)
+
+    def test_detach_sync(self):
+        self.metrics.detach(self.client)
+        self.client.user.get_available_themes()
+
+        self.assertEqual(self.samples(), {'bungie_api_open_connections': 0})
+
+
+class TestClientMetricsAsync(unittest.IsolatedAsyncioTestCase):
+    async def test_connections_async(self):
+        with StandInServer() as server:
+            async with bungie_api_python.BungieClientAsync(api_key='test', base_url=server.base_url) as client:
+                metrics = ClientMetrics().attach(client)
+                await client.user.get_bungie_net_user_by_id(1)
+                await client.user.get_bungie_net_user_by_id(2)
+                text = metrics.render()
+
+        self.assertIn('bungie_api_connections_opened_total{endpoint="user.get_bungie_net_user_by_id"} 1\n', text)
+        self.assertIn('bungie_api_open_connections 1\n', text)
+
+    async def test_search_labels_async(self):
+        with StandInServer(search_pages=3) as server:
+            async with bungie_api_python.BungieClientAsync(api_key='test', base_url=server.base_url) as client:
+                metrics = ClientMetrics().attach(client)
+                # Without prefetching, no page past the last one is requested.
+                [detail async for detail in client.user.iterate_search_by_global_name_post('Guardian', prefetch=0)]
+                text = metrics.render()
+
+        self.assertIn(
+            'bungie_api_requests_total{endpoint="user.search_by_global_name_post",error_status="Success"} 3\n', text,
+        )
+        self.assertNotIn('endpoint="other"', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import asyncio
+import unittest
+import warnings
+
+import bungie_api_python
+from tests.standin import StandInServer
+
+
+class TestClientSessionSync(unittest.TestCase):
+    def test_session_is_reused_sync(self):
+        client = bungie_api_python.BungieClientSync(api_key='test', pool_maxsize=16)
+        session = client.session()
+
+        self.assertIs(session, client.session())
+        self.assertEqual(session.get_adapter('https://www.bungie.net')._pool_maxsize, 16)
+        self.assertEqual(session.headers['X-API-Key'], 'test')
+
+    def test_pool_fits_workers_sync(self):
+        client = bungie_api_python.BungieClientSync(api_key='test', pool_maxsize=4, max_workers=12)
+
+        self.assertEqual(client.session().get_adapter('https://www.bungie.net')._pool_maxsize, 12)
+
+    def test_close_sync(self):
+        with bungie_api_python.BungieClientSync(api_key='test') as client:
+            session = client.session()
+
+        self.assertIsNone(client._session)
+        self.assertIsNot(session, client.session())
+        client.close()
+
+
+class TestClientSessionAsync(unittest.IsolatedAsyncioTestCase):
+    async def test_session_is_reused_async(self):
+        async with bungie_api_python.BungieClientAsync(api_key='test', limit=8, limit_per_host=4) as client:
+            session = client.session()
+
+            self.assertIs(session, client.session())
+            self.assertEqual(session.connector.limit, 8)
+            self.assertEqual(session.connector.limit_per_host, 4)
+
+        self.assertTrue(session.closed)
+        self.assertIsNone(client._session)
+
+
+class TestClientSessionEventLoops(unittest.TestCase):
+    def test_client_outlives_event_loop_async(self):
+        sessions = []
+
+        async def lookup(membership_id):
+            sessions.append(client.session())
+            return (await client.user.get_bungie_net_user_by_id(membership_id)).Response.membershipId
+
+        with StandInServer() as server, warnings.catch_warnings():
+            warnings.simplefilter('error', ResourceWarning)
+            client = bungie_api_python.BungieClientAsync(api_key='test', base_url=server.base_url)
+
+            self.assertEqual(asyncio.run(lookup(1)), 1)
+            self.assertEqual(asyncio.run(lookup(2)), 2)
+            asyncio.run(client.aclose())
+
+        self.assertIsNot(sessions[0], sessions[1])
+        self.assertTrue(sessions[0].closed)
+        self.assertIsNone(client._session)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import json
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from bungie_api_python.entities.applications import Datapoint
+from bungie_api_python.entities.decoder import ModelDecoder
+from bungie_api_python.entities.model_utils import parse_datetime, parse_datetime_cached, format_datetime, \
+    _fromisoformat_bungie
+from bungie_api_python.entities.responses import GetBungieNetUserById
+from bungie_api_python.utils.datetimes import DateTimeUtils
+from tests.fixtures import payloads
+
+
+TIMESTAMPS = {
+    '2023-01-02T18:20:11Z': datetime(2023, 1, 2, 18, 20, 11, tzinfo=timezone.utc),
+    '2023-01-02T18:20:11.89Z': datetime(2023, 1, 2, 18, 20, 11, 890000, tzinfo=timezone.utc),
+    '2015-03-09T02:54:40.437Z': datetime(2015, 3, 9, 2, 54, 40, 437000, tzinfo=timezone.utc),
+    '2015-03-09T02:54:40.4371234Z': datetime(2015, 3, 9, 2, 54, 40, 437123, tzinfo=timezone.utc),
+    '2023-01-02T18:20:11': datetime(2023, 1, 2, 18, 20, 11, tzinfo=timezone.utc),
+    '2023-01-02T20:20:11.5+02:00': datetime(2023, 1, 2, 18, 20, 11, 500000, tzinfo=timezone.utc),
+    '0001-01-01T00:00:00Z': datetime(1, 1, 1, tzinfo=timezone.utc),
+}
+
+
+class TestDateTimes(unittest.TestCase):
+    def test_parse(self):
+        for value, expected in TIMESTAMPS.items():
+            with self.subTest(value=value):
+                parsed = parse_datetime(value)
+                self.assertEqual(parsed, expected)
+                self.assertIsNotNone(parsed.tzinfo)
+
+    def test_parse_before_python_311(self):
+        for value, expected in TIMESTAMPS.items():
+            with self.subTest(value=value):
+                parsed = _fromisoformat_bungie(value)
+                self.assertEqual(parsed.replace(tzinfo=parsed.tzinfo or timezone.utc), expected)
+
+    def test_cached(self):
+        value = '2023-01-02T18:20:11.89Z'
+        self.assertEqual(parse_datetime_cached(value), parse_datetime(value))
+        self.assertIs(parse_datetime_cached(value), parse_datetime_cached(value))
+
+    def test_format(self):
+        self.assertEqual(format_datetime(TIMESTAMPS['2023-01-02T18:20:11.89Z']), '2023-01-02T18:20:11.890Z')
+        self.assertEqual(format_datetime(datetime(2023, 1, 2, 18, 20, 11)), '2023-01-02T18:20:11.000Z')
+        self.assertEqual(
+            format_datetime(datetime(2023, 1, 2, 20, 20, 11, tzinfo=timezone(timedelta(hours=2)))),
+            '2023-01-02T18:20:11.000Z',
+        )
+        self.assertEqual(DateTimeUtils.encode_datetime(datetime(2023, 1, 2)), '2023-01-02T00:00:00.000Z')
+
+        for expected in TIMESTAMPS.values():
+            milliseconds = expected.replace(microsecond=expected.microsecond // 1000 * 1000)
+            self.assertEqual(parse_datetime(format_datetime(expected)), milliseconds)
+
+    def test_models(self):
+        user = ModelDecoder.decode(GetBungieNetUserById, json.loads(payloads.GET_BUNGIE_NET_USER_BY_ID)).Response
+        self.assertEqual(user.lastUpdate, TIMESTAMPS['2023-01-02T18:20:11.89Z'])
+        self.assertEqual(user.to_dict()['lastUpdate'], '2023-01-02T18:20:11.890Z')
+
+        point = Datapoint.from_dict({'time': '2023-01-01T00:00:00Z', 'count': 1})
+        self.assertEqual(point.time, datetime(2023, 1, 1, tzinfo=timezone.utc))
+        self.assertEqual(ModelDecoder.decode(Datapoint, {'time': '2023-01-01T00:00:00Z', 'count': 1}), point)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import dataclasses
+import json
+import pickle
+import unittest
+
+from bungie_api_python.entities import applications, config, core, groupsv2, ignores, user
+from bungie_api_python.entities.decoder import ModelDecoder
+from bungie_api_python.entities.user import UserMembershipData
+from tests.fixtures import payloads
+
+
+ENTITIES = [
+    entity
+    for module in (applications, config, core, groupsv2, ignores, user)
+    for entity in vars(module).values()
+    if dataclasses.is_dataclass(entity)
+]
+
+
+class TestEntitySlots(unittest.TestCase):
+    def test_entities_use_slots(self):
+        self.assertGreater(len(ENTITIES), 10)
+        for entity in ENTITIES:
+            with self.subTest(entity=entity.__name__):
+                self.assertIn('__slots__', vars(entity))
+
+    def test_json_round_trip(self):
+        data = json.loads(payloads.GET_MEMBERSHIP_DATA_BY_ID)['Response']
+        membership_data = ModelDecoder.decode(UserMembershipData, data)
+
+        self.assertFalse(hasattr(membership_data.bungieNetUser, '__dict__'))
+        self.assertEqual(UserMembershipData.from_dict(data), membership_data)
+        card = membership_data.destinyMemberships[0]
+        self.assertEqual(type(card).from_json(card.to_json()), card)
+        self.assertEqual(pickle.loads(pickle.dumps(membership_data)), membership_data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from enum import Enum
+
+from bungie_api_python.entities.applications import ApplicationScopes, ApplicationStatus
+from bungie_api_python.entities.core import BungieCredentialType, BungieMembershipType
+from bungie_api_python.entities.decoder import ModelDecoder
+from bungie_api_python.entities.exceptions import PlatformErrorCodes
+from bungie_api_python.entities.ignores import IgnoreStatus
+from bungie_api_python.entities.model_utils import EnumTable, int64_enum_decoder
+from bungie_api_python.entities.responses import Response
+from bungie_api_python.entities.user import UserInfoCard
+
+
+class Aliased(Enum):
+    First = 1
+    Alias = 1
+
+
+class TestEnumTable(unittest.TestCase):
+    def test_matches_enum(self):
+        for enum in (PlatformErrorCodes, BungieCredentialType, BungieMembershipType, ApplicationStatus, IgnoreStatus):
+            table = EnumTable.of(enum)
+            for member in enum:
+                with self.subTest(member=member):
+                    self.assertIs(table.from_value(member.value), enum(member.value))
+                    self.assertIs(table.from_name(member.name), enum[member.name])
+
+    def test_table_is_cached(self):
+        self.assertIs(EnumTable.of(PlatformErrorCodes), EnumTable.of(PlatformErrorCodes))
+
+    def test_aliases(self):
+        table = EnumTable.of(Aliased)
+        self.assertIs(table.from_value(1), Aliased.First)
+        self.assertIs(table.from_name('Alias'), Aliased.First)
+
+    def test_flag_combinations(self):
+        table = EnumTable.of(ApplicationScopes)
+        combined = ApplicationScopes.ReadBasicUserProfile | ApplicationScopes.ReadGroups
+        self.assertEqual(table.from_value(combined.value), combined)
+        self.assertEqual(int64_enum_decoder(ApplicationScopes)(str(combined.value)), combined)
+
+    def test_invalid(self):
+        table = EnumTable.of(BungieMembershipType)
+        with self.assertRaises(ValueError):
+            table.from_value(7)
+        with self.assertRaises(ValueError):
+            table.from_value([1])
+        with self.assertRaises(ValueError):
+            table.from_name('Xbox')
+
+    def test_coerce(self):
+        table = EnumTable.of(BungieCredentialType)
+        self.assertIs(table.coerce(BungieCredentialType.SteamId), BungieCredentialType.SteamId)
+        self.assertIs(table.coerce('SteamId'), BungieCredentialType.SteamId)
+        self.assertIs(table.coerce(12), BungieCredentialType.SteamId)
+
+    def test_decoders(self):
+        response = ModelDecoder.decode(Response, {
+            'Response': None, 'ErrorCode': 5, 'ThrottleSeconds': 0, 'ErrorStatus': 'SystemDisabled',
+            'Message': '', 'MessageData': {},
+        })
+        self.assertIs(response.ErrorCode, PlatformErrorCodes.SystemDisabled)
+
+        card = {'isPublic': True, 'membershipType': 3, 'membershipId': '1', 'displayName': 'Guardian'}
+        self.assertIs(ModelDecoder.decode(UserInfoCard, card).membershipType, BungieMembershipType.TigerSteam)
+        with self.assertRaises(ValueError):
+            ModelDecoder.decode(UserInfoCard, {**card, 'membershipType': 7})
+
+
+if __name__ == "__main__":
+    unittest.main()
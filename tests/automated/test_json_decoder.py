@@ -0,0 +1,116 @@
+import json
+import threading
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import aiohttp
+import requests
+
+import bungie_api_python
+from bungie_api_python.entities.core.enums import OAuthClientType
+from bungie_api_python.exceptions.oauth import OAuthContextGenFailedException
+from bungie_api_python.utils import JSONDecoder, RetryPolicy
+from tests.fixtures.payloads import GET_BUNGIE_NET_USER_BY_ID, GET_APPLICATION_API_USAGE
+
+
+class TestJSONDecoder(unittest.TestCase):
+    def test_backends_agree(self):
+        for backend in JSONDecoder.available():
+            with self.subTest(backend=backend):
+                decoder = JSONDecoder(backend)
+                for payload in (GET_BUNGIE_NET_USER_BY_ID, GET_APPLICATION_API_USAGE):
+                    self.assertEqual(decoder.loads(payload), json.loads(payload))
+
+    def test_malformed_body_raises_value_error(self):
+        for backend in JSONDecoder.available():
+            with self.subTest(backend=backend):
+                with self.assertRaises(ValueError):
+                    JSONDecoder(backend).loads(b'<html>Not Found</html>')
+
+    def test_auto_prefers_fastest(self):
+        self.assertEqual(JSONDecoder().backend, JSONDecoder.available()[0])
+        self.assertEqual(JSONDecoder.available()[-1], 'json')
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            JSONDecoder('simplejson')
+
+    def test_client_setting(self):
+        client = bungie_api_python.BungieClientSync(api_key='test', json_decoder='json')
+        self.assertEqual(client.json_decoder.backend, 'json')
+
+        decoder = JSONDecoder()
+        client = bungie_api_python.BungieClientSync(api_key='test', json_decoder=decoder)
+        self.assertIs(client.json_decoder, decoder)
+
+
+class HTMLHandler(BaseHTTPRequestHandler):
+    """Answers every request with an HTML error page, as a proxy in front of the API might."""
+    def respond(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        body = b'<html><body>Bad Gateway</body></html>'
+        self.send_response(502)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = respond
+
+    def log_message(self, *args):
+        pass
+
+
+class NonJSONErrorTestCase:
+    server: ThreadingHTTPServer
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), HTMLHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    @property
+    def base_url(self) -> str:
+        return f'http://127.0.0.1:{self.server.server_port}'
+
+
+class TestNonJSONErrorSync(NonJSONErrorTestCase, unittest.TestCase):
+    def test_html_error_sync(self):
+        with bungie_api_python.BungieClientSync(
+            api_key='test', base_url=self.base_url, retry_policy=RetryPolicy.disabled(),
+        ) as client:
+            with self.assertRaises(requests.HTTPError):
+                client.user.get_available_themes()
+
+
+class TestNonJSONErrorAsync(NonJSONErrorTestCase, unittest.IsolatedAsyncioTestCase):
+    async def test_html_error_async(self):
+        async with bungie_api_python.BungieClientAsync(
+            api_key='test', base_url=self.base_url, retry_policy=RetryPolicy.disabled(),
+        ) as client:
+            with self.assertRaises(aiohttp.ClientResponseError) as cm:
+                await client.user.get_available_themes()
+
+        self.assertEqual(cm.exception.status, 502)
+        self.assertIsInstance(cm.exception.__cause__, ValueError)
+
+    async def test_html_error_oauth_async(self):
+        async with bungie_api_python.BungieClientAsync(
+            api_key='test',
+            client_id=1,
+            client_secret='secret',
+            client_type=OAuthClientType.Confidential,
+            base_url=self.base_url,
+            retry_policy=RetryPolicy.disabled(),
+        ) as client:
+            with self.assertRaises(OAuthContextGenFailedException):
+                await client.gen_oauth_context('code')
+
+
+if __name__ == "__main__":
+    unittest.main()
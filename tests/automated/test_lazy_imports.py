@@ -0,0 +1,52 @@
+import subprocess
+import sys
+import unittest
+
+import bungie_api_python
+from bungie_api_python import endpoints, utils
+
+
+def loaded_modules(statement: str, *modules: str) -> set[str]:
+    """The modules among ``modules`` that are loaded after running a statement in a fresh interpreter."""
+    check = f'import sys; print(",".join(name for name in {modules!r} if name in sys.modules))'
+    output = subprocess.run(
+        [sys.executable, '-c', f'{statement}; {check}'],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+    return set(filter(None, output.split(',')))
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_package_import_loads_nothing(self):
+        loaded = loaded_modules(
+            'import bungie_api_python',
+            'requests', 'aiohttp', 'dataclasses_json', 'bungie_api_python.client_base',
+        )
+        self.assertEqual(loaded, set())
+
+    def test_sync_client_skips_aiohttp(self):
+        loaded = loaded_modules('from bungie_api_python import BungieClientSync', 'requests', 'aiohttp', 'asyncio')
+        self.assertEqual(loaded, {'requests'})
+
+    def test_async_client_skips_requests(self):
+        loaded = loaded_modules('from bungie_api_python import BungieClientAsync', 'requests', 'aiohttp')
+        self.assertEqual(loaded, {'aiohttp'})
+
+    def test_lazy_attributes(self):
+        from bungie_api_python.client_sync import BungieClientSync
+        from bungie_api_python.endpoints.user import UserEndpoints
+        from bungie_api_python.utils.batch import BatchUtils
+
+        self.assertIs(bungie_api_python.BungieClientSync, BungieClientSync)
+        self.assertIs(endpoints.UserEndpoints, UserEndpoints)
+        self.assertIs(utils.BatchUtils, BatchUtils)
+        for module in (bungie_api_python, endpoints, utils):
+            self.assertLessEqual(set(module.__all__), set(dir(module)))
+            with self.assertRaises(AttributeError):
+                getattr(module, 'Missing')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,195 @@
+import json
+import pickle
+import threading
+import unittest
+import warnings
+from dataclasses import dataclass, field
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional
+
+from dataclasses_json import dataclass_json, LetterCase
+
+import bungie_api_python
+from bungie_api_python.entities.applications import ApplicationScopes
+from bungie_api_python.entities.core import AccessToken, BungieMembershipType
+from bungie_api_python.entities import responses
+from bungie_api_python.entities.decoder import ModelDecoder
+from bungie_api_python.entities.model_utils import datetime_metadata
+from bungie_api_python.entities.responses import GetBungieNetUserById, GetBungieApplications, \
+    GetMembershipDataById, SearchByGlobalNamePost
+from bungie_api_python.entities.user import UserInfoCard
+from tests.fixtures import payloads
+from tests.fixtures.responses import CASES
+
+
+@dataclass_json
+@dataclass(kw_only=True)
+class Node:
+    name: str
+    children: list['Node']
+    parent: Optional['Node'] = field(default=None)
+
+
+@dataclass_json(letter_case=LetterCase.CAMEL)
+@dataclass(kw_only=True)
+class CamelCased:
+    display_name: str
+
+
+@dataclass_json
+@dataclass(kw_only=True)
+class Unsupported:
+    value: int | str
+
+
+class TestModelDecoder(unittest.TestCase):
+    def assertDecodesLikeFromDict(self, model, data):
+        expected = model.from_dict(json.loads(json.dumps(data)))
+        decoded = ModelDecoder.decode(model, json.loads(json.dumps(data)))
+        self.assertEqual(decoded, expected)
+        self.assertEqual(repr(decoded), repr(expected))
+
+    def test_matches_from_dict(self):
+        for case in CASES:
+            with self.subTest(case=case.name):
+                self.assertDecodesLikeFromDict(case.response_type, json.loads(case.body))
+
+    def test_fixtures_cover_every_response_type(self):
+        response_types = {
+            getattr(responses, name) for name in responses.__all__ if name not in ('Response', 'RawResponse')
+        }
+        self.assertEqual({case.response_type for case in CASES}, response_types)
+
+    def test_field_conversions(self):
+        r = ModelDecoder.decode(GetBungieApplications, json.loads(payloads.GET_BUNGIE_APPLICATIONS))
+        application = r.Response[0]
+
+        self.assertIsInstance(application.scope, ApplicationScopes)
+        self.assertIsInstance(application.creationDate, datetime)
+        self.assertEqual(application.team[0].user.membershipId, 19548659)
+        self.assertIs(application.team[0].user.membershipType, BungieMembershipType.BungieNext)
+
+    def test_optional_and_missing_fields(self):
+        card = {'isPublic': True, 'membershipType': 3, 'membershipId': '1', 'displayName': 'Guardian'}
+        self.assertDecodesLikeFromDict(UserInfoCard, card)
+        self.assertDecodesLikeFromDict(UserInfoCard, {**card, 'iconPath': None, 'applicableMembershipTypes': [3, 1]})
+
+        with self.assertRaises(KeyError):
+            ModelDecoder.decode(UserInfoCard, {'isPublic': True})
+
+    def test_none_for_required_field_warns(self):
+        card = {'isPublic': True, 'membershipType': 3, 'membershipId': None, 'displayName': 'Guardian'}
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            decoded = ModelDecoder.decode(UserInfoCard, card)
+
+        self.assertIsNone(decoded.membershipId)
+        self.assertEqual(len(caught), 1)
+        self.assertIs(caught[0].category, RuntimeWarning)
+
+    def test_post_init_runs(self):
+        token = ModelDecoder.decode(AccessToken, {
+            'access_token': 'token',
+            'token_type': 'Bearer',
+            'expires_in': 3600,
+            'membership_id': '1',
+        })
+        self.assertIsNotNone(token.expires_at)
+        self.assertEqual(token.membership_id, 1)
+
+    def test_recursive_model(self):
+        data = {'name': 'root', 'children': [{'name': 'leaf', 'children': []}]}
+        self.assertDecodesLikeFromDict(Node, data)
+
+    def test_unsupported_models_fall_back(self):
+        self.assertEqual(ModelDecoder.decoder(CamelCased), CamelCased.from_dict)
+        self.assertEqual(ModelDecoder.decode(CamelCased, {'displayName': 'Guardian'}).display_name, 'Guardian')
+        self.assertEqual(ModelDecoder.decoder(Unsupported), Unsupported.from_dict)
+
+    def test_decoder_is_cached(self):
+        self.assertIs(ModelDecoder.decoder(GetBungieNetUserById), ModelDecoder.decoder(GetBungieNetUserById))
+
+    def test_datetime_metadata(self):
+        @dataclass_json
+        @dataclass(kw_only=True)
+        class Stamped:
+            at: Optional[datetime] = field(default=None, metadata=datetime_metadata)
+
+        for value in ('2023-01-02T18:20:11.89Z', '0001-01-01T00:00:00Z', None):
+            self.assertDecodesLikeFromDict(Stamped, {'at': value})
+
+
+class TestLazyDecoding(unittest.TestCase):
+    def test_payload_decoded_on_first_read(self):
+        data = json.loads(payloads.GET_MEMBERSHIP_DATA_BY_ID)
+        response = ModelDecoder.decode(GetMembershipDataById, data, lazy=True)
+
+        self.assertNotIn('Response', vars(response))
+        self.assertEqual(response.ErrorStatus, 'Success')
+
+        membership_data = response.Response
+        self.assertIs(response.Response, membership_data)
+        self.assertNotIn(ModelDecoder.LAZY_PREFIX + 'Response', vars(response))
+        self.assertEqual(response, GetMembershipDataById.from_dict(data))
+
+    def test_lazy_matches_eager(self):
+        data = json.loads(payloads.SEARCH_BY_GLOBAL_NAME_POST)
+        eager = ModelDecoder.decode(SearchByGlobalNamePost, data)
+
+        self.assertEqual(ModelDecoder.decode(SearchByGlobalNamePost, data, lazy=True), eager)
+        self.assertEqual(ModelDecoder.decode(SearchByGlobalNamePost, data, lazy=True).to_dict(), eager.to_dict())
+        self.assertEqual(pickle.loads(pickle.dumps(ModelDecoder.decode(SearchByGlobalNamePost, data, lazy=True))), eager)
+
+    def test_missing_attribute(self):
+        response = ModelDecoder.decode(GetBungieNetUserById, json.loads(payloads.GET_BUNGIE_NET_USER_BY_ID), lazy=True)
+        with self.assertRaises(AttributeError):
+            response.NotAField
+
+    def test_models_without_lazy_fields(self):
+        self.assertIs(ModelDecoder.lazy_decoder(UserInfoCard), ModelDecoder.decoder(UserInfoCard))
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = payloads.GET_BUNGIE_NET_USER_BY_ID
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestLazyClient(unittest.TestCase):
+    server: ThreadingHTTPServer
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_lazy_setting_and_option(self):
+        url = f'http://127.0.0.1:{self.server.server_port}/Platform/User/GetBungieNetUserById/19548659/'
+        with bungie_api_python.BungieClientSync(api_key='test', lazy=True) as client:
+            lazy = client.get(url, response_type=GetBungieNetUserById)
+            with client.options(lazy=False):
+                eager = client.get(url, response_type=GetBungieNetUserById)
+
+        self.assertNotIn('Response', vars(lazy))
+        self.assertIn('Response', vars(eager))
+        self.assertEqual(lazy.Response.membershipId, 19548659)
+        self.assertEqual(lazy, eager)
+
+
+if __name__ == "__main__":
+    unittest.main()
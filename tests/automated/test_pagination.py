@@ -0,0 +1,201 @@
+import json
+import threading
+import time
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import bungie_api_python
+from bungie_api_python.exceptions.core import PageFetchFailedException
+from bungie_api_python.utils import RetryPolicy
+
+
+PAGES = 5
+PAGE_SIZE = 3
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    requested = []
+    failing_page = None
+    delay = 0.0
+
+    def do_POST(self):
+        page = int(self.path.rstrip('/').rsplit('/', 1)[-1])
+        prefix = json.loads(self.rfile.read(int(self.headers['Content-Length'])))['displayNamePrefix']
+        Handler.requested.append(page)
+        time.sleep(Handler.delay)
+
+        if page == Handler.failing_page:
+            body = json.dumps({
+                'Response': None,
+                'ErrorCode': 5,
+                'ThrottleSeconds': 0,
+                'ErrorStatus': 'SystemDisabled',
+                'Message': 'Disabled',
+                'MessageData': {},
+            }).encode()
+        else:
+            results = [] if page >= PAGES else [
+                {
+                    'bungieGlobalDisplayName': f'{prefix}{page * PAGE_SIZE + i}',
+                    'bungieGlobalDisplayNameCode': 1,
+                    'bungieNetMembershipId': str(page * PAGE_SIZE + i),
+                    'destinyMemberships': [],
+                }
+                for i in range(PAGE_SIZE)
+            ]
+            body = json.dumps({
+                'Response': {'searchResults': results, 'page': page, 'hasMore': page < PAGES - 1},
+                'ErrorCode': 1,
+                'ThrottleSeconds': 0,
+                'ErrorStatus': 'Success',
+                'Message': 'Ok',
+                'MessageData': {},
+            }).encode()
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class PaginationTestCase:
+    server: ThreadingHTTPServer
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        Handler.requested = []
+        Handler.failing_page = None
+        Handler.delay = 0.0
+
+    @property
+    def api_base(self) -> str:
+        return f'http://127.0.0.1:{self.server.server_port}/Platform/User'
+
+
+class TestPaginationSync(PaginationTestCase, unittest.TestCase):
+    def test_iterates_all_pages_sync(self):
+        with bungie_api_python.BungieClientSync(api_key='test', retry_policy=RetryPolicy.disabled()) as client:
+            client.user.api_base = self.api_base
+            details = list(client.user.iterate_search_by_global_name_post('Guardian', prefetch=2))
+
+        self.assertEqual([int(d.bungieNetMembershipId) for d in details], list(range(PAGES * PAGE_SIZE)))
+        self.assertEqual(details[0].bungieGlobalDisplayName, 'Guardian0')
+        # Pages prefetched past the last one are requested, but never yielded.
+        self.assertLessEqual(len(Handler.requested), PAGES + 2)
+
+    def test_prefetch_is_bounded_sync(self):
+        with bungie_api_python.BungieClientSync(api_key='test', retry_policy=RetryPolicy.disabled()) as client:
+            client.user.api_base = self.api_base
+            details = client.user.iterate_search_by_global_name_post('Guardian', prefetch=1)
+            next(details)
+            time.sleep(0.1)
+
+            self.assertEqual(sorted(Handler.requested), [0, 1])
+            details.close()
+
+    def test_prefetch_overlaps_requests_sync(self):
+        Handler.delay = 0.05
+        with bungie_api_python.BungieClientSync(api_key='test', retry_policy=RetryPolicy.disabled()) as client:
+            client.user.api_base = self.api_base
+            start = time.perf_counter()
+            list(client.user.iterate_search_by_global_name_post('Guardian', prefetch=PAGES))
+            elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, PAGES * Handler.delay)
+
+    def test_failed_page_raises_sync(self):
+        Handler.failing_page = 2
+        with bungie_api_python.BungieClientSync(api_key='test', retry_policy=RetryPolicy.disabled()) as client:
+            client.user.api_base = self.api_base
+            details = client.user.iterate_search_by_global_name_post('Guardian')
+
+            with self.assertRaises(PageFetchFailedException) as cm:
+                list(details)
+
+        self.assertEqual(cm.exception.page, 2)
+
+    def test_prefetch_keeps_options_sync(self):
+        with bungie_api_python.BungieClientSync(api_key='test', retry_policy=RetryPolicy.disabled()) as client:
+            client.user.api_base = self.api_base
+            search = client.user.search_by_global_name_post
+            lazy = []
+
+            def search_by_global_name_post(prefix, page):
+                lazy.append(client._option('lazy', client.lazy))
+                return search(prefix, page)
+
+            client.user.search_by_global_name_post = search_by_global_name_post
+            with client.options(lazy=True):
+                list(client.user.iterate_search_by_global_name_post('Guardian', prefetch=2))
+
+        self.assertGreaterEqual(len(lazy), PAGES)
+        self.assertTrue(all(lazy))
+
+    def test_iterates_inside_map_sync(self):
+        client = bungie_api_python.BungieClientSync(
+            api_key='test', retry_policy=RetryPolicy.disabled(), max_workers=2,
+        )
+        client.user.api_base = self.api_base
+        counts = []
+
+        def iterate():
+            counts.extend(client.map(
+                lambda prefix: len(list(client.user.iterate_search_by_global_name_post(prefix))),
+                ['Guardian', 'Titan'],
+            ))
+
+        thread = threading.Thread(target=iterate, daemon=True)
+        thread.start()
+        thread.join(10)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(counts, [PAGES * PAGE_SIZE] * 2)
+        client.close()
+
+
+class TestPaginationAsync(PaginationTestCase, unittest.IsolatedAsyncioTestCase):
+    async def test_iterates_all_pages_async(self):
+        async with bungie_api_python.BungieClientAsync(api_key='test', retry_policy=RetryPolicy.disabled()) as client:
+            client.user.api_base = self.api_base
+            details = [d async for d in client.user.iterate_search_by_global_name_post('Guardian', prefetch=2)]
+
+        self.assertEqual([int(d.bungieNetMembershipId) for d in details], list(range(PAGES * PAGE_SIZE)))
+        self.assertLessEqual(len(Handler.requested), PAGES + 2)
+
+    async def test_prefetch_overlaps_requests_async(self):
+        Handler.delay = 0.05
+        async with bungie_api_python.BungieClientAsync(api_key='test', retry_policy=RetryPolicy.disabled()) as client:
+            client.user.api_base = self.api_base
+            start = time.perf_counter()
+            [d async for d in client.user.iterate_search_by_global_name_post('Guardian', prefetch=PAGES)]
+            elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, PAGES * Handler.delay)
+
+    async def test_failed_page_raises_async(self):
+        Handler.failing_page = 1
+        async with bungie_api_python.BungieClientAsync(api_key='test', retry_policy=RetryPolicy.disabled()) as client:
+            client.user.api_base = self.api_base
+
+            with self.assertRaises(PageFetchFailedException) as cm:
+                [d async for d in client.user.iterate_search_by_global_name_post('Guardian')]
+
+        self.assertEqual(cm.exception.page, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+from bungie_api_python.entities.exceptions import PlatformErrorCodes
+from bungie_api_python.utils import RateLimiter, TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_wait(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1, places=2)
+        self.assertAlmostEqual(bucket.reserve(), 0.2, places=2)
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_endpoint_key(self):
+        self.assertEqual(
+            RateLimiter.endpoint_key('https://www.bungie.net/Platform/User/GetMembershipsById/4611686018483530949/3/'),
+            '/Platform/User/GetMembershipsById/{}/{}/',
+        )
+
+    def test_unlimited_by_default(self):
+        limiter = RateLimiter()
+        for _ in range(100):
+            self.assertEqual(limiter.reserve('/Platform/User/GetAvailableThemes/'), 0)
+
+    def test_per_endpoint_buckets(self):
+        limiter = RateLimiter(per_endpoint_rate=1, per_endpoint_burst=1)
+
+        self.assertEqual(limiter.reserve('a'), 0)
+        self.assertEqual(limiter.reserve('b'), 0)
+        self.assertGreater(limiter.reserve('a'), 0)
+
+    def test_endpoint_throttle(self):
+        limiter = RateLimiter()
+        limiter.observe('a', {
+            'ErrorCode': PlatformErrorCodes.PerEndpointRequestThrottleExceeded.value,
+            'ThrottleSeconds': 5,
+        })
+
+        self.assertGreater(limiter.reserve('a'), 4)
+        self.assertEqual(limiter.reserve('b'), 0)
+
+    def test_application_throttle(self):
+        limiter = RateLimiter()
+        limiter.observe('a', {
+            'ErrorCode': PlatformErrorCodes.ThrottleLimitExceededMinutes.value,
+            'ThrottleSeconds': 0,
+        })
+
+        self.assertGreater(limiter.reserve('b'), 59)
+
+    def test_ignore_throttle(self):
+        limiter = RateLimiter(respect_throttle=False)
+        limiter.observe('a', {'ErrorCode': PlatformErrorCodes.Success.value, 'ThrottleSeconds': 5})
+
+        self.assertEqual(limiter.reserve('a'), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
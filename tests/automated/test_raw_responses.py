@@ -0,0 +1,128 @@
+import asyncio
+import json
+import threading
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import bungie_api_python
+from bungie_api_python.cache import ResponseCache
+from bungie_api_python.entities.exceptions import PlatformErrorCodes
+from bungie_api_python.entities.responses import GetBungieNetUserById, RawResponse
+from bungie_api_python.utils.batch import BatchItem
+from tests.fixtures import payloads
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    calls = 0
+
+    def do_GET(self):
+        Handler.calls += 1
+        body = payloads.GET_BUNGIE_NET_USER_BY_ID
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestRawResponse(unittest.TestCase):
+    def test_build(self):
+        body = payloads.GET_BUNGIE_NET_USER_BY_ID
+        data = json.loads(body)
+
+        self.assertIs(RawResponse.build('dict', body, data), data)
+
+        raw = RawResponse.build('bytes', body, data)
+        self.assertIs(raw.body, body)
+        self.assertIs(raw.ErrorCode, PlatformErrorCodes.Success)
+        self.assertEqual(raw.ErrorStatus, 'Success')
+        self.assertFalse(hasattr(raw, 'Response'))
+
+    def test_build_without_envelope(self):
+        raw = RawResponse.build('bytes', b'{"access_token": "token"}', {'access_token': 'token'})
+        self.assertIsNone(raw.ErrorCode)
+
+    def test_batch_items(self):
+        self.assertTrue(BatchItem(key=1, response={'ErrorCode': 1}).ok)
+        self.assertFalse(BatchItem(key=1, response={'ErrorCode': 5}).ok)
+        self.assertFalse(BatchItem(key=1, response=RawResponse(body=b'', ErrorCode=PlatformErrorCodes(5))).ok)
+
+
+class TestRawClient(unittest.TestCase):
+    server: ThreadingHTTPServer
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f'http://127.0.0.1:{cls.server.server_port}/Platform/User/GetBungieNetUserById/19548659/'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        Handler.calls = 0
+
+    def test_raw_setting(self):
+        with bungie_api_python.BungieClientSync(api_key='test', raw='dict') as client:
+            r = client.get(self.url, response_type=GetBungieNetUserById)
+        self.assertEqual(r, json.loads(payloads.GET_BUNGIE_NET_USER_BY_ID))
+
+        with bungie_api_python.BungieClientSync(api_key='test', raw='bytes') as client:
+            r = client.get(self.url, response_type=GetBungieNetUserById)
+        self.assertEqual(r.body, payloads.GET_BUNGIE_NET_USER_BY_ID)
+        self.assertIs(r.ErrorCode, PlatformErrorCodes.Success)
+
+    def test_raw_option(self):
+        with bungie_api_python.BungieClientSync(api_key='test') as client:
+            with client.options(raw='dict'):
+                raw = client.get(self.url, response_type=GetBungieNetUserById)
+                mapped = client.map(lambda _: client.get(self.url, response_type=GetBungieNetUserById), [1, 2])
+            model = client.get(self.url, response_type=GetBungieNetUserById)
+
+        self.assertIsInstance(raw, dict)
+        self.assertTrue(all(isinstance(r, dict) for r in mapped))
+        self.assertIsInstance(model, GetBungieNetUserById)
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            bungie_api_python.BungieClientSync(api_key='test', raw='json')
+        client = bungie_api_python.BungieClientSync(api_key='test')
+        with self.assertRaises(ValueError):
+            with client.options(raw='json'):
+                pass
+
+    def test_cached_separately_from_models(self):
+        cache = ResponseCache(ttls={GetBungieNetUserById: 60})
+        with bungie_api_python.BungieClientSync(api_key='test', cache=cache) as client:
+            model = client.get(self.url, response_type=GetBungieNetUserById)
+            with client.options(raw='dict'):
+                first = client.get(self.url, response_type=GetBungieNetUserById)
+                second = client.get(self.url, response_type=GetBungieNetUserById)
+            self.assertIs(client.get(self.url, response_type=GetBungieNetUserById), model)
+
+        self.assertEqual(Handler.calls, 2)
+        self.assertEqual(first, second)
+        # Every hit gets its own dict, so callers cannot change each other's responses.
+        self.assertIsNot(first, second)
+
+    def test_async_client(self):
+        async def run():
+            async with bungie_api_python.BungieClientAsync(api_key='test', raw='bytes') as client:
+                with client.options(raw='dict'):
+                    as_dict = await client.get(self.url, response_type=GetBungieNetUserById)
+                return as_dict, await client.get(self.url, response_type=GetBungieNetUserById)
+
+        as_dict, as_bytes = asyncio.run(run())
+        self.assertIsInstance(as_dict, dict)
+        self.assertIsInstance(as_bytes, RawResponse)
+
+
+if __name__ == "__main__":
+    unittest.main()
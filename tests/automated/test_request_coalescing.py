@@ -0,0 +1,68 @@
+import asyncio
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import bungie_api_python
+
+
+THEMES = {
+    'Response': [{'userThemeId': 1, 'userThemeName': 'Default', 'userThemeDescription': 'Default'}],
+    'ErrorCode': 1,
+    'ThrottleSeconds': 0,
+    'ErrorStatus': 'Success',
+    'Message': 'Ok',
+    'MessageData': {},
+}
+
+
+class TestRequestCoalescingAsync(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.calls = 0
+
+        async def handler(request: web.Request) -> web.Response:
+            self.calls += 1
+            await asyncio.sleep(0.05)
+            return web.json_response(THEMES)
+
+        app = web.Application()
+        app.router.add_get('/Platform/User/GetAvailableThemes/', handler)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    def client(self, **kwargs) -> bungie_api_python.BungieClientAsync:
+        client = bungie_api_python.BungieClientAsync(api_key='test', **kwargs)
+        client.user.api_base = str(self.server.make_url('/Platform/User'))
+        return client
+
+    async def test_identical_requests_are_coalesced_async(self):
+        async with self.client() as client:
+            responses = await asyncio.gather(*[client.user.get_available_themes() for _ in range(20)])
+
+        self.assertEqual(self.calls, 1)
+        self.assertTrue(all(response is responses[0] for response in responses))
+        self.assertEqual(client._in_flight, {})
+
+    async def test_coalescing_disabled_async(self):
+        async with self.client(coalesce_requests=False) as client:
+            await asyncio.gather(*[client.user.get_available_themes() for _ in range(5)])
+
+        self.assertEqual(self.calls, 5)
+
+    async def test_cancelled_caller_async(self):
+        async with self.client() as client:
+            cancelled = asyncio.ensure_future(client.user.get_available_themes())
+            waiting = asyncio.ensure_future(client.user.get_available_themes())
+            await asyncio.sleep(0.01)
+            cancelled.cancel()
+
+            self.assertEqual((await waiting).Response[0].userThemeId, 1)
+        self.assertEqual(self.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
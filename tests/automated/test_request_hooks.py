@@ -0,0 +1,158 @@
+import unittest
+
+import requests
+
+import bungie_api_python
+from bungie_api_python.cache import ResponseCache
+from bungie_api_python.endpoint_base import EndpointBase
+from bungie_api_python.entities.exceptions import PlatformErrorCodes
+from bungie_api_python.entities.responses import GetAvailableThemes, SearchByGlobalNamePost
+from bungie_api_python.hooks import RequestEvents
+from bungie_api_python.utils import RetryPolicy
+from tests.standin import StandInServer, Faults
+
+
+class TestRequestHooksSync(unittest.TestCase):
+    def setUp(self):
+        self.server = StandInServer().start()
+        self.addCleanup(self.server.stop)
+        self.client = bungie_api_python.BungieClientSync(
+            api_key='test', base_url=self.server.base_url, retry_policy=RetryPolicy(max_attempts=2, backoff_base=0),
+        )
+        self.addCleanup(self.client.close)
+        self.events = []
+        self.client.add_hook('*', self.events.append)
+
+    def test_lifecycle_sync(self):
+        self.client.user.search_by_global_name_post('Guardian', 0)
+
+        self.assertEqual([e.event for e in self.events], [
+            RequestEvents.REQUEST_START,
+            RequestEvents.FIRST_BYTE,
+            RequestEvents.BODY_READ,
+            RequestEvents.JSON_PARSED,
+            RequestEvents.MODEL_DECODED,
+            RequestEvents.REQUEST_END,
+        ])
+        for event in self.events:
+            self.assertEqual(event.endpoint, 'user.search_by_global_name_post')
+            self.assertIs(event.response_type, SearchByGlobalNamePost)
+            self.assertEqual(event.method, 'POST')
+            self.assertEqual(event.bytes_out, len('{"displayNamePrefix": "Guardian"}'))
+        self.assertEqual([e.time for e in self.events], sorted(e.time for e in self.events))
+
+        end = self.events[-1]
+        self.assertEqual(end.status, 200)
+        self.assertEqual(end.error_code, PlatformErrorCodes.Success.value)
+        self.assertEqual(end.bytes_in, self.events[2].bytes_in)
+        self.assertGreater(end.bytes_in, 0)
+        self.assertAlmostEqual(end.duration, end.elapsed, places=3)
+
+    def test_batch_endpoint_names_sync(self):
+        self.client.user.get_bungie_net_users_by_id([1, 2], concurrency=2)
+
+        self.assertEqual({e.endpoint for e in self.events}, {'user.get_bungie_net_user_by_id'})
+
+    def test_retry_and_error_sync(self):
+        self.server.faults = Faults(maintenance=1.0)
+
+        with self.assertRaises(requests.HTTPError):
+            self.client.user.get_available_themes()
+
+        retry, = [e for e in self.events if e.event == RequestEvents.RETRY]
+        error, = [e for e in self.events if e.event == RequestEvents.ERROR]
+        self.assertEqual(retry.status, 503)
+        self.assertEqual(retry.attempt, 1)
+        self.assertEqual(error.attempt, 2)
+        self.assertIsInstance(error.error, requests.HTTPError)
+
+    def test_throttle_wait_sync(self):
+        self.server.faults = Faults(throttle=1.0, throttle_seconds=1)
+        client = bungie_api_python.BungieClientSync(
+            api_key='test', base_url=self.server.base_url, retry_policy=RetryPolicy(max_attempts=2, backoff_base=0),
+        )
+        client.add_hook(RequestEvents.THROTTLE_WAIT, self.events.append)
+        client.add_hook(RequestEvents.RETRY, self.events.append)
+
+        self.assertEqual(
+            client.user.get_available_themes().ErrorCode, PlatformErrorCodes.PerEndpointRequestThrottleExceeded,
+        )
+        retry, wait = self.events
+        self.assertEqual(retry.error_code, PlatformErrorCodes.PerEndpointRequestThrottleExceeded.value)
+        self.assertGreater(wait.duration, 0.5)
+
+    def test_cache_hit_sync(self):
+        client = bungie_api_python.BungieClientSync(
+            api_key='test', base_url=self.server.base_url, cache=ResponseCache(ttls={GetAvailableThemes: 60}),
+        )
+        client.user.get_available_themes()
+        client.add_hook(RequestEvents.CACHE_HIT, self.events.append)
+        client.user.get_available_themes()
+
+        hit, = self.events
+        self.assertEqual(hit.endpoint, 'user.get_available_themes')
+
+    def test_remove_hook_sync(self):
+        self.client.remove_hook('*', self.events.append)
+        self.client.user.get_available_themes()
+
+        self.assertEqual(self.events, [])
+        self.assertIsNone(self.client._trace('GET', '', GetAvailableThemes, None, None))
+        with self.assertRaises(ValueError):
+            self.client.add_hook('response', print)
+
+
+class TestRequestHooksAsync(unittest.IsolatedAsyncioTestCase):
+    async def test_lifecycle_async(self):
+        with StandInServer() as server:
+            async with bungie_api_python.BungieClientAsync(api_key='test', base_url=server.base_url) as client:
+                events = []
+                client.add_hook('*', events.append)
+                await client.user.get_bungie_net_user_by_id(1)
+                await client.user.get_bungie_net_user_by_id(2)
+
+        self.assertEqual([e.event for e in events][:7], [
+            RequestEvents.REQUEST_START,
+            RequestEvents.CONNECTION_ACQUIRED,
+            RequestEvents.FIRST_BYTE,
+            RequestEvents.BODY_READ,
+            RequestEvents.JSON_PARSED,
+            RequestEvents.MODEL_DECODED,
+            RequestEvents.REQUEST_END,
+        ])
+        self.assertEqual(
+            [e.connection_reused for e in events if e.event == RequestEvents.CONNECTION_ACQUIRED], [False, True],
+        )
+        self.assertEqual({e.endpoint for e in events}, {'user.get_bungie_net_user_by_id'})
+
+    async def test_search_endpoint_names_async(self):
+        with StandInServer(search_pages=3) as server:
+            async with bungie_api_python.BungieClientAsync(api_key='test', base_url=server.base_url) as client:
+                events = []
+                client.add_hook('*', events.append)
+                await client.user.search_by_global_name_post('Guardian', 0)
+                [detail async for detail in client.user.iterate_search_by_global_name_post('Guardian')]
+
+        self.assertGreaterEqual(len([e for e in events if e.event == RequestEvents.REQUEST_END]), 4)
+        self.assertEqual({e.endpoint for e in events}, {'user.search_by_global_name_post'})
+
+    async def test_coroutine_returning_method_async(self):
+        class Endpoints(EndpointBase, api_base='https://www.bungie.net/Platform/Test', name='test'):
+            def get_themes(self):
+                # Returns the coroutine without awaiting it, the request is made once the caller awaits it.
+                return self.parent.get(f'{self.api_base}/GetAvailableThemes/', response_type=GetAvailableThemes)
+
+        with StandInServer() as server:
+            async with bungie_api_python.BungieClientAsync(api_key='test', base_url=server.base_url) as client:
+                endpoints = Endpoints(client)
+                endpoints.api_base = f'{server.base_url}/Platform/User'
+                events = []
+                client.add_hook('*', events.append)
+                await endpoints.get_themes()
+
+        self.assertTrue(events)
+        self.assertEqual({e.endpoint for e in events}, {'test.get_themes'})
+
+
+if __name__ == "__main__":
+    unittest.main()
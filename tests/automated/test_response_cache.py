@@ -0,0 +1,201 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import bungie_api_python
+from bungie_api_python.cache import ResponseCache, MemoryCacheBackend, SQLiteCacheBackend, CacheEntry
+from bungie_api_python.entities.core import AccessToken
+from bungie_api_python.entities.responses import GetAvailableThemes, GetCredentialTypesForTargetAccount
+
+
+THEMES = {
+    'Response': [{'userThemeId': 1, 'userThemeName': 'Default', 'userThemeDescription': 'Default'}],
+    'ErrorCode': 1,
+    'ThrottleSeconds': 0,
+    'ErrorStatus': 'Success',
+    'Message': 'Ok',
+    'MessageData': {},
+}
+CREDENTIALS = {**THEMES, 'Response': []}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    calls = 0
+    not_modified = 0
+    etag = None
+
+    def do_GET(self):
+        Handler.calls += 1
+        if Handler.etag and self.headers.get('If-None-Match') == Handler.etag:
+            Handler.not_modified += 1
+            self.send_response(304)
+            self.send_header('ETag', Handler.etag)
+            self.send_header('Cache-Control', 'max-age=0')
+            self.end_headers()
+            return
+
+        body = json.dumps(THEMES if 'Themes' in self.path else CREDENTIALS).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        if Handler.etag:
+            self.send_header('ETag', Handler.etag)
+            self.send_header('Cache-Control', 'private, max-age=0')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def access_token(membership_id: int) -> AccessToken:
+    return AccessToken(
+        access_token=f'token-{membership_id}',
+        token_type='Bearer',
+        expires_in=3600,
+        membership_id=membership_id,
+    )
+
+
+class TestMemoryCacheBackend(unittest.TestCase):
+    def entry(self, size: int) -> CacheEntry:
+        return CacheEntry(expires_at=float('inf'), size=size, value=object())
+
+    def test_lru_eviction_by_count(self):
+        backend = MemoryCacheBackend(max_entries=2)
+        backend.set('a', self.entry(1))
+        backend.set('b', self.entry(1))
+        backend.get('a')
+        backend.set('c', self.entry(1))
+
+        self.assertIsNotNone(backend.get('a'))
+        self.assertIsNone(backend.get('b'))
+        self.assertEqual(backend.stats.evictions, 1)
+
+    def test_eviction_by_size(self):
+        backend = MemoryCacheBackend(max_bytes=10)
+        backend.set('a', self.entry(6))
+        backend.set('b', self.entry(6))
+
+        self.assertEqual(len(backend), 1)
+        self.assertEqual(backend.size, 6)
+
+    def test_expiry(self):
+        backend = MemoryCacheBackend()
+        backend.set('a', CacheEntry(expires_at=0, size=1, value=object()))
+
+        self.assertIsNone(backend.get('a'))
+
+
+class TestSQLiteCacheBackend(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'cache.sqlite3')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_shared_between_backends(self):
+        writer = SQLiteCacheBackend(self.path)
+        reader = SQLiteCacheBackend(self.path)
+        writer.set('a', CacheEntry(expires_at=time.time() + 60, size=2, body=b'{}'))
+
+        self.assertEqual(reader.get('a').body, b'{}')
+        writer.close()
+        reader.close()
+
+    def test_lazy_decode(self):
+        cache = ResponseCache(backend=SQLiteCacheBackend(self.path), ttls={GetAvailableThemes: 60})
+        cache.set('a', GetAvailableThemes, json.dumps(THEMES).encode(), None)
+        response = cache.get('a', GetAvailableThemes)
+
+        self.assertEqual(response.Response[0].userThemeName, 'Default')
+        cache.backend.close()
+
+    def test_eviction(self):
+        backend = SQLiteCacheBackend(self.path, max_entries=2)
+        for index, key in enumerate('abc'):
+            backend.set(key, CacheEntry(expires_at=time.time() + 60 + index, size=2, body=b'{}'))
+
+        self.assertIsNone(backend.get('a'))
+        self.assertIsNotNone(backend.get('c'))
+        self.assertEqual(backend.stats.evictions, 1)
+        backend.close()
+
+
+class TestResponseCacheSync(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        Handler.calls = 0
+        Handler.not_modified = 0
+        Handler.etag = None
+        self.cache = ResponseCache(ttls={GetAvailableThemes: 60, GetCredentialTypesForTargetAccount: 60})
+        self.client = bungie_api_python.BungieClientSync(api_key='test', cache=self.cache)
+        self.client.user.api_base = f'http://127.0.0.1:{self.server.server_port}/Platform/User'
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_cache_hit_sync(self):
+        first = self.client.user.get_available_themes()
+        second = self.client.user.get_available_themes()
+
+        self.assertIs(first, second)
+        self.assertEqual(Handler.calls, 1)
+        self.assertEqual((self.cache.stats.hits, self.cache.stats.misses), (1, 1))
+
+    def test_cache_bypass_sync(self):
+        self.client.user.get_available_themes()
+        with self.client.options(cache=False):
+            self.client.user.get_available_themes()
+
+        self.assertEqual(Handler.calls, 2)
+
+    def test_uncached_response_type_sync(self):
+        self.cache.ttls.pop(GetAvailableThemes)
+        self.client.user.get_available_themes()
+        self.client.user.get_available_themes()
+
+        self.assertEqual(Handler.calls, 2)
+
+    def test_oauth_responses_are_not_shared_sync(self):
+        self.client.set_oauth_context(access_token(1))
+        self.client.user.get_credential_types_for_target_account(1)
+        self.client.user.get_credential_types_for_target_account(1)
+        self.client.set_oauth_context(access_token(2))
+        self.client.user.get_credential_types_for_target_account(1)
+
+        self.assertEqual(Handler.calls, 2)
+
+    def test_conditional_request_sync(self):
+        Handler.etag = '"themes-v1"'
+        self.cache.ttls.pop(GetAvailableThemes)
+        first = self.client.user.get_available_themes()
+        second = self.client.user.get_available_themes()
+
+        self.assertIs(first, second)
+        self.assertEqual((Handler.calls, Handler.not_modified), (2, 1))
+        self.assertEqual(self.cache.stats.revalidations, 1)
+
+    def test_unknown_option(self):
+        with self.assertRaises(TypeError):
+            with self.client.options(unknown=True):
+                pass
+
+
+if __name__ == "__main__":
+    unittest.main()
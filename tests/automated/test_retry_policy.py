@@ -0,0 +1,189 @@
+import unittest
+
+import aiohttp
+import requests
+
+import bungie_api_python
+from bungie_api_python.entities.core.enums import OAuthClientType
+from bungie_api_python.entities.exceptions import PlatformErrorCodes
+from bungie_api_python.exceptions.oauth import OAuthContextGenFailedException
+from bungie_api_python.hooks import RequestEvents
+from bungie_api_python.utils import RetryPolicy
+from tests.standin import StandInServer, Faults
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_attempts(self):
+        policy = RetryPolicy(max_attempts=3)
+
+        self.assertTrue(policy.can_retry(1, idempotent=True))
+        self.assertTrue(policy.can_retry(2, idempotent=True))
+        self.assertFalse(policy.can_retry(3, idempotent=True))
+        self.assertFalse(RetryPolicy.disabled().can_retry(1, idempotent=True))
+
+    def test_non_idempotent(self):
+        self.assertFalse(RetryPolicy().can_retry(1, idempotent=False))
+        self.assertTrue(RetryPolicy(retry_non_idempotent=True).can_retry(1, idempotent=False))
+
+    def test_backoff(self):
+        policy = RetryPolicy(backoff_base=1, backoff_factor=2, backoff_max=5, jitter=0)
+
+        self.assertEqual([policy.delay(attempt) for attempt in range(1, 6)], [1, 2, 4, 5, 5])
+
+    def test_jitter(self):
+        policy = RetryPolicy(backoff_base=1, jitter=0.5)
+
+        for _ in range(100):
+            self.assertTrue(0.5 <= policy.delay(1) <= 1)
+
+    def test_retryable_responses(self):
+        policy = RetryPolicy(retryable_error_codes=[PlatformErrorCodes.ExternalServiceTimeout])
+
+        self.assertTrue(policy.should_retry_response({'ErrorCode': PlatformErrorCodes.ExternalServiceTimeout.value}))
+        self.assertFalse(policy.should_retry_response({'ErrorCode': PlatformErrorCodes.Success.value}))
+        self.assertFalse(policy.should_retry_response({'access_token': 'token'}))
+        self.assertTrue(policy.should_retry_status(503))
+        self.assertFalse(policy.should_retry_status(404))
+
+
+class ClientRetryTestCase:
+    client_class: type
+
+    def setUp(self):
+        self.server = StandInServer().start()
+        self.addCleanup(self.server.stop)
+
+    def client(self, max_attempts: int = 3, recover: bool = True):
+        """A client against the stand-in server, whose faults are cleared by the first retry when ``recover``."""
+        client = self.client_class(
+            api_key='test',
+            client_id=1,
+            client_secret='secret',
+            client_type=OAuthClientType.Confidential,
+            base_url=self.server.base_url,
+            retry_policy=RetryPolicy(max_attempts=max_attempts, backoff_base=0),
+        )
+        if recover:
+            client.add_hook(RequestEvents.RETRY, lambda event: setattr(self.server, 'faults', Faults()))
+        return client
+
+
+class TestClientRetriesSync(ClientRetryTestCase, unittest.TestCase):
+    client_class = bungie_api_python.BungieClientSync
+
+    def test_retries_server_error_sync(self):
+        self.server.faults = Faults(server_error=1.0)
+        with self.client() as client:
+            self.assertEqual(client.user.get_available_themes().ErrorCode, PlatformErrorCodes.Success)
+
+        self.assertEqual(self.server.stats.requests, 2)
+
+    def test_retries_error_code_sync(self):
+        self.server.faults = Faults(throttle=1.0, throttle_seconds=1)
+        with self.client() as client:
+            self.assertEqual(client.user.get_available_themes().ErrorCode, PlatformErrorCodes.Success)
+
+        self.assertEqual(self.server.stats.requests, 2)
+
+    def test_retries_connection_error_sync(self):
+        self.server.faults = Faults(timeout=1.0, timeout_seconds=0.05)
+        with self.client() as client:
+            self.assertEqual(client.user.get_available_themes().ErrorCode, PlatformErrorCodes.Success)
+
+        self.assertEqual(self.server.stats.requests, 2)
+
+    def test_retries_idempotent_post_sync(self):
+        self.server.faults = Faults(server_error=1.0)
+        with self.client() as client:
+            response = client.user.search_by_global_name_post('Guardian', 0)
+
+        self.assertEqual(response.ErrorCode, PlatformErrorCodes.Success)
+        self.assertEqual(self.server.stats.requests, 2)
+
+    def test_post_not_retried_sync(self):
+        self.server.faults = Faults(maintenance=1.0)
+        with self.client() as client:
+            with self.assertRaises(OAuthContextGenFailedException):
+                client.gen_oauth_context('code')
+
+        self.assertEqual(self.server.stats.requests, 1)
+
+    def test_attempts_run_out_sync(self):
+        self.server.faults = Faults(server_error=1.0)
+        with self.client(recover=False) as client:
+            with self.assertRaises(requests.HTTPError) as cm:
+                client.user.get_available_themes()
+
+        self.assertEqual(cm.exception.response.status_code, 500)
+        self.assertEqual(self.server.stats.requests, 3)
+
+    def test_connection_attempts_run_out_sync(self):
+        self.server.faults = Faults(timeout=1.0, timeout_seconds=0.05)
+        with self.client(max_attempts=2, recover=False) as client:
+            with self.assertRaises(requests.ConnectionError):
+                client.user.get_available_themes()
+
+        self.assertEqual(self.server.stats.requests, 2)
+
+
+class TestClientRetriesAsync(ClientRetryTestCase, unittest.IsolatedAsyncioTestCase):
+    client_class = bungie_api_python.BungieClientAsync
+
+    async def test_retries_server_error_async(self):
+        self.server.faults = Faults(server_error=1.0)
+        async with self.client() as client:
+            self.assertEqual((await client.user.get_available_themes()).ErrorCode, PlatformErrorCodes.Success)
+
+        self.assertEqual(self.server.stats.requests, 2)
+
+    async def test_retries_error_code_async(self):
+        self.server.faults = Faults(throttle=1.0, throttle_seconds=1)
+        async with self.client() as client:
+            self.assertEqual((await client.user.get_available_themes()).ErrorCode, PlatformErrorCodes.Success)
+
+        self.assertEqual(self.server.stats.requests, 2)
+
+    async def test_retries_connection_error_async(self):
+        self.server.faults = Faults(timeout=1.0, timeout_seconds=0.05)
+        async with self.client() as client:
+            self.assertEqual((await client.user.get_available_themes()).ErrorCode, PlatformErrorCodes.Success)
+
+        self.assertEqual(self.server.stats.requests, 2)
+
+    async def test_retries_idempotent_post_async(self):
+        self.server.faults = Faults(server_error=1.0)
+        async with self.client() as client:
+            response = await client.user.search_by_global_name_post('Guardian', 0)
+
+        self.assertEqual(response.ErrorCode, PlatformErrorCodes.Success)
+        self.assertEqual(self.server.stats.requests, 2)
+
+    async def test_post_not_retried_async(self):
+        self.server.faults = Faults(maintenance=1.0)
+        async with self.client() as client:
+            # A POST to the token endpoint, sent as the OAuth endpoints do, without marking it idempotent.
+            response = await client.post(client.oauth.api_base, data={'grant_type': 'authorization_code'})
+
+        self.assertEqual(response.ErrorCode, PlatformErrorCodes.SystemDisabled)
+        self.assertEqual(self.server.stats.requests, 1)
+
+    async def test_attempts_run_out_async(self):
+        self.server.faults = Faults(server_error=1.0)
+        async with self.client(recover=False) as client:
+            # Like every other error response, the last one is returned rather than raised.
+            response = await client.user.get_available_themes()
+
+        self.assertEqual(response.ErrorCode, PlatformErrorCodes.UnhandledException)
+        self.assertEqual(self.server.stats.requests, 3)
+
+    async def test_connection_attempts_run_out_async(self):
+        self.server.faults = Faults(timeout=1.0, timeout_seconds=0.05)
+        async with self.client(max_attempts=2, recover=False) as client:
+            with self.assertRaises(aiohttp.ClientConnectionError):
+                await client.user.get_available_themes()
+
+        self.assertEqual(self.server.stats.requests, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import time
+import unittest
+
+import requests
+
+import bungie_api_python
+from bungie_api_python.entities.core.enums import BungieMembershipType, BungieCredentialType, OAuthClientType
+from bungie_api_python.entities.exceptions import PlatformErrorCodes
+from bungie_api_python.utils import RetryPolicy
+from tests.standin import StandInServer, Latency, Faults
+
+
+class TestStandInServerSync(unittest.TestCase):
+    def setUp(self):
+        self.server = StandInServer(search_pages=3, search_page_size=10, seed=0).start()
+        self.addCleanup(self.server.stop)
+        self.client = bungie_api_python.BungieClientSync(
+            api_key='test',
+            client_id=1,
+            client_secret='secret',
+            client_type=OAuthClientType.Confidential,
+            base_url=self.server.base_url,
+        )
+        self.addCleanup(self.client.close)
+
+    def test_endpoints_sync(self):
+        user = self.client.user
+
+        self.assertEqual(user.get_bungie_net_user_by_id(4611686018467238913).Response.membershipId, 4611686018467238913)
+        self.assertEqual(len(user.get_available_themes().Response), 20)
+        self.assertEqual(user.get_sanitized_platform_display_names(1).ErrorCode, PlatformErrorCodes.Success)
+        self.assertEqual(
+            user.get_membership_data_by_id(1, BungieMembershipType.All).Response.bungieNetUser.membershipId, 1,
+        )
+        self.assertEqual(
+            user.get_membership_from_hard_linked_credential(BungieCredentialType.SteamId, 1).ErrorCode,
+            PlatformErrorCodes.Success,
+        )
+        self.assertEqual(len(self.client.app.get_bungie_applications().Response), 2)
+        self.assertEqual(len(list(user.iterate_search_by_global_name_post('Guardian'))), 30)
+        # Pooled connections are reused, only the prefetching threads open their own.
+        self.assertLess(self.server.stats.connections, self.server.stats.requests)
+
+    def test_oauth_sync(self):
+        url = f'{self.server.base_url}/Platform/User/GetMembershipsForCurrentUser/'
+        r = requests.get(url, headers={'X-API-Key': 'test', 'Authorization': 'Bearer forged'})
+        self.assertEqual(r.status_code, 401)
+        self.assertEqual(r.json()['ErrorCode'], PlatformErrorCodes.WebAuthRequired.value)
+
+        self.client.gen_oauth_context('code')
+
+        response = self.client.user.get_membership_data_for_current_user
+        self.assertEqual(response().Response.bungieNetUser.membershipId, self.client._access_token.membership_id)
+        self.assertEqual(len(self.client.user.get_credential_types_for_target_account(1).Response), 3)
+        self.assertIsNotNone(self.client.app.get_application_api_usage(1).Response.apiCalls)
+
+    def test_api_key_sync(self):
+        self.server.api_key = 'other'
+        client = bungie_api_python.BungieClientSync(api_key='test', base_url=self.server.base_url)
+
+        with self.assertRaises(requests.HTTPError):
+            client.user.get_available_themes()
+
+    def test_throttle_sync(self):
+        self.server.faults = Faults(throttle=1.0, throttle_seconds=1)
+        client = bungie_api_python.BungieClientSync(
+            api_key='test', base_url=self.server.base_url, retry_policy=RetryPolicy.disabled(),
+        )
+
+        response = client.user.get_available_themes()
+        self.assertEqual(response.ErrorCode, PlatformErrorCodes.PerEndpointRequestThrottleExceeded)
+        self.assertEqual(response.ThrottleSeconds, 1)
+
+        # The throttle holds for the seconds it announced, and the client waits them out before its next request.
+        self.server.faults = Faults()
+        url = f'{self.server.base_url}/Platform/User/GetAvailableThemes/'
+        r = requests.get(url, headers={'X-API-Key': 'test'})
+        self.assertEqual(r.json()['ErrorCode'], PlatformErrorCodes.PerEndpointRequestThrottleExceeded.value)
+
+        start = time.monotonic()
+        self.assertEqual(client.user.get_available_themes().ErrorCode, PlatformErrorCodes.Success)
+        self.assertGreater(time.monotonic() - start, 0.5)
+
+    def test_rate_limit_sync(self):
+        self.server.rate_limit = 5
+        client = bungie_api_python.BungieClientSync(
+            api_key='test', base_url=self.server.base_url, retry_policy=RetryPolicy.disabled(),
+        )
+
+        codes = [client.user.get_available_themes().ErrorCode for _ in range(10)]
+        self.assertIn(PlatformErrorCodes.PerEndpointRequestThrottleExceeded, codes)
+        self.assertEqual(codes[0], PlatformErrorCodes.Success)
+
+    def test_faults_sync(self):
+        self.server.faults = Faults(maintenance=1.0)
+        client = bungie_api_python.BungieClientSync(
+            api_key='test', base_url=self.server.base_url, retry_policy=RetryPolicy(max_attempts=2, backoff_base=0),
+        )
+
+        with self.assertRaises(requests.HTTPError) as e:
+            client.user.get_available_themes()
+        self.assertEqual(e.exception.response.status_code, 503)
+        self.assertEqual(self.server.stats.statuses['SystemDisabled'], 2)
+
+    def test_timeout_sync(self):
+        self.server.faults = Faults(timeout=1.0, timeout_seconds=0.1)
+        client = bungie_api_python.BungieClientSync(
+            api_key='test', base_url=self.server.base_url, retry_policy=RetryPolicy.disabled(),
+        )
+
+        with self.assertRaises(requests.ConnectionError):
+            client.user.get_available_themes()
+        self.assertEqual(self.server.stats.timeouts, 1)
+
+
+class TestStandInServerAsync(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.server = StandInServer(latency=Latency(distribution='uniform', mean=0.01, spread=0.005)).start()
+        self.addCleanup(self.server.stop)
+
+    async def test_endpoints_async(self):
+        async with bungie_api_python.BungieClientAsync(api_key='test', base_url=self.server.base_url) as client:
+            response = await client.user.get_bungie_net_user_by_id(1)
+            applications = await client.app.get_bungie_applications()
+
+        self.assertEqual(response.Response.membershipId, 1)
+        self.assertEqual(len(applications.Response), 2)
+
+
+class TestLatency(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(Latency.parse('lognormal:0.05:0.5'), Latency(distribution='lognormal', mean=0.05, spread=0.5))
+        self.assertEqual(Latency.parse('constant'), Latency())
+        with self.assertRaises(ValueError):
+            Latency.parse('normal:1')
+
+
+if __name__ == "__main__":
+    unittest.main()
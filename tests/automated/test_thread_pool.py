@@ -0,0 +1,86 @@
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+
+import bungie_api_python
+from bungie_api_python.entities.core import AccessToken, OAuthClientType
+
+
+def access_token(name: str, expired: bool = False) -> AccessToken:
+    token = AccessToken(
+        access_token=name,
+        token_type='Bearer',
+        expires_in=3600,
+        refresh_token='refresh',
+        refresh_expires_in=7200,
+        membership_id=1,
+    )
+    if expired:
+        token.expires_at = datetime.utcnow() - timedelta(seconds=1)
+    return token
+
+
+class TestThreadPoolSync(unittest.TestCase):
+    def test_map_keeps_order_sync(self):
+        with bungie_api_python.BungieClientSync(api_key='test', max_workers=4) as client:
+            results = client.map(lambda x: (time.sleep(0.01 * (x % 3)), x * 2)[1], range(20))
+
+        self.assertEqual(results, [x * 2 for x in range(20)])
+
+    def test_map_limits_workers_sync(self):
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def call(_):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+
+        with bungie_api_python.BungieClientSync(api_key='test', max_workers=8) as client:
+            client.map(call, range(30), workers=3)
+
+        self.assertLessEqual(peak, 3)
+
+    def test_map_raises_sync(self):
+        def call(x):
+            if x == 5:
+                raise ValueError(x)
+            return x
+
+        with bungie_api_python.BungieClientSync(api_key='test', max_workers=4) as client:
+            with self.assertRaises(ValueError):
+                client.map(call, range(10))
+
+    def test_single_token_refresh_sync(self):
+        client = bungie_api_python.BungieClientSync(
+            api_key='test',
+            client_type=OAuthClientType.Confidential,
+            client_id=1,
+            client_secret='secret',
+            max_workers=8,
+        )
+        client.set_oauth_context(access_token('expired', expired=True))
+        refreshes = 0
+
+        def refresh_access_token(refresh_token: str) -> AccessToken:
+            nonlocal refreshes
+            refreshes += 1
+            time.sleep(0.05)
+            return access_token('refreshed')
+
+        client.oauth.refresh_access_token = refresh_access_token
+        with client:
+            headers = client.map(lambda _: client.oauth_context(), range(16))
+
+        self.assertEqual(refreshes, 1)
+        self.assertEqual(set(headers), {'Bearer refreshed'})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""Compares the previous timestamp decoder with the current parser and its memoised variant.
+
+    python -m tests.benchmarks.bench_datetime_parsing [--number 20000]
+
+Timestamps are taken from the fixture payloads: the handful found on a ``GeneralUser``, and the hourly
+``Datapoint.time`` series of an API usage response, which repeats the same timestamps for every metric.
+"""
+import argparse
+import json
+import timeit
+from datetime import datetime
+
+from bungie_api_python.entities.decoder import ModelDecoder
+from bungie_api_python.entities.model_utils import parse_datetime, parse_datetime_cached, _fromisoformat_bungie
+from bungie_api_python.entities.responses import GetApplicationApiUsage
+from tests.fixtures import payloads
+
+
+def legacy(value: str) -> datetime:
+    """The previous decoder, which dropped both fractional seconds and the timezone."""
+    return datetime.fromisoformat(value.strip('Z').split('.')[0])
+
+
+def best_of(fn, number: int, repeat: int = 5) -> float:
+    """The fastest time per call (in microseconds) over ``repeat`` runs of ``number`` calls."""
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=20_000, help='The number of timestamps parsed per timing run.')
+    args = parser.parse_args()
+
+    user = json.loads(payloads.GET_BUNGIE_NET_USER_BY_ID)['Response']
+    usage = json.loads(payloads.GET_APPLICATION_API_USAGE)['Response']
+    cases = [
+        ('GeneralUser', [user['firstAccess'], user['lastUpdate']]),
+        ('ApiUsage series', [
+            point['time']
+            for metric in ('apiCalls', 'throttledRequests')
+            for series in usage[metric]
+            for point in series['datapoints']
+        ]),
+    ]
+    parsers = [
+        ('legacy', legacy),
+        ('pre-3.11', _fromisoformat_bungie),
+        ('parse', parse_datetime),
+        ('cached', parse_datetime_cached),
+    ]
+
+    print(f'{"Timestamps":<18}{"Count":>7}' + ''.join(f'{name + " (us)":>16}' for name, _ in parsers))
+    for name, values in cases:
+        number = max(args.number // len(values), 1)
+        timings = []
+        for _, parse in parsers:
+            timings.append(best_of(lambda: [parse(value) for value in values], number) / len(values))
+        print(f'{name:<18}{len(values):>7}' + ''.join(f'{timing:>16.3f}' for timing in timings))
+
+    number = max(args.number // 1000, 1)
+    data = json.loads(payloads.GET_APPLICATION_API_USAGE)
+    decode = best_of(lambda: ModelDecoder.decode(GetApplicationApiUsage, data), number) / 1000
+    print(f'\nGetApplicationApiUsage decoded in {decode:.2f} ms, with cached timestamps.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""Measures how fast every response type decodes, at the sizes the API returns them, without a network.
+
+    python -m tests.benchmarks.bench_decode_suite [--decoder compiled] [--parse] [--filter Search] [--json out.json]
+
+For each response in ``tests/fixtures/responses.py`` it reports:
+
+* throughput, in decodes and model objects per second, where objects counts every model in the decoded response,
+* the p50, p95 and p99 latency of a single decode,
+* the memory blocks and bytes a decode leaves allocated (the response itself), and its peak allocation.
+
+Decoders are ``compiled`` (the client's decoders), ``lazy`` (compiled, with payloads left for first access) and
+``from_dict`` (dataclasses_json), so an optimisation can be compared against the others and against earlier runs.
+"""
+import argparse
+import dataclasses
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from bungie_api_python.entities.decoder import ModelDecoder
+from bungie_api_python.utils import JSONDecoder
+from tests.fixtures.responses import CASES, ResponseCase
+
+
+DECODERS: dict[str, Callable[[type, Any], Any]] = {
+    'compiled': lambda model, data: ModelDecoder.decode(model, data),
+    'lazy': lambda model, data: ModelDecoder.decode(model, data, lazy=True),
+    'from_dict': lambda model, data: model.from_dict(data),
+}
+
+
+def count_models(value: Any) -> int:
+    """The number of model instances within a decoded value."""
+    if dataclasses.is_dataclass(value):
+        return 1 + sum(count_models(getattr(value, f.name)) for f in dataclasses.fields(value))
+    if isinstance(value, (list, tuple)):
+        return sum(count_models(item) for item in value)
+    if isinstance(value, dict):
+        return sum(count_models(item) for item in value.values())
+    return 0
+
+
+def latencies(fn: Callable[[], Any], min_time: float, min_samples: int) -> list[float]:
+    """Times single calls (in microseconds) until both ``min_time`` seconds and ``min_samples`` calls have passed."""
+    for _ in range(3):
+        fn()
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < min_samples or time.perf_counter() < deadline:
+        start = time.perf_counter_ns()
+        fn()
+        samples.append((time.perf_counter_ns() - start) / 1000)
+    return samples
+
+
+def allocations(fn: Callable[[], Any]) -> tuple[int, int, int]:
+    """The blocks and bytes a call leaves allocated while its result is held, and its peak allocation in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        result = fn()
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    stats = after.compare_to(before, 'filename')
+    del result
+    return sum(s.count_diff for s in stats), sum(s.size_diff for s in stats), peak
+
+
+def run_case(case: ResponseCase, decoder: str, parse: bool, loads: Callable, min_time: float, samples: int) -> dict:
+    decode = DECODERS[decoder]
+    model = case.response_type
+    data = loads(case.body)
+    if parse:
+        def fn():
+            return decode(model, loads(case.body))
+    else:
+        def fn():
+            return decode(model, data)
+
+    timings = latencies(fn, min_time, samples)
+    p = statistics.quantiles(timings, n=100)
+    mean = statistics.fmean(timings)
+    objects = count_models(ModelDecoder.decode(model, loads(case.body)))
+    blocks, size, peak = allocations(fn)
+    return {
+        'name': case.name,
+        'bytes': len(case.body),
+        'objects': objects,
+        'decodes_per_sec': 1e6 / mean,
+        'objects_per_sec': objects * 1e6 / mean,
+        'p50_us': p[49],
+        'p95_us': p[94],
+        'p99_us': p[98],
+        'retained_blocks': blocks,
+        'retained_bytes': size,
+        'peak_bytes': peak,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--decoder', choices=DECODERS, default='compiled', help='The model decoder to measure.')
+    parser.add_argument('--parse', action='store_true', help='Include JSON parsing in every decode.')
+    parser.add_argument('--filter', default='', help='Only run the responses whose name contains this text.')
+    parser.add_argument('--min-time', type=float, default=0.5, help='The minimum seconds spent timing each response.')
+    parser.add_argument('--samples', type=int, default=200, help='The minimum number of decodes timed per response.')
+    parser.add_argument('--json', dest='output', help='Also write the results to this JSON file.')
+    args = parser.parse_args()
+
+    json_decoder = JSONDecoder()
+    results = []
+    print(
+        f'{"Response":<44}{"Objects":>8}{"Decodes/s":>11}{"Objects/s":>12}'
+        f'{"p50 (us)":>10}{"p95 (us)":>10}{"p99 (us)":>10}{"Blocks":>8}{"KiB":>9}{"Peak KiB":>10}'
+    )
+    for case in CASES:
+        if args.filter not in case.name:
+            continue
+        r = run_case(case, args.decoder, args.parse, json_decoder.loads, args.min_time, args.samples)
+        results.append(r)
+        print(
+            f'{r["name"]:<44}{r["objects"]:>8}{r["decodes_per_sec"]:>11.0f}{r["objects_per_sec"]:>12.0f}'
+            f'{r["p50_us"]:>10.1f}{r["p95_us"]:>10.1f}{r["p99_us"]:>10.1f}'
+            f'{r["retained_blocks"]:>8}{r["retained_bytes"] / 1024:>9.1f}{r["peak_bytes"] / 1024:>10.1f}'
+        )
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'decoder': args.decoder,
+                'parse': args.parse,
+                'json_backend': json_decoder.backend,
+                'python': sys.version.split()[0],
+                'results': results,
+            }, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+"""Measures how the clients scale with concurrency, end to end, against the local stand-in server.
+
+    python -m tests.benchmarks.bench_end_to_end [--modes sync,threaded,async] [--concurrency 1,8,32] [--json out.json]
+
+The stand-in (``tests/standin``) runs in its own process, so only the client's CPU is measured. Every run sends the
+same mix of calls: user lookups, global name searches and OAuth protected membership lookups, through
+
+* ``sync``, a ``BungieClientSync`` making one call at a time,
+* ``threaded``, a ``BungieClientSync`` making ``concurrency`` calls at once from its thread pool with ``client.map``,
+* ``async``, a ``BungieClientAsync`` making ``concurrency`` calls at once with ``asyncio.gather``.
+
+For each run it reports requests per second, the p50, p95 and p99 latency of a call, the sockets the client opened
+(as counted by the stand-in), and how the client's time was spent: CPU parsing and decoding responses, the rest of
+its CPU (the HTTP stack, threads and event loop), and the wall time left waiting on the network.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Callable, Iterator
+
+import requests
+
+import bungie_api_python
+from bungie_api_python.entities.core.enums import BungieMembershipType, OAuthClientType
+from bungie_api_python.entities.decoder import ModelDecoder
+
+
+MODES = ('sync', 'threaded', 'async')
+
+
+def call_mix(client, count: int) -> list[Callable[[], Any]]:
+    """``count`` calls, mixing lookups, searches and OAuth protected calls, as zero argument callables."""
+    user = client.user
+    mix = [
+        lambda i: user.get_bungie_net_user_by_id(i),
+        lambda i: user.get_bungie_net_user_by_id(i),
+        lambda i: user.get_membership_data_by_id(i, BungieMembershipType.All),
+        lambda i: user.search_by_global_name_post(f'Guardian{i}', 0),
+        lambda i: user.get_membership_data_for_current_user(),
+    ]
+    # Every call gets its own id, so async clients cannot coalesce them.
+    return [lambda i=i: mix[i % len(mix)](i + 1) for i in range(count)]
+
+
+class DecodeTimer:
+    """Adds up the CPU time the clients spend parsing and decoding responses, on every thread."""
+
+    def __init__(self) -> None:
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def wrap(self, fn: Callable) -> Callable:
+        def timed(*args, **kwargs):
+            start = time.thread_time()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.thread_time() - start
+                with self._lock:
+                    self.seconds += elapsed
+
+        return timed
+
+    @contextlib.contextmanager
+    def patch(self, client) -> Iterator[None]:
+        decode = ModelDecoder.__dict__['decode']
+        client.json_decoder.loads = self.wrap(client.json_decoder.loads)
+        ModelDecoder.decode = type(decode)(self.wrap(decode.__func__))
+        try:
+            yield
+        finally:
+            ModelDecoder.decode = decode
+
+
+@contextlib.contextmanager
+def standin(port: int, latency: str) -> Iterator[str]:
+    """Runs the stand-in server in another process, yielding its base url once it accepts requests."""
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'tests.standin', '--port', str(port), '--latency', latency],
+        stdout=subprocess.DEVNULL,
+    )
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                requests.get(f'{base_url}/__standin/stats').raise_for_status()
+                break
+            except requests.ConnectionError:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    raise RuntimeError('The stand-in server did not start.')
+                time.sleep(0.1)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def timed(fn: Callable[[], Any], latencies: list[float]) -> Any:
+    start = time.perf_counter()
+    result = fn()
+    latencies.append(time.perf_counter() - start)
+    return result
+
+
+async def timed_async(fn: Callable[[], Any], latencies: list[float], semaphore: asyncio.Semaphore) -> Any:
+    async with semaphore:
+        start = time.perf_counter()
+        result = await fn()
+        latencies.append(time.perf_counter() - start)
+        return result
+
+
+def drive(mode: str, base_url: str, concurrency: int, requests_per_run: int, timer: DecodeTimer) -> list[float]:
+    """Sends the call mix through a fresh client, returning the latency of every call."""
+    kwargs = dict(
+        api_key='bench',
+        client_id=1,
+        client_secret='secret',
+        client_type=OAuthClientType.Confidential,
+        base_url=base_url,
+    )
+    latencies = []
+
+    if mode == 'async':
+        async def run() -> None:
+            async with bungie_api_python.BungieClientAsync(limit=concurrency, **kwargs) as client:
+                await client.gen_oauth_context('code')
+                semaphore = asyncio.Semaphore(concurrency)
+                with timer.patch(client):
+                    await asyncio.gather(*(
+                        timed_async(call, latencies, semaphore) for call in call_mix(client, requests_per_run)
+                    ))
+
+        asyncio.run(run())
+        return latencies
+
+    workers = concurrency if mode == 'threaded' else 1
+    with bungie_api_python.BungieClientSync(max_workers=workers, **kwargs) as client:
+        client.gen_oauth_context('code')
+        with timer.patch(client):
+            client.map(lambda call: timed(call, latencies), call_mix(client, requests_per_run), workers=workers)
+    return latencies
+
+
+def run(mode: str, base_url: str, concurrency: int, requests_per_run: int) -> dict:
+    requests.delete(f'{base_url}/__standin/stats').raise_for_status()
+    timer = DecodeTimer()
+
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    latencies = drive(mode, base_url, concurrency, requests_per_run, timer)
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+    stats = requests.get(f'{base_url}/__standin/stats').json()
+    p = statistics.quantiles(latencies, n=100)
+    return {
+        'mode': mode,
+        'concurrency': concurrency,
+        'requests': stats['requests'],
+        'requests_per_sec': stats['requests'] / wall,
+        'p50_ms': p[49] * 1000,
+        'p95_ms': p[94] * 1000,
+        'p99_ms': p[98] * 1000,
+        'sockets': stats['connections'],
+        'wall_seconds': wall,
+        'cpu_seconds': cpu,
+        'decode_cpu_seconds': timer.seconds,
+        'http_cpu_seconds': cpu - timer.seconds,
+        # A client holding the GIL cannot wait on the network while it computes, so what is left of the wall time
+        # is time spent waiting.
+        'network_wait_seconds': max(wall - cpu, 0.0),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modes', default=','.join(MODES), help='The comma separated client setups to run.')
+    parser.add_argument('--concurrency', default='1,8,32', help='The comma separated numbers of calls in flight.')
+    parser.add_argument('--requests', type=int, default=500, help='The number of calls sent per run.')
+    parser.add_argument('--latency', default='uniform:0.02:0.01', help='The stand-in latency, see tests.standin.')
+    parser.add_argument('--port', type=int, default=8765, help='The port the stand-in listens on.')
+    parser.add_argument('--json', dest='output', help='Also write the results to this JSON file.')
+    args = parser.parse_args()
+
+    modes = args.modes.split(',')
+    for mode in modes:
+        if mode not in MODES:
+            parser.error(f'Unknown mode "{mode}", expected one of {", ".join(MODES)}.')
+    levels = [int(level) for level in args.concurrency.split(',')]
+
+    results = []
+    print(
+        f'{"Mode":<10}{"Conc.":>6}{"Req/s":>9}{"p50 (ms)":>10}{"p95 (ms)":>10}{"p99 (ms)":>10}'
+        f'{"Sockets":>9}{"Decode CPU":>12}{"HTTP CPU":>10}{"Net wait":>10}'
+    )
+    with standin(args.port, args.latency) as base_url:
+        for mode in modes:
+            # One call at a time does not depend on the concurrency, it is measured once.
+            for concurrency in ([1] if mode == 'sync' else levels):
+                r = run(mode, base_url, concurrency, args.requests)
+                results.append(r)
+                print(
+                    f'{mode:<10}{concurrency:>6}{r["requests_per_sec"]:>9.0f}'
+                    f'{r["p50_ms"]:>10.1f}{r["p95_ms"]:>10.1f}{r["p99_ms"]:>10.1f}{r["sockets"]:>9}'
+                    f'{r["decode_cpu_seconds"]:>11.2f}s{r["http_cpu_seconds"]:>9.2f}s{r["network_wait_seconds"]:>9.2f}s'
+                )
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'requests': args.requests,
+                'latency': args.latency,
+                'python': sys.version.split()[0],
+                'results': results,
+            }, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
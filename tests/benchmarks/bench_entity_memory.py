@@ -0,0 +1,81 @@
+"""Measures the memory held by entity instances, with and without slots.
+
+    python -m tests.benchmarks.bench_entity_memory [--count 100000]
+
+Every entity is compared with an otherwise identical dataclass without slots, first by the shallow size
+of a single instance, then by the memory allocated to hold ``count`` decoded instances, as a cache would.
+"""
+import argparse
+import dataclasses
+import json
+import sys
+import tracemalloc
+
+from bungie_api_python.entities.applications import Application, Datapoint
+from bungie_api_python.entities.decoder import ModelDecoder
+from bungie_api_python.entities.groupsv2 import GroupUserInfoCard
+from bungie_api_python.entities.user import GeneralUser, UserInfoCard
+from tests.fixtures import payloads
+
+
+def without_slots(model: type) -> type:
+    """An otherwise identical copy of an entity class, whose instances carry a ``__dict__``."""
+    return dataclasses.make_dataclass(
+        model.__name__,
+        [
+            (f.name, f.type, dataclasses.field(default=f.default, default_factory=f.default_factory, metadata=f.metadata))
+            for f in dataclasses.fields(model)
+        ],
+        kw_only=True,
+    )
+
+
+def shallow_size(instance: object) -> int:
+    size = sys.getsizeof(instance)
+    if hasattr(instance, '__dict__'):
+        size += sys.getsizeof(instance.__dict__)
+    return size
+
+
+def allocated(model: type, data: dict, count: int) -> float:
+    """The memory (in bytes) allocated per instance when decoding ``count`` instances."""
+    decoder = ModelDecoder.decoder(model)
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    instances = [decoder(data) for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del instances
+    return size / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100_000, help='The number of instances to decode per entity.')
+    args = parser.parse_args()
+
+    membership = json.loads(payloads.GET_MEMBERSHIP_DATA_BY_ID)['Response']
+    search_result = json.loads(payloads.SEARCH_BY_GLOBAL_NAME_POST)['Response']['searchResults'][0]
+    entities = [
+        (GeneralUser, membership['bungieNetUser']),
+        (GroupUserInfoCard, membership['destinyMemberships'][0]),
+        (UserInfoCard, search_result['destinyMemberships'][0]),
+        (Application, {**json.loads(payloads.GET_BUNGIE_APPLICATIONS)['Response'][0], 'team': []}),
+        (Datapoint, {'time': '2023-01-01T00:00:00Z', 'count': 1}),
+    ]
+
+    print(f'{"Entity":<20}{"Shallow (B)":>14}{"Slots (B)":>12}{"Held (B)":>12}{"Slots (B)":>12}{"Ratio":>8}')
+    for model, data in entities:
+        plain = without_slots(model)
+        shallow = shallow_size(ModelDecoder.decode(plain, data))
+        shallow_slots = shallow_size(ModelDecoder.decode(model, data))
+        held = allocated(plain, data, args.count)
+        held_slots = allocated(model, data, args.count)
+        print(
+            f'{model.__name__:<20}{shallow:>14}{shallow_slots:>12}{held:>12.0f}{held_slots:>12.0f}'
+            f'{held / held_slots:>7.2f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
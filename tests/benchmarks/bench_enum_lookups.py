@@ -0,0 +1,49 @@
+"""Compares enum member lookups through the enum itself with the precomputed enum tables.
+
+    python -m tests.benchmarks.bench_enum_lookups [--number 200000]
+
+Values and names are looked up for ``PlatformErrorCodes``, by far the largest enum, and for ``BungieCredentialType``,
+whose names endpoints accept as arguments.
+"""
+import argparse
+import timeit
+
+from bungie_api_python.entities.core import BungieCredentialType
+from bungie_api_python.entities.exceptions import PlatformErrorCodes
+from bungie_api_python.entities.model_utils import EnumTable
+
+
+def scan(enum, name: str):
+    """The name lookup endpoints used before, a scan over every member."""
+    for member in enum:
+        if member.name == name:
+            return member
+
+
+def best_of(fn, number: int, repeat: int = 5) -> float:
+    """The fastest time per call (in nanoseconds) over ``repeat`` runs of ``number`` calls."""
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=200_000, help='The number of lookups per timing run.')
+    args = parser.parse_args()
+
+    print(f'{"Lookup":<40}{"Enum (ns)":>12}{"Table (ns)":>12}{"Speedup":>10}')
+    for member in (PlatformErrorCodes.Success, BungieCredentialType.TwitchId):
+        enum = type(member)
+        table = EnumTable.of(enum)
+        value, name = member.value, member.name
+        cases = [
+            (f'{enum.__name__} by value', lambda: enum(value), lambda: table.from_value(value)),
+            (f'{enum.__name__} by name', lambda: scan(enum, name), lambda: table.from_name(name)),
+        ]
+        for label, baseline, lookup in cases:
+            before = best_of(baseline, args.number)
+            after = best_of(lookup, args.number)
+            print(f'{label:<40}{before:>12.0f}{after:>12.0f}{before / after:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
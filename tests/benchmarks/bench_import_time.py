@@ -0,0 +1,75 @@
+"""Measures the time it takes to import the package, using ``python -X importtime``.
+
+    python -m tests.benchmarks.bench_import_time [--runs 7] [--scale 1.0]
+
+Every statement is run in a fresh interpreter ``runs`` times, and the median time spent importing the modules it
+loads is reported along with the heavy dependencies it pulled in. The process exits with an error when a median
+exceeds its threshold, multiplied by ``scale`` for slower machines, so it can guard against regressions in CI.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+
+# The statements timed, with their thresholds in milliseconds.
+STATEMENTS = [
+    ('import bungie_api_python', 5),
+    ('from bungie_api_python import BungieClientSync', 150),
+    ('from bungie_api_python import BungieClientAsync', 200),
+]
+HEAVY = ('requests', 'aiohttp', 'asyncio', 'dataclasses_json', 'marshmallow', 'bungie_api_python.entities.exceptions')
+
+
+def import_time(statement: str) -> tuple[float, set[str]]:
+    """The time (in milliseconds) spent importing the modules loaded by a statement, and the modules loaded."""
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+
+    total = 0
+    modules = set()
+    after_site = False
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if after_site:
+            modules.add(name.strip())
+            # Only top level imports are summed, their cumulative time includes the modules they import.
+            if not name.startswith('  '):
+                total += int(cumulative)
+        elif name.strip() == 'site':
+            after_site = True
+    return total / 1000, modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=7, help='The number of interpreters started per statement.')
+    parser.add_argument('--scale', type=float, default=1.0, help='A multiplier applied to every threshold.')
+    args = parser.parse_args()
+
+    failed = False
+    print(f'{"Statement":<52}{"Median (ms)":>12}{"Limit (ms)":>12}  Heavy modules')
+    for statement, threshold in STATEMENTS:
+        timings = []
+        modules = set()
+        for _ in range(args.runs):
+            timing, modules = import_time(statement)
+            timings.append(timing)
+        median = statistics.median(timings)
+        limit = threshold * args.scale
+        heavy = ', '.join(name for name in HEAVY if name in modules) or '-'
+        failed |= median > limit
+        print(f'{statement:<52}{median:>12.1f}{limit:>12.0f}  {heavy}{"  (too slow)" if median > limit else ""}')
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
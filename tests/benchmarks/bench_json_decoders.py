@@ -0,0 +1,51 @@
+"""Compares the installed JSON decoder backends on realistic response bodies.
+
+    python -m tests.benchmarks.bench_json_decoders [--number 2000]
+
+Each backend is timed on parsing alone, then on parsing followed by decoding into the response model,
+which shows how much of a request's decoding time the JSON backend accounts for.
+"""
+import argparse
+import timeit
+
+from bungie_api_python.entities.responses import GetBungieNetUserById
+from bungie_api_python.entities.responses.app import GetApplicationApiUsage
+from bungie_api_python.utils import JSONDecoder
+from tests.fixtures.payloads import GET_BUNGIE_NET_USER_BY_ID, GET_APPLICATION_API_USAGE
+
+
+PAYLOADS = [
+    ('GetBungieNetUserById', GetBungieNetUserById, GET_BUNGIE_NET_USER_BY_ID),
+    ('GetApplicationApiUsage', GetApplicationApiUsage, GET_APPLICATION_API_USAGE),
+]
+
+
+def best_of(fn, number: int, repeat: int = 5) -> float:
+    """The fastest time per call (in microseconds) over ``repeat`` runs of ``number`` calls."""
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=2000, help='The number of calls per timing run.')
+    args = parser.parse_args()
+
+    backends = JSONDecoder.available()
+    print(f'Installed backends: {", ".join(backends)}\n')
+    print(f'{"Payload":<24}{"Backend":<10}{"Parse (us)":>12}{"Speedup":>10}{"+ Model (us)":>14}')
+
+    for name, response_type, payload in PAYLOADS:
+        # Model decoding is slow for the large payload, so it is timed with fewer calls.
+        number = args.number if len(payload) < 10_000 else max(args.number // 20, 1)
+        baseline = None
+        for backend in reversed(backends):
+            loads = JSONDecoder(backend).loads
+            parse = best_of(lambda: loads(payload), number)
+            model = best_of(lambda: response_type.from_dict(loads(payload)), max(number // 10, 1))
+            baseline = baseline or parse
+            print(f'{name:<24}{backend:<10}{parse:>12.1f}{baseline / parse:>9.2f}x{model:>14.1f}')
+        print()
+
+
+if __name__ == '__main__':
+    main()
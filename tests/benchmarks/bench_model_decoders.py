@@ -0,0 +1,49 @@
+"""Compares dataclasses_json's from_dict with the compiled model decoders.
+
+    python -m tests.benchmarks.bench_model_decoders [--number 500]
+
+Bodies are parsed once up front, so only model construction is timed.
+"""
+import argparse
+import json
+import timeit
+
+from bungie_api_python.entities.decoder import ModelDecoder
+from bungie_api_python.entities.responses import GetBungieNetUserById, GetApplicationApiUsage, \
+    GetBungieApplications, GetMembershipDataById, SearchByGlobalNamePost
+from tests.fixtures import payloads
+
+
+PAYLOADS = [
+    (GetBungieNetUserById, payloads.GET_BUNGIE_NET_USER_BY_ID),
+    (GetMembershipDataById, payloads.GET_MEMBERSHIP_DATA_BY_ID),
+    (GetBungieApplications, payloads.GET_BUNGIE_APPLICATIONS),
+    (SearchByGlobalNamePost, payloads.SEARCH_BY_GLOBAL_NAME_POST),
+    (GetApplicationApiUsage, payloads.GET_APPLICATION_API_USAGE),
+]
+
+
+def best_of(fn, number: int, repeat: int = 5) -> float:
+    """The fastest time per call (in microseconds) over ``repeat`` runs of ``number`` calls."""
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=500, help='The number of calls per timing run.')
+    args = parser.parse_args()
+
+    print(f'{"Response":<34}{"from_dict (us)":>16}{"compiled (us)":>16}{"Speedup":>10}')
+    for model, body in PAYLOADS:
+        data = json.loads(body)
+        # The API usage payload holds thousands of objects, so it is timed with fewer calls.
+        number = args.number if len(body) < 10_000 else max(args.number // 50, 1)
+
+        ModelDecoder.decoder(model)
+        baseline = best_of(lambda: model.from_dict(data), number)
+        compiled = best_of(lambda: ModelDecoder.decode(model, data), number)
+        print(f'{model.__name__:<34}{baseline:>16.1f}{compiled:>16.1f}{baseline / compiled:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
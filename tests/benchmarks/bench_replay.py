@@ -0,0 +1,161 @@
+"""Replays recorded traffic through a client, measuring its CPU time, memory and latency without the network.
+
+    python -m tests.benchmarks.bench_replay traffic.cassette [--client async] [--concurrency 8] [--json out.json]
+    python -m tests.benchmarks.bench_replay traffic.cassette --record 500
+
+Every exchange in the cassette is sent again, in the order it was recorded, through ``client.get`` or ``client.post``
+with the model it was originally decoded into, so traffic captured from production can be compared across client
+versions. ``--record`` first records a cassette of that many calls from the local stand-in server (``tests/standin``).
+
+Each run reports the client's CPU time, its peak traced memory and the p50, p95 and p99 latency of a call, with
+replayed responses either returned at once or delayed by their recorded latencies (``--latency``).
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+from urllib.parse import parse_qsl
+
+import bungie_api_python
+from bungie_api_python.entities.core.enums import OAuthClientType
+from bungie_api_python.transport import Cassette, Exchange
+from tests.benchmarks.bench_end_to_end import call_mix
+from tests.standin import StandInServer, Latency
+
+
+def record(path: str, count: int) -> None:
+    """Records ``count`` calls of the end-to-end benchmark's call mix from the stand-in server."""
+    with StandInServer(latency=Latency(distribution='uniform', mean=0.02, spread=0.01)) as server, \
+            Cassette(path, mode='record') as cassette:
+        with bungie_api_python.BungieClientSync(
+            api_key='bench',
+            client_id=1,
+            client_secret='secret',
+            client_type=OAuthClientType.Confidential,
+            base_url=server.base_url,
+            cassette=cassette,
+        ) as client:
+            client.gen_oauth_context('code')
+            for call in call_mix(client, count):
+                call()
+
+
+def resolve(name: str) -> type:
+    module, _, qualname = name.rpartition('.')
+    return getattr(importlib.import_module(module), qualname)
+
+
+def arguments(client, exchange: Exchange) -> tuple[Callable, dict[str, Any]]:
+    """The client method and keyword arguments that send an exchange's request again."""
+    kwargs = {'url': client.base_url + exchange.url, 'response_type': resolve(exchange.response_type)}
+    if exchange.params:
+        kwargs['params'] = dict(parse_qsl(exchange.params))
+    if exchange.body:
+        try:
+            kwargs['json'] = json.loads(exchange.body)
+        except ValueError:
+            kwargs['data'] = dict(parse_qsl(exchange.body))
+    return (client.get if exchange.method == 'GET' else client.post), kwargs
+
+
+def replay_sync(cassette: Cassette, concurrency: int, latencies: list[float]) -> None:
+    with bungie_api_python.BungieClientSync(api_key='bench', cassette=cassette, max_workers=concurrency) as client:
+        def send(exchange: Exchange) -> None:
+            method, kwargs = arguments(client, exchange)
+            start = time.perf_counter()
+            method(**kwargs)
+            latencies.append(time.perf_counter() - start)
+
+        client.map(send, cassette.exchanges, workers=concurrency)
+
+
+def replay_async(cassette: Cassette, concurrency: int, latencies: list[float]) -> None:
+    async def run() -> None:
+        async with bungie_api_python.BungieClientAsync(api_key='bench', cassette=cassette) as client:
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def send(exchange: Exchange) -> None:
+                method, kwargs = arguments(client, exchange)
+                async with semaphore:
+                    start = time.perf_counter()
+                    await method(**kwargs)
+                    latencies.append(time.perf_counter() - start)
+
+            await asyncio.gather(*(send(exchange) for exchange in cassette.exchanges))
+
+    asyncio.run(run())
+
+
+def run(cassette: Cassette, client: str, concurrency: int) -> dict:
+    cassette.rewind()
+    latencies = []
+    replay = replay_async if client == 'async' else replay_sync
+
+    tracemalloc.start()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        replay(cassette, concurrency, latencies)
+        wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    p = statistics.quantiles(latencies, n=100)
+    return {
+        'calls': len(latencies),
+        'wall_seconds': wall,
+        'cpu_seconds': cpu,
+        'cpu_us_per_call': cpu * 1e6 / len(latencies),
+        'peak_bytes': peak,
+        'p50_ms': p[49] * 1000,
+        'p95_ms': p[94] * 1000,
+        'p99_ms': p[98] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('cassette', help='The cassette to replay.')
+    parser.add_argument('--record', type=int, help='First record this many calls from the stand-in server.')
+    parser.add_argument('--client', choices=('sync', 'async'), default='sync', help='The client replayed through.')
+    parser.add_argument('--concurrency', type=int, default=1, help='The number of calls in flight at once.')
+    parser.add_argument('--latency', action='store_true', help='Delay responses by their recorded latencies.')
+    parser.add_argument('--runs', type=int, default=3, help='The number of times the cassette is replayed.')
+    parser.add_argument('--json', dest='output', help='Also write the results to this JSON file.')
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.cassette, args.record)
+    cassette = Cassette(args.cassette, replay_latency=args.latency)
+
+    results = []
+    print(f'{"Run":<5}{"Calls":>7}{"Wall (s)":>10}{"CPU (s)":>9}{"CPU/call (us)":>15}'
+          f'{"Peak KiB":>10}{"p50 (ms)":>10}{"p95 (ms)":>10}{"p99 (ms)":>10}')
+    for index in range(args.runs):
+        r = run(cassette, args.client, args.concurrency)
+        results.append(r)
+        print(
+            f'{index + 1:<5}{r["calls"]:>7}{r["wall_seconds"]:>10.2f}{r["cpu_seconds"]:>9.2f}'
+            f'{r["cpu_us_per_call"]:>15.0f}{r["peak_bytes"] / 1024:>10.0f}'
+            f'{r["p50_ms"]:>10.2f}{r["p95_ms"]:>10.2f}{r["p99_ms"]:>10.2f}'
+        )
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'cassette': args.cassette,
+                'client': args.client,
+                'concurrency': args.concurrency,
+                'latency': args.latency,
+                'python': sys.version.split()[0],
+                'results': results,
+            }, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+"""Realistic response bodies, shaped like those returned by the Bungie.net API, for offline tests and benchmarks."""
+import json
+from datetime import datetime, timedelta, timezone
+
+
+def envelope(response) -> dict:
+    return {
+        'Response': response,
+        'ErrorCode': 1,
+        'ThrottleSeconds': 0,
+        'ErrorStatus': 'Success',
+        'Message': 'Ok',
+        'MessageData': {},
+    }
+
+
+def general_user(membership_id: int = 19548659) -> dict:
+    return {
+        'membershipId': str(membership_id),
+        'uniqueName': f'Guardian#{membership_id % 10000:04d}',
+        'normalizedName': f'guardian#{membership_id % 10000:04d}',
+        'displayName': 'Guardian',
+        'profilePicture': 70498,
+        'profileTheme': 1129,
+        'userTitle': 0,
+        'successMessageFlags': '8',
+        'isDeleted': False,
+        'about': 'Eyes up, Guardian.',
+        'firstAccess': '2015-03-09T02:54:40.437Z',
+        'lastUpdate': '2023-01-02T18:20:11.89Z',
+        'context': {'isFollowing': False, 'ignoreStatus': {'isIgnored': False, 'ignoreFlags': 0}},
+        'psnDisplayName': 'Guardian-PSN',
+        'xboxDisplayName': 'Guardian XBL',
+        'showActivity': True,
+        'locale': 'en',
+        'localeInheritDefault': True,
+        'showGroupMessaging': True,
+        'profilePicturePath': '/img/profile/avatars/bungieday_26.jpg',
+        'profileThemeName': 'd2_23',
+        'userTitleDisplay': 'Newbie',
+        'statusText': '',
+        'statusDate': '0001-01-01T00:00:00Z',
+        'steamDisplayName': 'Guardian',
+        'cachedBungieGlobalDisplayName': 'Guardian',
+        'cachedBungieGlobalDisplayNameCode': membership_id % 10000,
+    }
+
+
+def destiny_membership(membership_id: int, membership_type: int = 3) -> dict:
+    return {
+        'LastSeenDisplayName': 'Guardian',
+        'LastSeenDisplayNameType': membership_type,
+        'iconPath': '/img/theme/bungienet/icons/steamLogo.png',
+        'crossSaveOverride': 3,
+        'applicableMembershipTypes': [3, 2],
+        'isPublic': True,
+        'membershipType': membership_type,
+        'membershipId': str(membership_id),
+        'displayName': 'Guardian',
+        'bungieGlobalDisplayName': 'Guardian',
+        'bungieGlobalDisplayNameCode': 1234,
+    }
+
+
+def membership_data(membership_id: int = 19548659, memberships: int = 3) -> dict:
+    return {
+        'destinyMemberships': [destiny_membership(4611686018483530949 + i, 3 - i % 3) for i in range(memberships)],
+        'primaryMembershipId': '4611686018483530949',
+        'bungieNetUser': general_user(membership_id),
+    }
+
+
+def search_response(page: int = 0, size: int = 50, prefix: str = 'Guardian', has_more: bool = True) -> dict:
+    return {
+        'searchResults': [
+            {
+                'bungieGlobalDisplayName': f'{prefix}{i}',
+                'bungieGlobalDisplayNameCode': i,
+                'bungieNetMembershipId': str(19548659 + i),
+                'destinyMemberships': [
+                    {
+                        'iconPath': '/img/theme/bungienet/icons/steamLogo.png',
+                        'crossSaveOverride': 0,
+                        'applicableMembershipTypes': [3],
+                        'isPublic': False,
+                        'membershipType': 3,
+                        'membershipId': str(4611686018483530949 + i),
+                        'displayName': f'{prefix}{i}',
+                        'bungieGlobalDisplayName': f'{prefix}{i}',
+                        'bungieGlobalDisplayNameCode': i,
+                    },
+                ],
+            }
+            for i in range(size)
+        ],
+        'page': page,
+        'hasMore': has_more,
+    }
+
+
+def application(application_id: int = 46374) -> dict:
+    return {
+        'applicationId': application_id,
+        'name': 'Guardian Tools',
+        'redirectUrl': 'https://example.com/oauth',
+        'link': 'https://example.com',
+        'scope': '16433',
+        'origin': 'https://example.com',
+        'status': 2,
+        'creationDate': '2022-11-20T03:14:02.53Z',
+        'firstPublished': '2022-11-20T03:40:19.173Z',
+        'team': [
+            {
+                'role': 1,
+                'apiEulaVersion': 3,
+                'user': {
+                    'supplementalDisplayName': '19548659',
+                    'iconPath': '/img/profile/avatars/bungieday_26.jpg',
+                    'crossSaveOverride': 0,
+                    'isPublic': False,
+                    'membershipType': 254,
+                    'membershipId': '19548659',
+                    'displayName': 'Guardian',
+                    'bungieGlobalDisplayName': 'Guardian',
+                    'bungieGlobalDisplayNameCode': 1234,
+                },
+            },
+        ],
+    }
+
+
+def credential_types() -> list[dict]:
+    return [
+        {'credentialType': 12, 'credentialDisplayName': 'Guardian', 'isPublic': True,
+         'credentialAsString': '76561198119241330'},
+        {'credentialType': 2, 'credentialDisplayName': 'Guardian-PSN', 'isPublic': False},
+        {'credentialType': 14, 'credentialDisplayName': 'Guardian#1234', 'isPublic': True,
+         'credentialAsString': 'Guardian#1234'},
+    ]
+
+
+def themes(count: int = 20) -> list[dict]:
+    return [
+        {'userThemeId': 1000 + i, 'userThemeName': f'd2_{i:02d}', 'userThemeDescription': f'Destiny 2 Theme {i}'}
+        for i in range(count)
+    ]
+
+
+def hard_linked_membership() -> dict:
+    return {
+        'membershipType': 3,
+        'membershipId': '4611686018483530949',
+        'CrossSaveOverriddenType': 3,
+        'CrossSaveOverridenMembershipId': '4611686018483530949',
+    }
+
+
+def api_usage(hours: int = 24 * 30) -> dict:
+    """Hourly API usage over ``hours`` hours, as returned for a busy application."""
+    start = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+    def series(target: str, scale: int) -> dict:
+        return {
+            'datapoints': [
+                {
+                    'time': (start + timedelta(hours=hour)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                    'count': (hour * 7919 % 101) * scale,
+                }
+                for hour in range(hours)
+            ],
+            'target': target,
+        }
+
+    return {
+        'apiCalls': [series('Total', 40), series('Authorized', 12)],
+        'throttledRequests': [series('Total', 1)],
+    }
+
+
+GET_BUNGIE_NET_USER_BY_ID = json.dumps(envelope(general_user())).encode()
+GET_APPLICATION_API_USAGE = json.dumps(envelope(api_usage())).encode()
+GET_MEMBERSHIP_DATA_BY_ID = json.dumps(envelope(membership_data())).encode()
+SEARCH_BY_GLOBAL_NAME_POST = json.dumps(envelope(search_response())).encode()
+GET_BUNGIE_APPLICATIONS = json.dumps(envelope([application(), application(46375)])).encode()
+GET_SANITIZED_PLATFORM_DISPLAY_NAMES = json.dumps(envelope({'SteamId': 'Guardian', 'BattleNetId': 'Guardian#1234'})).encode()
+GET_CREDENTIAL_TYPES_FOR_TARGET_ACCOUNT = json.dumps(envelope(credential_types())).encode()
+GET_AVAILABLE_THEMES = json.dumps(envelope(themes())).encode()
+GET_MEMBERSHIP_FROM_HARD_LINKED_CREDENTIAL = json.dumps(envelope(hard_linked_membership())).encode()
@@ -0,0 +1,43 @@
+"""Response bodies for every response type, at the sizes the API returns them, for offline benchmarks."""
+import json
+from typing import NamedTuple
+
+from bungie_api_python.entities.responses import GetApplicationApiUsage, GetBungieApplications, \
+    GetBungieNetUserById, GetSanitizedPlatformDisplayNames, GetCredentialTypesForTargetAccount, GetAvailableThemes, \
+    GetMembershipDataById, GetMembershipDataForCurrentUser, GetMembershipFromHardLinkedCredential, \
+    SearchByGlobalNamePost
+from . import payloads
+
+
+class ResponseCase(NamedTuple):
+    response_type: type
+    size: str
+    body: bytes
+
+    @property
+    def name(self) -> str:
+        return f'{self.response_type.__name__}[{self.size}]'
+
+
+def body(response) -> bytes:
+    return json.dumps(payloads.envelope(response)).encode()
+
+
+CASES = [
+    ResponseCase(GetBungieNetUserById, '1', payloads.GET_BUNGIE_NET_USER_BY_ID),
+    ResponseCase(GetSanitizedPlatformDisplayNames, '2', payloads.GET_SANITIZED_PLATFORM_DISPLAY_NAMES),
+    ResponseCase(GetCredentialTypesForTargetAccount, '3', payloads.GET_CREDENTIAL_TYPES_FOR_TARGET_ACCOUNT),
+    ResponseCase(GetAvailableThemes, '20', payloads.GET_AVAILABLE_THEMES),
+    ResponseCase(GetAvailableThemes, '500', body(payloads.themes(500))),
+    ResponseCase(GetMembershipDataById, '3', payloads.GET_MEMBERSHIP_DATA_BY_ID),
+    ResponseCase(GetMembershipDataForCurrentUser, '12', body(payloads.membership_data(memberships=12))),
+    ResponseCase(GetMembershipFromHardLinkedCredential, '1', payloads.GET_MEMBERSHIP_FROM_HARD_LINKED_CREDENTIAL),
+    ResponseCase(SearchByGlobalNamePost, '10', body(payloads.search_response(size=10))),
+    ResponseCase(SearchByGlobalNamePost, '50', payloads.SEARCH_BY_GLOBAL_NAME_POST),
+    ResponseCase(SearchByGlobalNamePost, '500', body(payloads.search_response(size=500))),
+    ResponseCase(GetBungieApplications, '2', payloads.GET_BUNGIE_APPLICATIONS),
+    ResponseCase(GetBungieApplications, '50', body([payloads.application(46374 + i) for i in range(50)])),
+    ResponseCase(GetApplicationApiUsage, '24h', body(payloads.api_usage(hours=24))),
+    ResponseCase(GetApplicationApiUsage, '30d', payloads.GET_APPLICATION_API_USAGE),
+    ResponseCase(GetApplicationApiUsage, '90d', body(payloads.api_usage(hours=24 * 90))),
+]
@@ -0,0 +1,9 @@
+"""A local stand-in for the Bungie.net API, see ``tests/standin/server.py``."""
+from .server import StandInServer, Latency, Faults, ServerStats
+
+__all__ = [
+    'Faults',
+    'Latency',
+    'ServerStats',
+    'StandInServer',
+]
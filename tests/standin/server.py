@@ -0,0 +1,478 @@
+"""A local stand-in for the Bungie.net API, for offline end-to-end, load and throughput tests.
+
+    python -m tests.standin [--port 8080] [--latency lognormal:0.05:0.5] [--throttle 0.01] [--rate-limit 25]
+
+It serves the routes used by the ``app``, ``user`` and ``oauth`` endpoint groups with generated payloads, shaped
+like those in ``tests/fixtures/payloads.py``. Point a client at it with ``base_url``::
+
+    with StandInServer(latency=Latency(distribution='uniform', mean=0.02, spread=0.01)) as server:
+        client = BungieClientSync(api_key='test', base_url=server.base_url)
+
+Every response can be delayed by a latency distribution, and faults can be injected at random: throttles,
+maintenance (``SystemDisabled``), server errors and timeouts. Throttles are honest, an endpoint keeps throttling
+a key for the ``ThrottleSeconds`` it announced, and an optional per endpoint rate limit throttles keys exceeding it.
+
+When it runs in another process, ``GET /__standin/stats`` returns its stats and ``DELETE /__standin/stats`` resets
+them.
+"""
+import argparse
+import asyncio
+import dataclasses
+import json
+import math
+import random
+import re
+import secrets
+import socket
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+from aiohttp import web
+
+from tests.fixtures import payloads
+
+
+Handler = Callable[[web.Request], Awaitable[web.Response]]
+
+# Platform error codes, as returned in response envelopes.
+SUCCESS = (1, 'Success')
+UNHANDLED_EXCEPTION = (3, 'UnhandledException')
+SYSTEM_DISABLED = (5, 'SystemDisabled')
+PARAMETER_PARSE_FAILURE = (7, 'ParameterParseFailure')
+PER_ENDPOINT_REQUEST_THROTTLE_EXCEEDED = (51, 'PerEndpointRequestThrottleExceeded')
+WEB_AUTH_REQUIRED = (99, 'WebAuthRequired')
+API_INVALID_OR_EXPIRED_KEY = (2101, 'ApiInvalidOrExpiredKey')
+API_KEY_MISSING_FROM_REQUEST = (2102, 'ApiKeyMissingFromRequest')
+
+
+@dataclass(kw_only=True)
+class Latency:
+    """The delay added before every response.
+
+    :param distribution: ``constant``, ``uniform`` (``mean`` plus or minus ``spread``), ``exponential`` or
+        ``lognormal`` (with a median of ``mean`` and a shape of ``spread``).
+    :param mean: The typical delay, in seconds.
+    :param spread: How far delays stray from ``mean``, depending on the distribution.
+    """
+    distribution: str = field(default='constant')
+    mean: float = field(default=0.0)
+    spread: float = field(default=0.0)
+
+    DISTRIBUTIONS = ('constant', 'uniform', 'exponential', 'lognormal')
+
+    def __post_init__(self) -> None:
+        if self.distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f'Unknown latency distribution "{self.distribution}".')
+
+    @classmethod
+    def parse(cls, value: str) -> 'Latency':
+        """Parses ``distribution[:mean[:spread]]``, such as ``uniform:0.05:0.02``."""
+        distribution, *numbers = value.split(':')
+        return cls(distribution=distribution, **dict(zip(('mean', 'spread'), map(float, numbers))))
+
+    def sample(self, rng: random.Random) -> float:
+        if self.mean <= 0:
+            return 0.0
+        if self.distribution == 'uniform':
+            return max(rng.uniform(self.mean - self.spread, self.mean + self.spread), 0.0)
+        if self.distribution == 'exponential':
+            return rng.expovariate(1 / self.mean)
+        if self.distribution == 'lognormal':
+            return rng.lognormvariate(math.log(self.mean), self.spread)
+        return self.mean
+
+
+@dataclass(kw_only=True)
+class Faults:
+    """The probability of each injected fault, per request.
+
+    :param throttle: Responds with ``PerEndpointRequestThrottleExceeded``, throttling the endpoint for
+        ``throttle_seconds``.
+    :param maintenance: Responds with ``SystemDisabled`` and HTTP 503, as Bungie does during maintenance.
+    :param server_error: Responds with ``UnhandledException`` and HTTP 500.
+    :param timeout: Holds the request for ``timeout_seconds``, then drops the connection without a response.
+    """
+    throttle: float = field(default=0.0)
+    maintenance: float = field(default=0.0)
+    server_error: float = field(default=0.0)
+    timeout: float = field(default=0.0)
+    throttle_seconds: int = field(default=1)
+    timeout_seconds: float = field(default=30.0)
+
+
+@dataclass(kw_only=True)
+class ServerStats:
+    requests: int = field(default=0)
+    connections: int = field(default=0)
+    # The number of responses per route, and per ``ErrorStatus``.
+    routes: dict[str, int] = field(default_factory=dict)
+    statuses: dict[str, int] = field(default_factory=dict)
+    timeouts: int = field(default=0)
+
+
+class StandInServer:
+    """Serves the stand-in API from a background thread, or from ``run`` in the foreground."""
+
+    def __init__(
+            self,
+            host: str = '127.0.0.1',
+            port: int = 0,
+            latency: Optional[Latency] = None,
+            faults: Optional[Faults] = None,
+            rate_limit: Optional[float] = None,
+            api_key: Optional[str] = None,
+            search_pages: int = 5,
+            search_page_size: int = 50,
+            seed: Optional[int] = None,
+    ) -> None:
+        """
+        :param port: The port to listen on, 0 picks a free port.
+        :param latency: The delay added before every response, defaults to none.
+        :param faults: The faults injected at random, defaults to none.
+        :param rate_limit: The requests per second each API key may send to each endpoint before being throttled.
+        :param api_key: The only API key accepted, or None to accept any key.
+        :param search_pages: The number of pages of global name search results.
+        :param search_page_size: The number of results per page of global name search results.
+        :param seed: Seeds the latency and fault sampling, for reproducible runs.
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency or Latency()
+        self.faults = faults or Faults()
+        self.rate_limit = rate_limit
+        self.api_key = api_key
+        self.search_pages = search_pages
+        self.search_page_size = search_page_size
+        self.stats = ServerStats()
+
+        self._rng = random.Random(seed)
+        # When each (API key, endpoint) throttle ends, and the time at which each rate limit bucket is next free.
+        self._throttled_until: dict[tuple[str, str], float] = {}
+        self._next_free: dict[tuple[str, str], float] = {}
+        self._tokens: dict[str, dict] = {}
+        self._transports = weakref.WeakSet()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f'http://{self.host}:{self.port}'
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        app.add_routes([
+            web.get('/__standin/stats', self.get_stats),
+            web.delete('/__standin/stats', self.reset_stats),
+            web.get('/Platform/App/ApiUsage/{application_id}', self._oauth(self.api_usage)),
+            web.get('/Platform/App/FirstParty', self.applications),
+            web.post('/Platform/App/OAuth/Token', self.token),
+            web.post('/Platform/App/OAuth/Token/', self.token),
+            web.get('/Platform/User/GetBungieNetUserById/{id}/', self.bungie_net_user),
+            web.get('/Platform/User/GetSanitizedPlatformDisplayNames/{id}/', self.sanitized_display_names),
+            web.get('/Platform/User/GetCredentialTypesForTargetAccount/{id}', self._oauth(self.credential_types)),
+            web.get('/Platform/User/GetAvailableThemes/', self.themes),
+            web.get('/Platform/User/GetMembershipsById/{id}/{type}/', self.membership_data),
+            web.get('/Platform/User/GetMembershipsForCurrentUser/', self._oauth(self.current_user_membership_data)),
+            web.get(
+                '/Platform/User/GetMembershipFromHardLinkedCredential/{type}/{credential}/',
+                self.hard_linked_membership,
+            ),
+            web.post('/Platform/User/Search/GlobalName/{page}/', self.search),
+        ])
+        return app
+
+    # --- Running ------------------------------------------------------------------------------------------------------
+    def start(self) -> 'StandInServer':
+        """Starts serving from a background thread, returning once the server accepts connections."""
+        started = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+        def serve() -> None:
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self._start())
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=serve, name='bungie-standin', daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop(self) -> None:
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = self._runner = self._thread = None
+
+    def run(self) -> None:
+        """Serves in the foreground until interrupted."""
+        async def serve() -> None:
+            await self._start()
+            print(f'Serving the Bungie API stand-in on {self.base_url}')
+            await asyncio.Event().wait()
+
+        try:
+            asyncio.run(serve())
+        except KeyboardInterrupt:
+            pass
+
+    def __enter__(self) -> 'StandInServer':
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    async def _start(self) -> None:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        self.port = sock.getsockname()[1]
+
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        await web.SockSite(self._runner, sock, backlog=1024).start()
+
+    # --- Envelopes ----------------------------------------------------------------------------------------------------
+    @staticmethod
+    def envelope(response, status: int = 200) -> web.Response:
+        return web.json_response(payloads.envelope(response), status=status)
+
+    @staticmethod
+    def error(code: tuple[int, str], message: str, status: int = 200, throttle_seconds: int = 0) -> web.Response:
+        error_code, error_status = code
+        return web.json_response({
+            'Response': None,
+            'ErrorCode': error_code,
+            'ThrottleSeconds': throttle_seconds,
+            'ErrorStatus': error_status,
+            'Message': message,
+            'MessageData': {},
+        }, status=status)
+
+    # --- Middleware ---------------------------------------------------------------------------------------------------
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler: Handler) -> web.StreamResponse:
+        if request.path.startswith('/__standin/'):
+            return await handler(request)
+        self.stats.requests += 1
+        if request.transport is not None and request.transport not in self._transports:
+            self._transports.add(request.transport)
+            self.stats.connections += 1
+
+        response = await self._respond(request, handler)
+        route = request.match_info.route.resource.canonical if request.match_info.route.resource else request.path
+        self.stats.routes[route] = self.stats.routes.get(route, 0) + 1
+        status = self._error_status(response)
+        self.stats.statuses[status] = self.stats.statuses.get(status, 0) + 1
+        return response
+
+    async def _respond(self, request: web.Request, handler: Handler) -> web.StreamResponse:
+        delay = self.latency.sample(self._rng)
+        if delay:
+            await asyncio.sleep(delay)
+
+        api_key = request.headers.get('X-API-Key')
+        if not api_key:
+            return self.error(API_KEY_MISSING_FROM_REQUEST, 'Please provide an API key in the X-API-Key header.')
+        if self.api_key is not None and api_key != self.api_key:
+            return self.error(API_INVALID_OR_EXPIRED_KEY, 'Your API key is invalid or has expired.', status=401)
+
+        fault = self._fault()
+        if fault == 'timeout':
+            self.stats.timeouts += 1
+            await asyncio.sleep(self.faults.timeout_seconds)
+            request.transport.close()
+            raise asyncio.CancelledError()
+        if fault == 'maintenance':
+            return self.error(SYSTEM_DISABLED, 'This system is temporarily disabled for maintenance.', status=503)
+        if fault == 'server_error':
+            return self.error(UNHANDLED_EXCEPTION, 'An unhandled exception occurred.', status=500)
+
+        throttle_seconds = self._throttle(api_key, request, throttled=fault == 'throttle')
+        if throttle_seconds:
+            return self.error(
+                PER_ENDPOINT_REQUEST_THROTTLE_EXCEEDED,
+                'Too many requests to this endpoint, please wait before trying again.',
+                throttle_seconds=throttle_seconds,
+            )
+
+        try:
+            return await handler(request)
+        except (KeyError, ValueError) as e:
+            return self.error(PARAMETER_PARSE_FAILURE, f'Unable to parse the request parameters: {e}.')
+
+    def _fault(self) -> Optional[str]:
+        roll = self._rng.random()
+        for name in ('throttle', 'maintenance', 'server_error', 'timeout'):
+            roll -= getattr(self.faults, name)
+            if roll < 0:
+                return name
+        return None
+
+    def _throttle(self, api_key: str, request: web.Request, throttled: bool) -> int:
+        """The seconds a request is throttled for, 0 if it may be served.
+
+        An endpoint that throttled a key keeps throttling it until the announced ``ThrottleSeconds`` have passed.
+        """
+        key = (api_key, re.sub(r'/-?\d+(?=/|$)', '/{}', request.path))
+        now = time.monotonic()
+        until = self._throttled_until.get(key, 0)
+        if until > now:
+            return math.ceil(until - now)
+
+        if self.rate_limit:
+            # A token bucket holding one second of requests.
+            interval = 1 / self.rate_limit
+            next_free = max(self._next_free.get(key, now), now - 1 + interval)
+            if next_free > now:
+                throttled = True
+            else:
+                self._next_free[key] = next_free + interval
+
+        if not throttled:
+            return 0
+        seconds = self.faults.throttle_seconds
+        self._throttled_until[key] = now + seconds
+        return seconds
+
+    @staticmethod
+    def _error_status(response: web.StreamResponse) -> str:
+        body = getattr(response, 'body', None)
+        try:
+            return json.loads(body)['ErrorStatus']
+        except (TypeError, ValueError, KeyError):
+            return str(response.status)
+
+    # --- Control ------------------------------------------------------------------------------------------------------
+    async def get_stats(self, request: web.Request) -> web.Response:
+        """The server's stats, for clients running it in another process."""
+        return web.json_response(dataclasses.asdict(self.stats))
+
+    async def reset_stats(self, request: web.Request) -> web.Response:
+        self.reset()
+        return web.Response(status=204)
+
+    def reset(self) -> None:
+        """Clears the stats and every throttle, keeping issued OAuth tokens."""
+        self.stats = ServerStats()
+        self._throttled_until.clear()
+        self._next_free.clear()
+        self._transports = weakref.WeakSet()
+
+    # --- OAuth --------------------------------------------------------------------------------------------------------
+    def _oauth(self, handler: Handler) -> Handler:
+        async def protected(request: web.Request) -> web.Response:
+            authorization = request.headers.get('Authorization', '')
+            token = self._tokens.get(authorization.removeprefix('Bearer '))
+            if token is None or token['expires_at'] < time.time():
+                return self.error(WEB_AUTH_REQUIRED, 'Please sign in to perform this action.', status=401)
+            request['membership_id'] = token['membership_id']
+            return await handler(request)
+
+        return protected
+
+    async def token(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        grant_type = form.get('grant_type')
+        if grant_type == 'authorization_code' and form.get('code'):
+            membership_id = 19548659
+        elif grant_type == 'refresh_token' and form.get('refresh_token') in self._tokens:
+            membership_id = self._tokens[form['refresh_token']]['membership_id']
+        else:
+            return web.json_response(
+                {'error': 'invalid_grant', 'error_description': 'AuthorizationCodeInvalid'}, status=400,
+            )
+
+        access_token, refresh_token = secrets.token_urlsafe(24), secrets.token_urlsafe(24)
+        expires_in, refresh_expires_in = 3600, 7_776_000
+        self._tokens[access_token] = {'membership_id': membership_id, 'expires_at': time.time() + expires_in}
+        self._tokens[refresh_token] = {'membership_id': membership_id, 'expires_at': time.time() + refresh_expires_in}
+        return web.json_response({
+            'access_token': access_token,
+            'token_type': 'Bearer',
+            'expires_in': expires_in,
+            'refresh_token': refresh_token,
+            'refresh_expires_in': refresh_expires_in,
+            'membership_id': str(membership_id),
+        })
+
+    # --- App ----------------------------------------------------------------------------------------------------------
+    async def api_usage(self, request: web.Request) -> web.Response:
+        int(request.match_info['application_id'])
+        return self.envelope(payloads.api_usage())
+
+    async def applications(self, request: web.Request) -> web.Response:
+        return self.envelope([payloads.application(46374 + i) for i in range(2)])
+
+    # --- User ---------------------------------------------------------------------------------------------------------
+    async def bungie_net_user(self, request: web.Request) -> web.Response:
+        return self.envelope(payloads.general_user(int(request.match_info['id'])))
+
+    async def sanitized_display_names(self, request: web.Request) -> web.Response:
+        int(request.match_info['id'])
+        return self.envelope({'SteamId': 'Guardian', 'BattleNetId': 'Guardian#1234'})
+
+    async def credential_types(self, request: web.Request) -> web.Response:
+        int(request.match_info['id'])
+        return self.envelope(payloads.credential_types())
+
+    async def themes(self, request: web.Request) -> web.Response:
+        return self.envelope(payloads.themes())
+
+    async def membership_data(self, request: web.Request) -> web.Response:
+        int(request.match_info['type'])
+        return self.envelope(payloads.membership_data(int(request.match_info['id'])))
+
+    async def current_user_membership_data(self, request: web.Request) -> web.Response:
+        return self.envelope(payloads.membership_data(request['membership_id']))
+
+    async def hard_linked_membership(self, request: web.Request) -> web.Response:
+        return self.envelope(payloads.hard_linked_membership())
+
+    async def search(self, request: web.Request) -> web.Response:
+        page = int(request.match_info['page'])
+        prefix = (await request.json())['displayNamePrefix']
+        if page >= self.search_pages:
+            return self.envelope(payloads.search_response(page, 0, prefix, has_more=False))
+        return self.envelope(payloads.search_response(
+            page, self.search_page_size, prefix, has_more=page + 1 < self.search_pages,
+        ))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=Latency.parse, default=Latency(), help='distribution[:mean[:spread]]')
+    parser.add_argument('--rate-limit', type=float, help='Requests per second per API key and endpoint.')
+    parser.add_argument('--api-key', help='The only API key accepted, defaults to any key.')
+    parser.add_argument('--seed', type=int)
+    for name in ('throttle', 'maintenance', 'server_error', 'timeout'):
+        parser.add_argument(f'--{name.replace("_", "-")}', type=float, default=0.0, help=f'The {name} probability.')
+    args = parser.parse_args()
+
+    StandInServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        faults=Faults(
+            throttle=args.throttle,
+            maintenance=args.maintenance,
+            server_error=args.server_error,
+            timeout=args.timeout,
+        ),
+        rate_limit=args.rate_limit,
+        api_key=args.api_key,
+        seed=args.seed,
+    ).run()
+
+
+if __name__ == '__main__':
+    main()